@@ -11,19 +11,52 @@ import logging
 import simpy
 import math
 
-from helpers import times
+from helpers import times, tone_plan
 from node import Node
+from link_adaptation import get_link_adaptation
+from scheduler import get_scheduler
+from packet import PacketType
 
 logger = logging.getLogger('ofdma_simulator')
 
 
+def get_resources_units(config, channel, number_of_destinations, stations=None):
+    """Function for preparing a RU list suitable for the channel bandwidth and stations number."""
+
+    # Take the RUs of the 802.11ax tone plan from the allocation table
+    if config.ru_allocator == 'TONE_PLAN':
+        mcs, nss = None, None
+        # The padding is calculated for the slowest station, whose packet sets the duration of the PPDU
+        if stations:
+            slowest_station = min(stations, key=lambda station: times.get_data_rate(config, channel.bandwidth,
+                                                                                   station.mcs, station.nss))
+            mcs, nss = slowest_station.mcs, slowest_station.nss
+        return list(tone_plan.get_resources_units(config, channel.bandwidth, number_of_destinations, mcs, nss))
+    possible_subchannels = channel.possible_subchannels
+    number_of_possible_subchannels = len(possible_subchannels)
+    free_bandwidth = channel.bandwidth
+    # Initialize RU list
+    resources_units = []
+    for i in range(0, number_of_destinations):
+        resources_units.append(0)
+    for i in range(0, number_of_possible_subchannels):
+        for j in range(0, number_of_destinations):
+            resources_units[j] = possible_subchannels[i]
+            free_bandwidth = round(channel.bandwidth - sum(resources_units))
+            if free_bandwidth <= 0:
+                break
+        if free_bandwidth <= 0:
+            break
+    return resources_units
+
+
 class AccessPoint(Node):
     """Class containing functions and settings specific to an Access Point."""
 
-    def __init__(self, name, env, config, channel, stats):
+    def __init__(self, name, env, config, channel, stats, index=None, trace=None, traffic=None):
         """AccessPoint class constructor."""
 
-        super().__init__(env, channel)
+        super().__init__(env, channel, index, trace, traffic)
         self.name = name
         self.env = env
         self.config = config
@@ -38,49 +71,94 @@ class AccessPoint(Node):
         self.backoff_process = None
         self.backoff_suspended = None
         self.retransmission_counter = 0
+        self.backoff_timeout = None
+        self.countdown_start = None
+        self.countdown_event = None
+        self.countdown_number = None
+        self.waiting_for_traffic = False
+        self.restored = False
+        self.warmup = None
         self.stats.number_of_transmissions_per_ap[self.name] = 0
         self.stats.number_of_retransmissions_per_ap[self.name] = 0
-        self.transmission_complete = False
+        self.transmission_complete_event = env.event()
+        self.scheduler = get_scheduler(self)
+        self.link_adaptation = get_link_adaptation(self)
         self.type_of_packet_to_wait = None
         self.set_initial_type_of_packet_to_wait()
 
+    @property
+    def transmission_complete(self):
+        """Flag indicating whether the current transmission is complete."""
+
+        return self.transmission_complete_event.triggered
+
+    @transmission_complete.setter
+    def transmission_complete(self, complete):
+        """Function for marking the current transmission as complete or starting a new one."""
+
+        if complete:
+            if not self.transmission_complete_event.triggered:
+                self.transmission_complete_event.succeed()
+        elif self.transmission_complete_event.triggered:
+            self.transmission_complete_event = self.env.event()
+
     def perform_transmission(self, all_destinations):
         """Function for scheduling and performing subsequent transmissions."""
 
-        # Assign the Stations to the Access Point for the duration of the simulation
-        self.assign_stations_to_ap(all_destinations)
+        # Assign the Stations to the Access Point for the duration of the simulation, unless restored from checkpoint
+        if not self.restored:
+            self.assign_stations_to_ap(all_destinations)
         # Schedule transmission in Access Point
         while True:
-            logger.info(f'[{self.env.now}] - [{self.name}] Transmission scheduling is started.')
+            # The transmission restored during the backoff countdown is continued from the countdown
+            resumed = self.restored and self.countdown_start is not None
+            self.restored = False
             self.transmission_complete = False
-            self.destination_stations = []
-            # Choose Stations to new transmission
-            self.select_stations_for_current_transmission()
-            # Allocate channel resources to each Station
-            self.allocate_resources()
+            if not resumed:
+                logger.info('[%s] - [%s] Transmission scheduling is started.', self.env.now, self.name)
+                self.destination_stations = []
+                # Wait until the MPDUs of any assigned Station arrive
+                if self.traffic is not None:
+                    self.traffic.update_queues()
+                    self.waiting_for_traffic = True
+                    while not self.traffic.get_backlogged_stations(self):
+                        yield self.env.process(self.traffic.wait_for_arrival())
+                    self.waiting_for_traffic = False
+                # Choose Stations to new transmission
+                self.select_stations_for_current_transmission()
+                # Allocate channel resources to each Station
+                self.allocate_resources()
             # Start new transmission
-            logger.info(f'[{self.env.now}] - [{self.name}] New transmission is started.')
-            self.sensing_process = self.env.process(self.compete_for_channel_and_start_transmission())
-            yield self.sensing_process
-            while not self.transmission_complete:
-                yield self.env.timeout(1)
+            logger.info('[%s] - [%s] New transmission is started.', self.env.now, self.name)
+            self.sensing_process = self.env.process(self.compete_for_channel_and_start_transmission(resumed))
+            delivered = yield self.sensing_process
+            # Wait until the transmission is complete
+            yield self.transmission_complete_event
+            if self.trace is not None:
+                self.trace.record(self.env.now, 'TRANSMISSION_COMPLETE', self.index)
             self.stats.number_of_transmissions_per_ap[self.name] += 1
             for station in self.destination_stations:
                 self.stats.number_of_transmissions_per_station[station.name] += 1
-            logger.info(f'[{self.env.now}] - [{self.name}] Transmission complete.')
+            self.scheduler.update_after_transmission(self.destination_stations)
+            if self.warmup is not None:
+                self.warmup.add_transmission(self.destination_stations if delivered else [])
+            if self.link_adaptation is not None and delivered:
+                self.link_adaptation.update_mcs(self.destination_stations, True)
+            logger.info('[%s] - [%s] Transmission complete.', self.env.now, self.name)
 
-    def compete_for_channel_and_start_transmission(self):
-        """Function to compete for channel and start transmission."""
+    def compete_for_channel_and_start_transmission(self, resumed=False):
+        """Function to compete for channel and start transmission, False is returned if the packet is dropped."""
 
-        logger.info(f'[{self.env.now}] - [{self.name}] New channel sensing process is started.')
+        logger.info('[%s] - [%s] New channel sensing process is started.', self.env.now, self.name)
         while True:
             try:
                 # Perform backoff procedure
-                self.backoff_process = self.env.process(self.backoff_procedure())
+                self.backoff_process = self.env.process(self.backoff_procedure(resumed))
+                resumed = False
                 yield self.backoff_process
                 self.backoff_process = None
                 # Send first packet to start transmission
-                logger.info(f'[{self.env.now}] - [{self.name}] Backoff procedure complete. Data sending started.')
+                logger.info('[%s] - [%s] Backoff procedure complete. Data sending started.', self.env.now, self.name)
                 self.channel.transmitting_ap.append(self)
                 if self.config.direction == 'DL':
                     if self.config.rts_procedure:
@@ -98,7 +176,7 @@ class AccessPoint(Node):
                 self.sensing_process = None
                 self.channel.transmitting_ap.remove(self)
                 self.retransmission_counter = 0
-                break
+                return True
             except simpy.Interrupt as packet:
                 # Handle the situation that collision occurred
                 yield self.env.timeout(1)
@@ -106,50 +184,121 @@ class AccessPoint(Node):
                 self.stats.number_of_retransmissions_per_ap[self.name] += 1
                 self.stats.transmission_time -= ((packet.cause.packet_time + times.sifs_time) / 2)
                 self.channel.transmitting_ap.remove(self)
-                logger.info(f'[{self.env.now}] - [{self.name}] Collision occurred. Backoff procedure will be '
-                            f'repeated. Current retransmission counter: {self.retransmission_counter} ')
+                if self.trace is not None:
+                    self.trace.record(self.env.now, 'COLLISION', self.index, -1, packet.cause.packet_type,
+                                      packet.cause.packet_time)
+                # The packet was not put in the channel, so it can be reused
+                self.channel.packet_pool.release(packet.cause)
+                if self.link_adaptation is not None:
+                    self.link_adaptation.update_mcs(self.destination_stations, False)
+                logger.info('[%s] - [%s] Collision occurred. Backoff procedure will be repeated. Current '
+                            'retransmission counter: %s ', self.env.now, self.name, self.retransmission_counter)
                 # Drop packet if too many tries
                 if self.retransmission_counter > 7:
-                    logger.info(f'[{self.env.now}] - [{self.name}] Too many tries to perform transmission, packet '
-                                f'will be dropped')
+                    logger.info('[%s] - [%s] Too many tries to perform transmission, packet will be dropped',
+                                self.env.now, self.name)
+                    if self.trace is not None:
+                        self.trace.record(self.env.now, 'PACKET_DROPPED', self.index)
                     self.transmission_complete = True
                     self.retransmission_counter = 0
                     self.stats.number_of_transmissions_per_ap[self.name] -= 1
                     for station in self.destination_stations:
                         self.stats.number_of_transmissions_per_station[station.name] -= 1
-                    break
+                    return False
                 yield self.env.timeout(1)
                 continue
 
-    def backoff_procedure(self):
-        """Function to perform backoff procedure."""
+    def backoff_procedure(self, resumed=False):
+        """Function to perform backoff procedure, the countdown restored from checkpoint is continued if resumed."""
 
-        # Generate new backoff time value
-        backoff_time = times.get_random_backoff_time(self.retransmission_counter) + times.aifs_time
-        timeout = backoff_time
-        logger.info(f'[{self.env.now}] - [{self.name}] New backoff time: {backoff_time}')
+        if not resumed:
+            # Generate new backoff time value
+            self.backoff_timeout = times.get_random_backoff_time(self.retransmission_counter) + times.aifs_time
+            logger.info('[%s] - [%s] New backoff time: %s', self.env.now, self.name, self.backoff_timeout)
+            self.countdown_start = None
         while True:
             try:
                 # Wait for channel is available
-                while not self.channel.channel_available:
-                    yield self.env.timeout(1)
+                while not resumed and not self.channel.channel_available:
+                    yield self.channel.wait_for_idle()
                 self.backoff_suspended = False
                 # Countdown backoff time
-                backoff_time = timeout
-                while timeout > 0:
-                    yield self.env.timeout(times.slot_time)
-                    timeout -= times.slot_time
+                backoff_time = self.backoff_timeout
+                if self.config.single_timeout_backoff:
+                    # Wait for all remaining slots at once
+                    remaining_slots = math.ceil(self.backoff_timeout / times.slot_time)
+                    if remaining_slots > 0:
+                        countdown_time = remaining_slots * times.slot_time
+                        if resumed:
+                            countdown_time -= self.env.now - self.countdown_start
+                            resumed = False
+                        else:
+                            self.countdown_start = self.env.now
+                            # Number the countdowns, so their order can be restored from checkpoint
+                            self.channel.number_of_countdowns += 1
+                            self.countdown_number = self.channel.number_of_countdowns
+                        self.countdown_event = self.env.timeout(countdown_time)
+                        yield self.countdown_event
+                        self.countdown_start = None
+                        self.countdown_event = None
+                        self.backoff_timeout -= remaining_slots * times.slot_time
+                else:
+                    while self.backoff_timeout > 0:
+                        yield self.env.timeout(times.slot_time)
+                        self.backoff_timeout -= times.slot_time
                 self.stats.transmission_time += backoff_time
+                if self.trace is not None:
+                    self.trace.record(self.env.now, 'BACKOFF_COMPLETE', self.index, -1, None, backoff_time)
                 self.stats.increase_latency_for_station_that_are_not_transmitting(self.destination_stations,
                                                                                   backoff_time)
                 break
             except simpy.Interrupt:
+                # Freeze the countdown, only the fully elapsed slots are subtracted from the backoff time
+                if self.countdown_start is not None:
+                    elapsed_slots = (self.env.now - self.countdown_start) // times.slot_time
+                    self.backoff_timeout -= elapsed_slots * times.slot_time
+                    self.countdown_start = None
+                    self.countdown_event = None
                 # Handle the situation that channel becomes busy
-                logger.info(f'[{self.env.now}] - [{self.name}] Sensing process suspended because the channel is busy. '
-                            f'Remaining backoff time: {timeout}')
+                logger.info('[%s] - [%s] Sensing process suspended because the channel is busy. Remaining backoff '
+                            'time: %s', self.env.now, self.name, self.backoff_timeout)
                 self.backoff_suspended = True
                 continue
 
+    def get_state(self):
+        """Function for getting the state of the Access Point saved in the checkpoint, Stations are saved by index."""
+
+        return {
+            'assigned_stations': [station.index for station in self.assigned_stations],
+            'destination_stations': [station.index for station in self.destination_stations],
+            'type_of_packet_to_wait': self.type_of_packet_to_wait,
+            'retransmission_counter': self.retransmission_counter,
+            'backoff_timeout': self.backoff_timeout,
+            'countdown_start': self.countdown_start,
+            'countdown_number': self.countdown_number,
+            'scheduler': self.config.scheduler,
+            'scheduler_state': self.scheduler.get_state(),
+            'link_adaptation': self.config.link_adaptation,
+            'link_adaptation_state': None if self.link_adaptation is None else self.link_adaptation.get_state()
+        }
+
+    def set_state(self, state, stations):
+        """Function for restoring the state of the Access Point from the checkpoint."""
+
+        self.assigned_stations = [stations[index] for index in state['assigned_stations']]
+        self.destination_stations = [stations[index] for index in state['destination_stations']]
+        self.type_of_packet_to_wait = state['type_of_packet_to_wait']
+        self.retransmission_counter = state['retransmission_counter']
+        self.backoff_timeout = state['backoff_timeout']
+        self.countdown_start = state['countdown_start']
+        self.countdown_number = state['countdown_number']
+        # The state of the policies is restored only if the same policies are used in the restored simulation
+        if state['scheduler'] == self.config.scheduler:
+            self.scheduler.set_state(state['scheduler_state'], stations)
+        if self.link_adaptation is not None and state['link_adaptation'] == self.config.link_adaptation:
+            self.link_adaptation.set_state(state['link_adaptation_state'])
+        self.restored = True
+
     def check_available_stations(self, all_destinations):
         """Function for getting the list of available stations."""
 
@@ -170,18 +319,21 @@ class AccessPoint(Node):
         # Set the stations as already associated, so they cannot be selected by another Access Point
         for station in self.assigned_stations:
             station.station_associated = True
+            station.associated_ap = self.index
         # Assign remaining stations if you are the last Access Point
         available_stations = self.check_available_stations(all_destinations)
         if len(available_stations) < len(self.assigned_stations):
             for station in available_stations:
                 self.assigned_stations.append(station)
                 station.station_associated = True
+                station.associated_ap = self.index
         # Print names of assigned stations
-        assigned_stations_names = []
-        for station in self.assigned_stations:
-            assigned_stations_names.append(station.name)
-        logger.info(f'[{self.env.now}] - [{self.name}] List of stations assigned to Access Point:'
-                    f' {assigned_stations_names}')
+        if logger.isEnabledFor(logging.INFO):
+            assigned_stations_names = []
+            for station in self.assigned_stations:
+                assigned_stations_names.append(station.name)
+            logger.info('[%s] - [%s] List of stations assigned to Access Point: %s', self.env.now, self.name,
+                        assigned_stations_names)
 
     def select_stations_for_current_transmission(self):
         """Function for selecting destination stations for current transmission."""
@@ -193,85 +345,69 @@ class AccessPoint(Node):
             max_number_of_stations = len(self.config.ru_list)
         else:
             max_number_of_stations = self.channel.max_stations_in_transmission[bandwidth]
-        if number_of_destinations > max_number_of_stations:
-            # Select random stations if their number is greater than maximum possible number
-            selected_stations = random.sample(self.assigned_stations, max_number_of_stations)
+        # Only the stations with queued MPDUs can be served with the non-saturated traffic
+        if self.traffic is not None:
+            candidate_stations = self.traffic.get_backlogged_stations(self)
         else:
-            # Select all available stations when their number is less than the maximum possible number
-            selected_stations = self.assigned_stations
-        self.destination_stations = selected_stations
+            candidate_stations = self.assigned_stations
+        # Let the scheduler select the stations if their number is greater than maximum possible number
+        self.destination_stations = self.scheduler.select_stations(candidate_stations, max_number_of_stations)
         # Print names of destination stations
-        destination_stations_names = []
-        for station in self.destination_stations:
-            destination_stations_names.append(station.name)
-        logger.info(f'[{self.env.now}] - [{self.name}] Stations selected for current transmission:'
-                    f' {destination_stations_names}')
+        if logger.isEnabledFor(logging.INFO):
+            destination_stations_names = []
+            for station in self.destination_stations:
+                destination_stations_names.append(station.name)
+            logger.info('[%s] - [%s] Stations selected for current transmission: %s', self.env.now, self.name,
+                        destination_stations_names)
 
     def allocate_resources(self):
         """Function for allocating channel resources to each selected station."""
 
         if self.config.ru_predefined:
-            resources_units = self.config.ru_list
-            used_resources_units = []
-            # Randomly assign a RU to each station
-            for station in self.destination_stations:
-                allocated_bw = random.choice(resources_units)
-                station.allocated_bw = allocated_bw
-                resources_units.remove(allocated_bw)
-                used_resources_units.append(allocated_bw)
-                logger.info(f'[{self.env.now}] - [{self.name}] {station.allocated_bw}MHz allocated for {station.name}')
-            self.config.ru_list = used_resources_units
+            resources_units = list(self.config.ru_list)
+            # Let the scheduler assign a RU to each station
+            used_resources_units = self.scheduler.allocate_resources(self.destination_stations, resources_units)
+            # Keep the RUs in the order of the last allocation, the unused RUs are moved to the end of the list
+            unused_resources_units = list(self.config.ru_list)
+            for allocated_bw in used_resources_units:
+                unused_resources_units.remove(allocated_bw)
+            self.config.ru_list = used_resources_units + unused_resources_units
         else:
             number_of_destinations = len(self.destination_stations)
-            possible_subchannels = self.channel.possible_subchannels
-            number_of_possible_subchannels = len(possible_subchannels)
-            free_bandwidth = self.channel.bandwidth
-            # Initialize RU list
-            resources_units = []
-            # Prepare a RU list suitable for the channel bandwidth and stations number
-            for i in range(0, number_of_destinations):
-                resources_units.append(0)
-            for i in range(0, number_of_possible_subchannels):
-                for j in range(0, number_of_destinations):
-                    resources_units[j] = possible_subchannels[i]
-                    free_bandwidth = round(self.channel.bandwidth - sum(resources_units))
-                    if free_bandwidth <= 0:
-                        break
-                if free_bandwidth <= 0:
-                    break
-            # Randomly assign a RU to each station
-            for station in self.destination_stations:
-                allocated_bw = random.choice(resources_units)
-                station.allocated_bw = allocated_bw
-                resources_units.remove(allocated_bw)
-                logger.info(f'[{self.env.now}] - [{self.name}] {station.allocated_bw}MHz allocated for {station.name}')
+            resources_units = get_resources_units(self.config, self.channel, number_of_destinations,
+                                                  self.destination_stations)
+            # Let the scheduler assign a RU to each station
+            self.scheduler.allocate_resources(self.destination_stations, resources_units)
+        for station in self.destination_stations:
+            logger.info('[%s] - [%s] %sMHz allocated for %s', self.env.now, self.name, station.allocated_bw,
+                        station.name)
 
     def set_initial_type_of_packet_to_wait(self):
         """Function for setting packet type expected by Access Point after transmission is started."""
 
         if self.config.direction == 'DL':
             if self.config.rts_procedure:
-                self.type_of_packet_to_wait = 'CTS'
+                self.type_of_packet_to_wait = PacketType.CTS
             else:
-                self.type_of_packet_to_wait = 'TB_BACK'
+                self.type_of_packet_to_wait = PacketType.TB_BACK
         elif self.config.direction == 'UL':
             if self.config.bsrp_procedure:
-                self.type_of_packet_to_wait = 'BSR'
+                self.type_of_packet_to_wait = PacketType.BSR
             else:
                 if self.config.rts_procedure:
-                    self.type_of_packet_to_wait = 'CTS'
+                    self.type_of_packet_to_wait = PacketType.CTS
                 else:
-                    self.type_of_packet_to_wait = 'UL_A_MPDU'
+                    self.type_of_packet_to_wait = PacketType.UL_A_MPDU
 
     def handle_received_packet(self, packet):
         """Function for handling the received packet by Access Point."""
 
         # Ignore packet to other destination
-        if self in packet.destination_nodes:
+        if packet.is_destination(self):
             # Ignore incorrect packet type
             if packet.packet_type == self.type_of_packet_to_wait:
                 # Handle BSR packet in AP
-                if packet.packet_type == 'BSR':
+                if packet.packet_type == PacketType.BSR:
                     self.received_packets_number += 1
                     if self.received_packets_number == self.expected_destinations_number:
                         self.received_packets_number = 0
@@ -280,17 +416,17 @@ class AccessPoint(Node):
                         self.stats.increase_latency_for_station_that_are_not_transmitting(self.destination_stations,
                                                                                           time_to_add)
                         if self.config.rts_procedure:
-                            self.type_of_packet_to_wait = 'CTS'
+                            self.type_of_packet_to_wait = PacketType.CTS
                             yield self.env.process(self.send_mu_rts())
                         else:
                             if self.config.direction == 'DL':
-                                self.type_of_packet_to_wait = 'TB_BACK'
+                                self.type_of_packet_to_wait = PacketType.TB_BACK
                                 yield self.env.process(self.send_data_packet())
                             elif self.config.direction == 'UL':
-                                self.type_of_packet_to_wait = 'UL_A_MPDU'
+                                self.type_of_packet_to_wait = PacketType.UL_A_MPDU
                                 yield self.env.process(self.send_basic_trigger())
                 # Handle CTS packet in AP
-                if packet.packet_type == 'CTS':
+                if packet.packet_type == PacketType.CTS:
                     self.received_packets_number += 1
                     if self.received_packets_number == self.expected_destinations_number:
                         self.received_packets_number = 0
@@ -299,30 +435,37 @@ class AccessPoint(Node):
                         self.stats.increase_latency_for_station_that_are_not_transmitting(self.destination_stations,
                                                                                           time_to_add)
                         if self.config.direction == 'DL':
-                            self.type_of_packet_to_wait = 'TB_BACK'
+                            self.type_of_packet_to_wait = PacketType.TB_BACK
                             yield self.env.process(self.send_data_packet())
                         elif self.config.direction == 'UL':
-                            self.type_of_packet_to_wait = 'UL_A_MPDU'
+                            self.type_of_packet_to_wait = PacketType.UL_A_MPDU
                             yield self.env.process(self.send_basic_trigger())
                 # Handle UL A-MPDU packet in AP
-                elif packet.packet_type == 'UL_A_MPDU':
+                elif packet.packet_type == PacketType.UL_A_MPDU:
                     self.received_packets_number += 1
                     if self.received_packets_number == self.expected_destinations_number:
                         self.received_packets_number = 0
                         packet_time_list = []
                         for station in self.destination_stations:
-                            packet_time = times.get_packet_time(packet.packet_type, station.allocated_bw,
-                                                                self.expected_destinations_number)
+                            number_of_mpdu = None
+                            if self.traffic is not None:
+                                number_of_mpdu = self.traffic.get_a_mpdu_size(station)
+                            packet_time = times.get_packet_time(self.config, packet.packet_type, station.allocated_bw,
+                                                                self.expected_destinations_number, station.mcs,
+                                                                station.nss, number_of_mpdu)
                             packet_time_list.append(packet_time)
                         packet_time = max(packet_time_list)
                         time_to_add = packet_time + times.sifs_time
                         self.stats.transmission_time += time_to_add
                         self.stats.increase_latency_for_station_that_are_not_transmitting(self.destination_stations,
                                                                                           time_to_add)
+                        if self.traffic is not None:
+                            for station in self.destination_stations:
+                                self.traffic.deliver_a_mpdu(station)
                         self.set_initial_type_of_packet_to_wait()
                         yield self.env.process(self.send_ms_back())
                 # Handle TB BACK packet in AP
-                elif packet.packet_type == 'TB_BACK':
+                elif packet.packet_type == PacketType.TB_BACK:
                     self.received_packets_number += 1
                     if self.received_packets_number == self.expected_destinations_number:
                         self.received_packets_number = 0
@@ -337,10 +480,10 @@ class AccessPoint(Node):
     def send_bsrp_trigger(self):
         """Function for sending BSRP Trigger packet."""
 
-        packet_type = 'BSRP_TRIGGER'
+        packet_type = PacketType.BSRP_TRIGGER
         source_node = self
         destination_nodes = self.destination_stations
-        packet_time = times.get_packet_time(packet_type)
+        packet_time = times.get_packet_time(self.config, packet_type)
         bsrp_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_nodes)
         self.expected_destinations_number = len(destination_nodes)
         time_to_add = packet_time + times.sifs_time
@@ -351,12 +494,12 @@ class AccessPoint(Node):
     def send_mu_rts(self):
         """Function for sending MU-RTS packet."""
 
-        packet_type = 'MU_RTS'
+        packet_type = PacketType.MU_RTS
         source_node = self
         destination_nodes = self.destination_stations
         number_of_destinations = len(destination_nodes)
         bandwidth = None
-        packet_time = times.get_packet_time(packet_type, bandwidth, number_of_destinations)
+        packet_time = times.get_packet_time(self.config, packet_type, bandwidth, number_of_destinations)
         rts_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_nodes)
         self.expected_destinations_number = len(destination_nodes)
         time_to_add = packet_time + times.sifs_time
@@ -367,13 +510,17 @@ class AccessPoint(Node):
     def send_data_packet(self):
         """Function for sending A-MPDU packet."""
 
-        packet_type = 'DL_A_MPDU'
+        packet_type = PacketType.DL_A_MPDU
         source_node = self
         destination_nodes = self.destination_stations
         number_of_destinations = len(destination_nodes)
         packet_time_list = []
         for station in self.destination_stations:
-            packet_time = times.get_packet_time(packet_type, station.allocated_bw, number_of_destinations)
+            number_of_mpdu = None
+            if self.traffic is not None:
+                number_of_mpdu = self.traffic.prepare_a_mpdu(station, number_of_destinations)
+            packet_time = times.get_packet_time(self.config, packet_type, station.allocated_bw,
+                                                number_of_destinations, station.mcs, station.nss, number_of_mpdu)
             packet_time_list.append(packet_time)
         packet_time = max(packet_time_list)
         a_mpdu_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_nodes)
@@ -386,12 +533,12 @@ class AccessPoint(Node):
     def send_basic_trigger(self):
         """Function for sending Basic Trigger packet."""
 
-        packet_type = 'BASIC_TRIGGER'
+        packet_type = PacketType.BASIC_TRIGGER
         source_node = self
         destination_nodes = self.destination_stations
         number_of_destinations = len(destination_nodes)
         bandwidth = None
-        packet_time = times.get_packet_time(packet_type, bandwidth, number_of_destinations)
+        packet_time = times.get_packet_time(self.config, packet_type, bandwidth, number_of_destinations)
         basic_trigger_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_nodes)
         self.expected_destinations_number = len(destination_nodes)
         time_to_add = packet_time + times.sifs_time
@@ -402,12 +549,12 @@ class AccessPoint(Node):
     def send_ms_back(self):
         """Function for sending MS-Back packet."""
 
-        packet_type = 'MS_BACK'
+        packet_type = PacketType.MS_BACK
         source_node = self
         destination_nodes = self.destination_stations
         number_of_destinations = len(destination_nodes)
         bandwidth = None
-        packet_time = times.get_packet_time(packet_type, bandwidth, number_of_destinations)
+        packet_time = times.get_packet_time(self.config, packet_type, bandwidth, number_of_destinations)
         ms_back_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_nodes)
         self.expected_destinations_number = 0
         time_to_add = packet_time + times.aifs_time
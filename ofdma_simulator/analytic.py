@@ -0,0 +1,213 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the analytical model of the simulated network. The frame exchange performed by each
+              Access Point is a fixed sequence of packets, so the time and the amount of data accounted for a single
+              transmission can be calculated in closed form. The contention between Access Points is modelled with
+              a Bianchi-style fixed point for the probability of transmitting in a slot. The model fills a Stats object
+              with the expected values of the counters, so all statistics are calculated in the same way as for the
+              discrete-event simulation.
+"""
+
+import math
+
+import configs.channel_config as channel_config
+from helpers import times
+from helpers.stats import Stats
+from channel import Channel
+from packet import PacketType
+from access_point import get_resources_units
+
+# Number of retransmissions after which the packet is dropped
+RETRANSMISSION_LIMIT = 7
+# Time spent in the simulation environment to send each packet, the packet is sent after 1 us and is put in the
+# channel after another 1 us
+PACKET_SENDING_TIME = 2  # [us]
+# Time spent in the simulation environment after a collision before the backoff procedure is repeated
+COLLISION_HANDLING_TIME = 3  # [us]
+
+
+def get_ap_destinations(config):
+    """Function for getting the number of stations assigned to each Access Point."""
+
+    stations_per_ap = math.floor(config.number_of_stations / config.number_of_ap)
+    ap_destinations = [stations_per_ap] * config.number_of_ap
+    # The last Access Point takes the remaining stations only if there are fewer of them than the stations assigned to
+    # it, otherwise the remaining stations are not assigned to any Access Point
+    remaining_stations = config.number_of_stations - (stations_per_ap * config.number_of_ap)
+    if remaining_stations < stations_per_ap:
+        ap_destinations[-1] += remaining_stations
+    return ap_destinations
+
+
+def get_transmission_resources_units(config, channel, number_of_assigned_stations):
+    """Function for getting the RUs allocated in each transmission of the Access Point."""
+
+    if config.ru_predefined:
+        number_of_destinations = min(number_of_assigned_stations, len(config.ru_list))
+        return list(config.ru_list[:number_of_destinations])
+    number_of_destinations = min(number_of_assigned_stations, channel.max_stations_in_transmission[channel.bandwidth])
+    return get_resources_units(config, channel, number_of_destinations)
+
+
+def get_transmission_sequence(config, resources_units):
+    """Function for getting the accounted time, first packet duration and number of packets of a transmission."""
+
+    number_of_destinations = len(resources_units)
+    first_packet_time = None
+    transmission_time = 0
+    number_of_packets = 0
+    if config.direction == 'UL' and config.bsrp_procedure:
+        bsrp_time = times.get_packet_time(config, PacketType.BSRP_TRIGGER)
+        first_packet_time = bsrp_time
+        transmission_time += bsrp_time + times.get_packet_time(config, PacketType.BSR) + 2 * times.sifs_time
+        number_of_packets += 2
+    if config.rts_procedure:
+        mu_rts_time = times.get_packet_time(config, PacketType.MU_RTS, None, number_of_destinations)
+        first_packet_time = first_packet_time or mu_rts_time
+        transmission_time += mu_rts_time + times.get_packet_time(config, PacketType.CTS) + 2 * times.sifs_time
+        number_of_packets += 2
+    if config.direction == 'DL':
+        data_time = max(times.get_packet_time(config, PacketType.DL_A_MPDU, bandwidth, number_of_destinations)
+                        for bandwidth in resources_units)
+        first_packet_time = first_packet_time or data_time
+        # The duration of the TB-Back packet received as the last one is accounted, any RU can be allocated to it
+        tb_back_time = sum(times.get_packet_time(config, PacketType.TB_BACK, bandwidth)
+                           for bandwidth in resources_units) / number_of_destinations
+        transmission_time += data_time + times.sifs_time + tb_back_time
+        number_of_packets += 2
+    elif config.direction == 'UL':
+        trigger_time = times.get_packet_time(config, PacketType.BASIC_TRIGGER, None, number_of_destinations)
+        first_packet_time = first_packet_time or trigger_time
+        data_time = max(times.get_packet_time(config, PacketType.UL_A_MPDU, bandwidth, number_of_destinations)
+                        for bandwidth in resources_units)
+        ms_back_time = times.get_packet_time(config, PacketType.MS_BACK, None, number_of_destinations)
+        transmission_time += (trigger_time + data_time + ms_back_time + 2 * times.sifs_time) + times.aifs_time
+        number_of_packets += 3
+    return transmission_time, first_packet_time, number_of_packets
+
+
+def get_backoff_slots(retransmission_counter):
+    """Function for getting all possible numbers of slots counted down during the backoff procedure."""
+
+    cw = min((pow(2, retransmission_counter + 4) - 1), channel_config.CW_MAX)
+    aifs_slots = math.ceil(times.aifs_time / times.slot_time)
+    return [aifs_slots + i for i in range(0, cw + 1)]
+
+
+def get_transmission_probability(collision_probability):
+    """Function for getting the probability that the Access Point transmits at the end of a slot."""
+
+    attempts = 0
+    slots = 0
+    # The backoff stages are repeated with the contention window capped at CW_MAX until the retransmission limit
+    for retransmission_counter in range(0, RETRANSMISSION_LIMIT + 1):
+        backoff_slots = get_backoff_slots(retransmission_counter)
+        stage_probability = pow(collision_probability, retransmission_counter)
+        attempts += stage_probability
+        # The transmission starts at the end of the last counted slot, so it does not take a slot of its own
+        slots += stage_probability * sum(backoff_slots) / len(backoff_slots)
+    return attempts / slots
+
+
+def solve_transmission_probability(number_of_ap):
+    """Function for solving the fixed point of the transmission and collision probabilities with bisection."""
+
+    lower, upper = 0.0, 1.0
+    for _ in range(0, 100):
+        tau = (lower + upper) / 2
+        collision_probability = 1 - pow(1 - tau, number_of_ap - 1)
+        if tau > get_transmission_probability(collision_probability):
+            upper = tau
+        else:
+            lower = tau
+    tau = (lower + upper) / 2
+    return tau, 1 - pow(1 - tau, number_of_ap - 1)
+
+
+def get_backoff_time(retransmission_counter, interruption_probability):
+    """Function for getting the expected backoff time accounted after the last interruption of the countdown."""
+
+    backoff_slots = get_backoff_slots(retransmission_counter)
+    # The remaining backoff time is always shorter than the remaining slots by the same remainder of the AIFS time
+    aifs_remainder = math.ceil(times.aifs_time / times.slot_time) * times.slot_time - times.aifs_time
+    backoff_time = 0
+    for slots in backoff_slots:
+        if interruption_probability > 0:
+            counted_slots = (1 - pow(1 - interruption_probability, slots)) / interruption_probability
+        else:
+            counted_slots = slots
+        backoff_time += counted_slots * times.slot_time - aifs_remainder
+    return backoff_time / len(backoff_slots)
+
+
+def estimate_statistics(config):
+    """Function for estimating the statistics of the simulation with given configuration."""
+
+    stats = Stats()
+    channel = Channel()
+    number_of_ap = config.number_of_ap
+    tau, collision_probability = solve_transmission_probability(number_of_ap)
+    # Only a successful transmission of another Access Point interrupts the backoff countdown
+    if number_of_ap > 1:
+        interruption_probability = (number_of_ap - 1) * tau * pow(1 - tau, number_of_ap - 2)
+    else:
+        interruption_probability = 0
+    idle_probability = pow(1 - tau, number_of_ap)
+    success_probability = number_of_ap * tau * pow(1 - tau, number_of_ap - 1)
+    ap_sequences = []
+    success_env_time = 0
+    for number_of_assigned_stations in get_ap_destinations(config):
+        resources_units = get_transmission_resources_units(config, channel, number_of_assigned_stations)
+        sequence = get_transmission_sequence(config, resources_units)
+        ap_sequences.append((number_of_assigned_stations, resources_units, sequence))
+        success_env_time += sequence[2] * PACKET_SENDING_TIME / number_of_ap
+    # Expected duration of a slot in the simulation environment, each slot is counted down by all Access Points and
+    # the countdown is frozen for the time of the transmission or collision which ends the slot
+    slot_env_time = (times.slot_time + success_probability * success_env_time
+                     + (1 - idle_probability - success_probability) * COLLISION_HANDLING_TIME)
+    attempts = config.simulation_time * tau / slot_env_time
+    attempts_per_packet = sum(pow(collision_probability, i) for i in range(0, RETRANSMISSION_LIMIT + 1))
+    packets = attempts / attempts_per_packet
+    transmissions = packets * (1 - pow(collision_probability, RETRANSMISSION_LIMIT + 1))
+    retransmissions = attempts * collision_probability
+    backoff_time = sum(packets * pow(collision_probability, i) * get_backoff_time(i, interruption_probability)
+                       for i in range(0, RETRANSMISSION_LIMIT + 1))
+    # Calculate the time accounted by each Access Point and the time for which the Stations wait because of it
+    ap_transmission_times = []
+    ap_latency_times = []
+    for number_of_assigned_stations, resources_units, sequence in ap_sequences:
+        transmission_time, first_packet_time, _ = sequence
+        collision_time = retransmissions * (first_packet_time + times.sifs_time)
+        ap_transmission_times.append(backoff_time + transmissions * transmission_time + collision_time / 2)
+        # Half of the collided packet is subtracted only from the accounted time, the stations wait for all of it
+        ap_latency_times.append(backoff_time + transmissions * transmission_time + collision_time)
+    stats.transmission_time = sum(ap_transmission_times)
+    latency_time = sum(ap_latency_times)
+    # Fill the counters of each Access Point and its Stations
+    station_index = 0
+    for i, (number_of_assigned_stations, resources_units, sequence) in enumerate(ap_sequences):
+        ap_name = "AccessPoint" + str(i)
+        stats.number_of_transmissions_per_ap[ap_name] = round(transmissions)
+        stats.number_of_retransmissions_per_ap[ap_name] = round(retransmissions)
+        number_of_destinations = len(resources_units)
+        selection_probability = number_of_destinations / number_of_assigned_stations
+        sent_data = sum(times.get_sent_data(config, bandwidth, number_of_destinations)
+                        for bandwidth in resources_units) / number_of_destinations
+        for _ in range(0, number_of_assigned_stations):
+            station_name = "Station" + str(station_index)
+            station_index += 1
+            station_transmissions = transmissions * selection_probability
+            stats.number_of_transmissions_per_station[station_name] = station_transmissions
+            stats.data_transferred_per_station[station_name] = station_transmissions * sent_data
+            # The station waits during all transmissions in which it is not selected
+            stats.latency_per_station[station_name] = latency_time - selection_probability * ap_latency_times[i]
+    # The stations which are not assigned to any Access Point are never served
+    for _ in range(station_index, config.number_of_stations):
+        station_name = "Station" + str(station_index)
+        station_index += 1
+        stats.number_of_transmissions_per_station[station_name] = 0
+        stats.data_transferred_per_station[station_name] = 0
+        stats.latency_per_station[station_name] = latency_time
+    return stats
@@ -0,0 +1,97 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing functions for validating the analytical model. Every configuration from the validation
+              grid is simulated with the discrete-event simulation in worker processes and the statistics are compared
+              with the statistics estimated by the analytical model.
+"""
+
+import csv
+import dataclasses
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import configs.analytic_config as analytic_config
+from analytic import estimate_statistics
+from sweep import get_configurations, run_configuration
+
+VALIDATED_METRICS = ['throughput', 'average_latency', 'number_of_transmissions', 'number_of_retransmissions']
+
+
+def calculate_relative_error(estimated_value, simulated_value):
+    """Function for calculating the relative error of the estimated value."""
+
+    if simulated_value == 0:
+        return 0.0 if estimated_value == 0 else None
+    return (estimated_value - simulated_value) / simulated_value
+
+
+def run_validation(parameter_grid, max_workers=None):
+    """Function for comparing the analytical model with the discrete-event simulation for all configurations."""
+
+    configurations = [dataclasses.replace(config, run_mode='DES') for config in get_configurations(parameter_grid)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        simulated_statistics = list(executor.map(run_configuration, configurations))
+    results = []
+    for run, config in enumerate(configurations):
+        estimated_statistics = estimate_statistics(config).get_statistics()
+        for metric in VALIDATED_METRICS:
+            results.append({'run': run, 'metric': metric, 'simulated': simulated_statistics[run][metric],
+                            'estimated': estimated_statistics[metric],
+                            'relative_error': calculate_relative_error(estimated_statistics[metric],
+                                                                       simulated_statistics[run][metric]),
+                            **{parameter: getattr(config, parameter) for parameter in parameter_grid}})
+    return results
+
+
+def get_failed_metrics(results, max_relative_error):
+    """Function for getting the metrics for which the absolute relative error exceeds the maximum in any run."""
+
+    failed_metrics = []
+    for metric in VALIDATED_METRICS:
+        if any(row['metric'] == metric and row['relative_error'] is not None
+               and abs(row['relative_error']) > max_relative_error for row in results):
+            failed_metrics.append(metric)
+    return failed_metrics
+
+
+def print_validation_summary(results, max_relative_error):
+    """Function for printing the mean and maximum absolute relative error of each metric."""
+
+    failed_metrics = get_failed_metrics(results, max_relative_error)
+    for metric in VALIDATED_METRICS:
+        errors = [abs(row['relative_error']) for row in results
+                  if row['metric'] == metric and row['relative_error'] is not None]
+        # The relative error cannot be calculated if all simulated values of the metric are zero
+        if not errors:
+            print(f"{metric}: no results to compare")
+            continue
+        summary = (f"{metric}: mean absolute relative error {sum(errors) / len(errors):.2%}, "
+                   f"maximum absolute relative error {max(errors):.2%}")
+        if metric in failed_metrics:
+            summary += f" - FAILED, the allowed maximum of {max_relative_error:.2%} is exceeded"
+        print(summary)
+
+
+def save_results(results, results_file):
+    """Function for saving the validation results to the CSV file."""
+
+    with open(results_file, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    """Main validation function, the exit code is 1 if the relative error of any metric exceeds the maximum."""
+
+    results = run_validation(analytic_config.VALIDATION_GRID, max_workers=analytic_config.MAX_WORKERS)
+    save_results(results, analytic_config.VALIDATION_RESULTS_FILE)
+    print_validation_summary(results, analytic_config.MAX_RELATIVE_ERROR)
+    print(f"Validation results saved to {analytic_config.VALIDATION_RESULTS_FILE}")
+    return 1 if get_failed_metrics(results, analytic_config.MAX_RELATIVE_ERROR) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the batch engine. The engine simulates the contention between Access Points for many
+              replications in lockstep. The backoff counters, retransmission counters and statistics of all
+              replications are kept in NumPy arrays and each contention round is advanced with vectorized operations.
+              The frame exchange performed after winning the contention is taken from the analytical model, so the
+              engine produces the distributions of the statistics much faster than the discrete-event simulation.
+"""
+
+import math
+import numpy as np
+
+import configs.batch_config as batch_config
+import configs.channel_config as channel_config
+from helpers import times
+from channel import Channel
+from simulation import Config
+from analytic import (RETRANSMISSION_LIMIT, PACKET_SENDING_TIME, COLLISION_HANDLING_TIME, get_ap_destinations,
+                      get_transmission_resources_units, get_transmission_sequence)
+
+BATCH_METRICS = ['throughput', 'average_latency', 'number_of_transmissions', 'number_of_retransmissions']
+
+
+def get_ap_parameters(config):
+    """Function for getting the arrays of parameters of the transmissions performed by each Access Point."""
+
+    channel = Channel()
+    ap_parameters = {'transmission_time': [], 'first_packet_time': [], 'env_time': [], 'sent_data': [],
+                     'selection_probability': [], 'assigned_stations': []}
+    for number_of_assigned_stations in get_ap_destinations(config):
+        resources_units = get_transmission_resources_units(config, channel, number_of_assigned_stations)
+        number_of_destinations = len(resources_units)
+        transmission_time, first_packet_time, number_of_packets = get_transmission_sequence(config, resources_units)
+        ap_parameters['transmission_time'].append(transmission_time)
+        ap_parameters['first_packet_time'].append(first_packet_time)
+        ap_parameters['env_time'].append(number_of_packets * PACKET_SENDING_TIME)
+        ap_parameters['sent_data'].append(sum(times.get_sent_data(config, bandwidth, number_of_destinations)
+                                              for bandwidth in resources_units))
+        ap_parameters['selection_probability'].append(number_of_destinations / number_of_assigned_stations)
+        ap_parameters['assigned_stations'].append(number_of_assigned_stations)
+    return {key: np.array(value, dtype=float) for key, value in ap_parameters.items()}
+
+
+def draw_backoff_slots(generator, retransmission_counter):
+    """Function for drawing the number of backoff slots for each given retransmission counter."""
+
+    cw = np.minimum(np.left_shift(1, retransmission_counter + 4) - 1, channel_config.CW_MAX)
+    aifs_slots = math.ceil(times.aifs_time / times.slot_time)
+    return generator.integers(0, cw + 1) + aifs_slots
+
+
+def run_batch(config, number_of_replications=batch_config.NUMBER_OF_REPLICATIONS):
+    """Function for running the replications of given configuration in lockstep."""
+
+    generator = np.random.default_rng(config.seed)
+    ap_parameters = get_ap_parameters(config)
+    shape = (number_of_replications, config.number_of_ap)
+    aifs_remainder = math.ceil(times.aifs_time / times.slot_time) * times.slot_time - times.aifs_time
+    # State of the contention in each replication
+    retransmission_counter = np.zeros(shape, dtype=np.int64)
+    backoff_slots = draw_backoff_slots(generator, retransmission_counter)
+    resumed_backoff_slots = backoff_slots.copy()
+    env_time = np.zeros(number_of_replications)
+    active = np.ones(number_of_replications, dtype=bool)
+    # Statistics of each replication
+    transmission_time = np.zeros(shape)
+    data_transferred = np.zeros(shape)
+    transmissions = np.zeros(shape)
+    retransmissions = np.zeros(shape)
+    while active.any():
+        # Count down the backoff until the first Access Point starts the transmission
+        elapsed_slots = np.where(active, backoff_slots.min(axis=1), 0)
+        backoff_slots -= elapsed_slots[:, np.newaxis]
+        env_time += elapsed_slots * times.slot_time
+        transmitting = backoff_slots == 0
+        number_of_transmitting_ap = transmitting.sum(axis=1)
+        success_rows = number_of_transmitting_ap == 1
+        success = transmitting & success_rows[:, np.newaxis]
+        collision = transmitting & ~success_rows[:, np.newaxis]
+        env_time += np.where(success_rows, (success * ap_parameters['env_time']).sum(axis=1),
+                             np.where(number_of_transmitting_ap > 1, COLLISION_HANDLING_TIME, 0))
+        # Account only the transmissions finished before the end of the simulation
+        finished = (env_time <= config.simulation_time)[:, np.newaxis]
+        transmission_time += finished * transmitting * (resumed_backoff_slots * times.slot_time - aifs_remainder)
+        transmission_time += finished * success * ap_parameters['transmission_time']
+        transmission_time += finished * collision * (ap_parameters['first_packet_time'] + times.sifs_time) / 2
+        data_transferred += finished * success * ap_parameters['sent_data']
+        transmissions += finished * success
+        retransmissions += finished * collision
+        # Repeat the backoff procedure after a collision or drop the packet after too many tries
+        retransmission_counter = np.where(collision, retransmission_counter + 1, retransmission_counter)
+        retransmission_counter[success | (retransmission_counter > RETRANSMISSION_LIMIT)] = 0
+        backoff_slots = np.where(transmitting, draw_backoff_slots(generator, retransmission_counter), backoff_slots)
+        # The countdown of the other Access Points is resumed after a successful transmission
+        resumed_backoff_slots = np.where(transmitting | success_rows[:, np.newaxis], backoff_slots,
+                                         resumed_backoff_slots)
+        active = env_time < config.simulation_time
+    return get_batch_results(ap_parameters, transmission_time, data_transferred, transmissions, retransmissions)
+
+
+def get_batch_results(ap_parameters, transmission_time, data_transferred, transmissions, retransmissions):
+    """Function for calculating the statistics of each replication."""
+
+    total_transmission_time = transmission_time.sum(axis=1)
+    selection_probability = ap_parameters['selection_probability']
+    # Half of the collided packet is subtracted only from the accounted time, the stations wait for all of it
+    latency_time = transmission_time + retransmissions * (ap_parameters['first_packet_time'] + times.sifs_time) / 2
+    # Each station waits during all transmissions in which it is not selected
+    with np.errstate(divide='ignore', invalid='ignore'):
+        latency_per_ap = ((latency_time.sum(axis=1)[:, np.newaxis] - selection_probability * latency_time)
+                          / (selection_probability * transmissions)) / 1000
+    assigned_stations = ap_parameters['assigned_stations']
+    results = {
+        'throughput': data_transferred.sum(axis=1) / total_transmission_time,
+        'average_latency': (latency_per_ap * assigned_stations).sum(axis=1) / assigned_stations.sum(),
+        'number_of_transmissions': transmissions.sum(axis=1),
+        'number_of_retransmissions': retransmissions.sum(axis=1)
+    }
+    return results
+
+
+def print_batch_results(results):
+    """Function for printing the distribution of each statistic."""
+
+    for metric in BATCH_METRICS:
+        values = results[metric]
+        percentiles = np.percentile(values, [5, 50, 95])
+        print(f"{metric}: mean {values.mean():.3f}, std {values.std():.3f}, 5th percentile {percentiles[0]:.3f}, "
+              f"median {percentiles[1]:.3f}, 95th percentile {percentiles[2]:.3f}")
+
+
+def main():
+    """Main batch engine function."""
+
+    results = run_batch(Config())
+    print_batch_results(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the micro-benchmark of the airtime tables. The benchmark measures the time spent in the
+              AccessPoint.send_data_packet path when the packet durations are calculated for every frame and when they
+              are taken from the airtime tables. It should be run from the ofdma_simulator directory:
+              python3 -m benchmarks.airtime_benchmark
+"""
+
+import timeit
+
+from helpers import times
+from simulation import Simulator
+
+NUMBER_OF_CALLS = 20000
+REPEAT = 5
+
+
+def prepare_access_point():
+    """Function for preparing the Access Point with stations selected and resources allocated."""
+
+    simulator = Simulator()
+    simulator.initialize_simulator()
+    access_point = simulator.ap_list[0]
+    access_point.assign_stations_to_ap(simulator.stations_list)
+    access_point.select_stations_for_current_transmission()
+    access_point.allocate_resources()
+    return access_point
+
+
+def send_data_packet(access_point):
+    """Function for running the AccessPoint.send_data_packet path up to the moment the packet is sent."""
+
+    next(access_point.send_data_packet())
+    for station in access_point.destination_stations:
+        times.get_sent_data(access_point.config, station.allocated_bw, len(access_point.destination_stations))
+
+
+def calculate_packet_time(config, packet_type, bandwidth=None, number_of_destinations=None, mcs=None, nss=None,
+                          number_of_mpdu=None):
+    """Function for calculating the packet duration without the airtime table."""
+
+    return times.calculate_packet_time(times.get_airtime_parameters(config, mcs, nss), packet_type, bandwidth,
+                                       number_of_destinations, number_of_mpdu)
+
+
+def calculate_sent_data(config, bandwidth, number_of_destinations, mcs=None, nss=None, number_of_mpdu=None):
+    """Function for calculating the amount of sent data without the sent data table."""
+
+    return times.calculate_sent_data(times.get_airtime_parameters(config, mcs, nss), bandwidth, number_of_destinations,
+                                     number_of_mpdu)
+
+
+def measure(access_point):
+    """Function for measuring the best time of a single send_data_packet call in microseconds."""
+
+    results = timeit.repeat(lambda: send_data_packet(access_point), number=NUMBER_OF_CALLS, repeat=REPEAT)
+    return min(results) / NUMBER_OF_CALLS * 1000000
+
+
+def main():
+    """Main benchmark function."""
+
+    access_point = prepare_access_point()
+    get_packet_time = times.get_packet_time
+    get_sent_data = times.get_sent_data
+    # Calculate the packet durations for every frame
+    times.get_packet_time = calculate_packet_time
+    times.get_sent_data = calculate_sent_data
+    calculated_time = measure(access_point)
+    # Take the packet durations from the airtime tables
+    times.get_packet_time = get_packet_time
+    times.get_sent_data = get_sent_data
+    times.clear_airtime_tables()
+    table_time = measure(access_point)
+    print(f"send_data_packet with calculated airtime: {calculated_time:.2f} us per call")
+    print(f"send_data_packet with airtime tables: {table_time:.2f} us per call")
+    print(f"Speedup: {calculated_time / table_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
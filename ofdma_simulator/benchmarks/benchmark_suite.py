@@ -0,0 +1,203 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the benchmark suite. Each scenario defined in the benchmark_config.py file is run in a
+              new worker process, so the caches and the memory of one run do not affect the next one, and its wall
+              time, simulated time per second, events per second and peak memory are measured. The measurements are
+              compared with the baseline file and the changes beyond the tolerance are reported as regressions. The
+              statistics of each scenario are compared too, so the optimizations which change the results are found.
+              It should be run from the ofdma_simulator directory:
+              python3 -m benchmarks.benchmark_suite [--update-baseline] [--scenarios NAME ...] [--tolerance VALUE]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+
+import simpy
+
+import configs.benchmark_config as benchmark_config
+from helpers.instrumentation import get_peak_memory
+from simulation import Config, Simulator
+
+# Measurements which are worse when they grow and when they drop, respectively
+LOWER_IS_BETTER = ['wall_time', 'peak_memory']
+HIGHER_IS_BETTER = ['simulated_time_per_second', 'events_per_second']
+# Statistics which must be the same as in the baseline
+RESULT_METRICS = ['throughput', 'number_of_transmissions', 'number_of_retransmissions']
+
+
+def count_processed_events(env):
+    """Function for counting the events processed by the environment, the counter is returned as a list."""
+
+    processed_events = [0]
+    step = env.step
+
+    def counted_step():
+        processed_events[0] += 1
+        step()
+
+    env.step = counted_step
+    return processed_events
+
+
+def run_scenario(config):
+    """Function for running the simulation of the scenario and measuring it."""
+
+    start_time = time.perf_counter()
+    simulator = Simulator(config)
+    simulator.initialize_simulator()
+    processed_events = count_processed_events(simulator.env)
+    stats = simulator.run_simulation(verbose=False)
+    wall_time = time.perf_counter() - start_time
+    statistics = stats.get_statistics()
+    measurements = {
+        'wall_time': round(wall_time, 6),
+        'simulated_time_per_second': round(simulator.env.now / wall_time, 3),
+        'events_per_second': round(processed_events[0] / wall_time, 3),
+        'processed_events': processed_events[0],
+        'peak_memory': get_peak_memory()
+    }
+    for metric in RESULT_METRICS:
+        measurements[metric] = statistics[metric]
+    return measurements
+
+
+def measure_scenario(scenario, repeat):
+    """Function for running the scenario in new worker processes and getting the measurements of the best run."""
+
+    config = dataclasses.replace(Config(), simulation_time=benchmark_config.SIMULATION_TIME,
+                                 **benchmark_config.SCENARIOS[scenario])
+    runs = []
+    for _ in range(0, repeat):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            runs.append(executor.submit(run_scenario, config).result())
+    measurements = min(runs, key=lambda run: run['wall_time'])
+    # The peak memory does not depend on the speed of the run, so the largest value is reported
+    if all(run['peak_memory'] is not None for run in runs):
+        measurements['peak_memory'] = max(run['peak_memory'] for run in runs)
+    return measurements
+
+
+def get_environment():
+    """Function for getting the description of the environment in which the benchmark is run."""
+
+    return {
+        'python': platform.python_version(),
+        'simpy': simpy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare_with_baseline(measurements, baseline, tolerance):
+    """Function for comparing the measurements of the scenario with its baseline and getting the status of each."""
+
+    comparison = {}
+    for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+        value = measurements[metric]
+        baseline_value = baseline.get(metric)
+        if value is None or not baseline_value:
+            comparison[metric] = {'value': value, 'baseline': baseline_value, 'change': None, 'status': 'no baseline'}
+            continue
+        change = (value - baseline_value) / baseline_value
+        # The change is counted so that a positive value always means a slower or larger run
+        worsening = change if metric in LOWER_IS_BETTER else -change
+        if worsening > tolerance:
+            status = 'regression'
+        elif worsening < -tolerance:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparison[metric] = {'value': value, 'baseline': baseline_value, 'change': round(change, 4), 'status': status}
+    for metric in RESULT_METRICS:
+        value = measurements[metric]
+        baseline_value = baseline.get(metric)
+        if metric not in baseline:
+            status = 'no baseline'
+        else:
+            status = 'ok' if value == baseline_value else 'changed'
+        comparison[metric] = {'value': value, 'baseline': baseline_value, 'change': None, 'status': status}
+    return comparison
+
+
+def load_baseline(baseline_file):
+    """Function for reading the baseline file, None if it does not exist."""
+
+    if not os.path.exists(baseline_file):
+        return None
+    with open(baseline_file) as file:
+        return json.load(file)
+
+
+def save_json(data, json_file):
+    """Function for saving the data to the JSON file."""
+
+    with open(json_file, 'w') as file:
+        json.dump(data, file, indent=4)
+
+
+def print_comparison(scenario, comparison):
+    """Function for printing the comparison of the scenario with its baseline."""
+
+    print(f"{scenario}:")
+    for metric, result in comparison.items():
+        change = f"{result['change']:+.1%}" if result['change'] is not None else '-'
+        print(f"  {metric:<28}{str(result['value']):>16}{str(result['baseline']):>16}{change:>10}  {result['status']}")
+
+
+def parse_arguments(arguments):
+    """Function for parsing the command-line arguments of the benchmark suite."""
+
+    parser = argparse.ArgumentParser(description='Run the benchmark scenarios and compare them with the baseline.')
+    parser.add_argument('--update-baseline', action='store_true', help='save the measurements as the new baseline')
+    parser.add_argument('--scenarios', nargs='+', choices=list(benchmark_config.SCENARIOS),
+                        default=list(benchmark_config.SCENARIOS), help='scenarios to run')
+    parser.add_argument('--tolerance', type=float, default=benchmark_config.TOLERANCE,
+                        help='relative change reported as a regression')
+    parser.add_argument('--repeat', type=int, default=benchmark_config.REPEAT, help='number of runs of each scenario')
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    """Main benchmark function, the exit code is 1 if any regression or changed result is found."""
+
+    arguments = parse_arguments(arguments)
+    baseline = load_baseline(benchmark_config.BASELINE_FILE)
+    environment = get_environment()
+    if baseline is not None and baseline['environment'] != environment:
+        print("Warning: the baseline was measured in a different environment, the comparison may not be reliable")
+    results = {'environment': environment, 'tolerance': arguments.tolerance, 'scenarios': {}}
+    failed = False
+    for scenario in arguments.scenarios:
+        measurements = measure_scenario(scenario, arguments.repeat)
+        scenario_baseline = {}
+        if baseline is not None:
+            scenario_baseline = baseline['scenarios'].get(scenario, {})
+        comparison = compare_with_baseline(measurements, scenario_baseline, arguments.tolerance)
+        results['scenarios'][scenario] = {'measurements': measurements, 'comparison': comparison}
+        print_comparison(scenario, comparison)
+        if scenario_baseline and any(result['status'] in ['regression', 'changed'] for result in comparison.values()):
+            failed = True
+    save_json(results, benchmark_config.RESULTS_FILE)
+    print(f"Results saved to {benchmark_config.RESULTS_FILE}")
+    if arguments.update_baseline or baseline is None:
+        # The scenarios which were not run keep their previous baseline
+        scenarios = baseline['scenarios'] if baseline is not None else {}
+        for scenario, result in results['scenarios'].items():
+            scenarios[scenario] = result['measurements']
+        save_json({'environment': environment, 'scenarios': scenarios}, benchmark_config.BASELINE_FILE)
+        print(f"Baseline saved to {benchmark_config.BASELINE_FILE}")
+        failed = False
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
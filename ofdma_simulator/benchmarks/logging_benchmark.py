@@ -0,0 +1,49 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the benchmark of the logging cost. The same simulation is run with the events logged to
+              the file and in the no trace mode, and the share of the wall time spent on logging is printed. It should
+              be run from the ofdma_simulator directory:
+              python3 -m benchmarks.logging_benchmark
+"""
+
+import time
+import tempfile
+
+from helpers.logger import prepare_logger
+from simulation import Config, Simulator
+
+SIM_TIME = 100000
+REPEAT = 3
+
+
+def measure(log_level, logs_dir):
+    """Function for measuring the best wall time of the simulation with given log level in seconds."""
+
+    prepare_logger(log_level, logs_dir)
+    results = []
+    for _ in range(0, REPEAT):
+        simulator = Simulator(Config(simulation_time=SIM_TIME))
+        simulator.initialize_simulator()
+        start_time = time.perf_counter()
+        simulator.run_simulation(verbose=False)
+        results.append(time.perf_counter() - start_time)
+    return min(results)
+
+
+def main():
+    """Main benchmark function."""
+
+    with tempfile.TemporaryDirectory() as logs_dir:
+        logged_time = measure('INFO', logs_dir)
+        no_trace_time = measure('NONE', logs_dir)
+        prepare_logger('NONE', logs_dir)
+    print(f"Simulation with logs saved to the file: {logged_time:.3f} s")
+    print(f"Simulation in the no trace mode: {no_trace_time:.3f} s")
+    print(f"Wall time spent on logging: {logged_time - no_trace_time:.3f} s "
+          f"({(logged_time - no_trace_time) / logged_time:.1%})")
+
+
+if __name__ == '__main__':
+    main()
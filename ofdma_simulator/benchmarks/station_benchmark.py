@@ -0,0 +1,55 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the benchmark of the station backends. Simulations with a growing number of stations are
+              run with a separate object for each station and with the state of all stations kept in arrays, and the
+              wall time and the memory allocated per station are printed. It should be run from the ofdma_simulator
+              directory:
+              python3 -m benchmarks.station_benchmark
+"""
+
+import time
+import tracemalloc
+
+from simulation import Config, Simulator
+
+SIM_TIME = 100000
+NUMBER_OF_AP = 4
+# Number of stations simulated with each backend, the NODE backend is skipped for the largest scenarios
+NUMBER_OF_STATIONS = {
+    'NODE': [1000, 10000],
+    'ARRAY': [1000, 10000, 100000]
+}
+
+
+def measure(station_backend, number_of_stations):
+    """Function for measuring the wall time and the peak memory allocated per station."""
+
+    config = Config(simulation_time=SIM_TIME, number_of_ap=NUMBER_OF_AP, number_of_stations=number_of_stations,
+                    station_backend=station_backend)
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    simulator = Simulator(config)
+    simulator.initialize_simulator()
+    initialized_memory = tracemalloc.get_traced_memory()[0]
+    simulator.run_simulation(verbose=False)
+    wall_time = time.perf_counter() - start_time
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return wall_time, initialized_memory / number_of_stations, peak_memory / number_of_stations
+
+
+def main():
+    """Main benchmark function."""
+
+    for station_backend, numbers_of_stations in NUMBER_OF_STATIONS.items():
+        for number_of_stations in numbers_of_stations:
+            wall_time, initialized_memory, peak_memory = measure(station_backend, number_of_stations)
+            print(f"{station_backend} backend, {number_of_stations} stations: {wall_time:.3f} s, "
+                  f"{initialized_memory:.0f} B per station after initialization, "
+                  f"{peak_memory:.0f} B per station at peak")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,21 +3,79 @@
 :author: Damian Piasecki
 :email: piasecki.damian97@gmail.com
 :description: File containing the Channel class. The Channel data class is used to initialize the parameters
-              specific to the radio channel.
+              specific to the radio channel, to signal the changes of the channel state to the nodes waiting for
+              them and to select the nodes which receive each transmitted packet.
 """
 
-from dataclasses import dataclass
+import simpy
+from dataclasses import dataclass, field
 
 import configs.channel_config as channel_config
+from packet import PacketPool
 
 
 @dataclass()
 class Channel:
     """Dataclass containing channel settings."""
 
+    env: simpy.Environment = None
     bandwidth: int = channel_config.CHANNEL_BW
     max_stations_in_transmission = channel_config.STATIONS_NUMBER_DICT
     possible_subchannels = channel_config.SUBCHANNELS
-    channel_available: bool = True
-    nodes_in_channel = []
-    transmitting_ap = []
+    nodes_in_channel: list = field(default_factory=list)
+    transmitting_ap: list = field(default_factory=list)
+    packet_pool: PacketPool = field(default_factory=PacketPool)
+    access_points_mask: int = 0
+    number_of_countdowns: int = 0
+
+    def __post_init__(self):
+        """Channel class post-initializer."""
+
+        self._channel_available = True
+        self._idle_event = None
+
+    @property
+    def channel_available(self):
+        """Flag indicating whether the channel is idle."""
+
+        return self._channel_available
+
+    @channel_available.setter
+    def channel_available(self, available):
+        """Function for changing the channel state and waking up the nodes waiting for that change."""
+
+        self._channel_available = available
+        if available and self._idle_event is not None:
+            idle_event, self._idle_event = self._idle_event, None
+            idle_event.succeed()
+
+    def add_node(self, node):
+        """Function for adding the node to the nodes listening in the channel."""
+
+        # Each node listening in the channel is represented by a single bit in the packet destinations
+        node.channel_mask = 1 << len(self.nodes_in_channel)
+        self.nodes_in_channel.append(node)
+        if node.is_ap:
+            self.access_points_mask |= node.channel_mask
+
+    def get_receivers(self, packet):
+        """Function for getting the nodes receiving the packet in the order in which they joined the channel."""
+
+        # Every Access Point receives the packet to freeze its backoff procedure, the Stations receive only the packets
+        # addressed to them
+        receivers_mask = packet.destinations_mask | self.access_points_mask
+        receivers = []
+        while receivers_mask:
+            lowest_bit = receivers_mask & -receivers_mask
+            receivers.append(self.nodes_in_channel[lowest_bit.bit_length() - 1])
+            receivers_mask ^= lowest_bit
+        return receivers
+
+    def wait_for_idle(self):
+        """Function returning the event which is triggered when the channel becomes idle."""
+
+        if self._channel_available:
+            return self.env.event().succeed()
+        if self._idle_event is None:
+            self._idle_event = self.env.event()
+        return self._idle_event
@@ -0,0 +1,254 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the command-line entry point of the simulator. Each field of the Config class can be
+              given as a command-line option or in a TOML or JSON scenario file, the options given in the command
+              line replace the values from the files. The settings are validated before any simulation is started,
+              a batch of scenario files can be simulated in one call, in worker processes, and the settings and the
+              statistics of each simulation are written as JSON. The script can be run from any directory, by its
+              path or as a module from the root of the repository:
+              python3 ofdma_simulator/cli.py --scenario dense.toml sparse.json --number-of-ap 2 --output results.json
+              python3 -m ofdma_simulator.cli --scenario dense.toml sparse.json --number-of-ap 2 --output results.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+# The modules of the simulator import each other by their names, so the directory of the script is added to the path
+# to run it from any directory, also as the ofdma_simulator.cli module
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import configs.channel_config as channel_config
+from helpers.logger import prepare_logger
+from link_adaptation import LINK_ADAPTATION_POLICIES
+from scheduler import SCHEDULERS
+from simulation import Config
+from sweep import run_configuration
+from traffic import TRAFFIC_MODELS
+
+# Allowed values of the settings which select one of the predefined options
+CONFIG_CHOICES = {
+    'direction': ['DL', 'UL'],
+    'run_mode': ['DES', 'ANALYTIC'],
+    'ru_allocator': ['SUBCHANNELS', 'TONE_PLAN'],
+    'scheduler': list(SCHEDULERS),
+    'station_backend': ['NODE', 'ARRAY'],
+    'traffic_model': ['SATURATED'] + list(TRAFFIC_MODELS),
+    'link_adaptation': [None] + list(LINK_ADAPTATION_POLICIES)
+}
+# Settings which must be greater than zero
+POSITIVE_FIELDS = ['simulation_time', 'number_of_ap', 'number_of_stations', 'data_rate', 'traffic_load',
+                   'traffic_on_time', 'traffic_off_time', 'metrics_interval', 'checkpoint_interval',
+                   'steady_state_precision']
+# Settings holding the values assigned to the Stations in turn, which cannot be empty lists
+STATION_LIST_FIELDS = ['station_mcs', 'station_nss']
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'NONE']
+TRUE_VALUES = ['true', 'yes', '1']
+FALSE_VALUES = ['false', 'no', '0']
+NONE_VALUES = ['none', 'null']
+
+
+def get_config_fields():
+    """Function for getting the fields of the Config class by their names."""
+
+    return {config_field.name: config_field for config_field in dataclasses.fields(Config)}
+
+
+def parse_value(value, field_type):
+    """Function for converting the command-line value to the type of the Config field."""
+
+    if value.lower() in NONE_VALUES:
+        return None
+    if field_type is bool:
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise argparse.ArgumentTypeError(f'invalid boolean value: {value}')
+    if field_type is list:
+        # The list is given in the JSON format or as comma-separated numbers
+        try:
+            if value.startswith('['):
+                return json.loads(value)
+            if not value.strip():
+                return []
+            return [json.loads(item) for item in value.split(',')]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'invalid list value: {value}')
+    try:
+        return field_type(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid {field_type.__name__} value: {value}')
+
+
+def load_scenario_file(scenario_file):
+    """Function for reading the settings of the scenario from the TOML or JSON file."""
+
+    if scenario_file.endswith('.toml'):
+        if tomllib is None:
+            raise ValueError('TOML scenario files require Python 3.11 or newer, use a JSON file instead')
+        with open(scenario_file, 'rb') as file:
+            return tomllib.load(file)
+    if scenario_file.endswith('.json'):
+        with open(scenario_file) as file:
+            return json.load(file)
+    raise ValueError(f'Unknown format of the scenario file: {scenario_file}')
+
+
+def check_type(name, value, field_type):
+    """Function for getting the error message if the value does not have the type of the Config field."""
+
+    # The fields which are disabled by default can be set to None
+    if value is None:
+        return None
+    if field_type is float and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None
+    if field_type is int and isinstance(value, bool):
+        return f'{name} must be {field_type.__name__}, got {value!r}'
+    if field_type is list and isinstance(value, list):
+        if all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in value):
+            return None
+        return f'{name} must be a list of numbers, got {value!r}'
+    if not isinstance(value, field_type):
+        return f'{name} must be {field_type.__name__}, got {value!r}'
+    return None
+
+
+def validate_settings(settings):
+    """Function for creating the Config object from the settings, ValueError is raised with all invalid settings."""
+
+    config_fields = get_config_fields()
+    errors = []
+    for name, value in settings.items():
+        if name not in config_fields:
+            errors.append(f'unknown setting {name}')
+            continue
+        error = check_type(name, value, config_fields[name].type)
+        if error is not None:
+            errors.append(error)
+    if errors:
+        raise ValueError('Invalid settings: ' + '; '.join(errors))
+    config = Config(**settings)
+    for name, choices in CONFIG_CHOICES.items():
+        if getattr(config, name) not in choices:
+            errors.append(f'{name} must be one of {choices}, got {getattr(config, name)!r}')
+    for name in POSITIVE_FIELDS:
+        value = getattr(config, name)
+        if value is not None and value <= 0:
+            errors.append(f'{name} must be greater than 0, got {value!r}')
+    for name in STATION_LIST_FIELDS:
+        if getattr(config, name) == []:
+            errors.append(f'{name} must not be empty, set it to none to use the same value for all stations')
+    for mcs in [config.mcs] + (config.station_mcs or []):
+        if mcs not in channel_config.MCS_DICT:
+            errors.append(f'MCS must be one of {list(channel_config.MCS_DICT)}, got {mcs!r}')
+    for nss in [config.nss] + (config.station_nss or []):
+        if nss not in range(1, channel_config.MAX_SPATIAL_STREAMS_NUMBER + 1):
+            errors.append(f'NSS must be between 1 and {channel_config.MAX_SPATIAL_STREAMS_NUMBER}, got {nss!r}')
+    if config.ru_predefined and not config.ru_list:
+        errors.append('ru_list must not be empty when ru_predefined is set')
+    if config.number_of_stations < config.number_of_ap:
+        errors.append('number_of_stations must not be smaller than number_of_ap')
+    if config.checkpoint_file and not config.single_timeout_backoff:
+        errors.append('checkpoint_file requires single_timeout_backoff')
+    if errors:
+        raise ValueError('Invalid settings: ' + '; '.join(errors))
+    return config
+
+
+def parse_arguments(arguments):
+    """Function for parsing the command-line arguments, each Config field is given as an option."""
+
+    parser = argparse.ArgumentParser(description='Run the 802.11ax OFDMA simulation.')
+    parser.add_argument('--scenario', nargs='+', default=[], metavar='FILE',
+                        help='TOML or JSON files with the settings, each file is simulated separately')
+    parser.add_argument('--output', metavar='FILE', help='JSON file with the results, printed if not given')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    # The events are not logged by default, so a batch does not write verbose logs to the system directory
+    parser.add_argument('--log-level', default='NONE', choices=LOG_LEVELS, help='minimum level of the logged events')
+    parser.add_argument('--logs-dir', default='.', help='directory of the log files, one file for each scenario')
+    settings = parser.add_argument_group('simulation settings', 'the default values are taken from '
+                                                                'simulation_config.py')
+    for name, config_field in get_config_fields().items():
+        settings.add_argument('--' + name.replace('_', '-'), dest=name, metavar='VALUE', default=argparse.SUPPRESS,
+                              type=lambda value, field_type=config_field.type: parse_value(value, field_type))
+    return parser.parse_args(arguments)
+
+
+def get_scenarios(arguments):
+    """Function for getting the name and the Config object of each scenario."""
+
+    config_fields = get_config_fields()
+    options = {name: value for name, value in vars(arguments).items() if name in config_fields}
+    if not arguments.scenario:
+        return [('command-line', validate_settings(options))]
+    scenarios = []
+    names = [os.path.splitext(os.path.basename(scenario_file))[0] for scenario_file in arguments.scenario]
+    for i, (name, scenario_file) in enumerate(zip(names, arguments.scenario)):
+        # The name gives the log file of the scenario, so the files with the same name are numbered
+        if names.count(name) > 1:
+            name = f'{name}_{i + 1}'
+        try:
+            settings = {**load_scenario_file(scenario_file), **options}
+            scenarios.append((name, validate_settings(settings)))
+        except (OSError, ValueError) as error:
+            raise ValueError(f'{scenario_file}: {error}')
+    return scenarios
+
+
+def run_scenario(config, log_level, logs_dir, log_file):
+    """Function for running the simulation of the scenario in the worker process, logged to its own file."""
+
+    prepare_logger(log_level, logs_dir, log_file)
+    return run_configuration(config)
+
+
+def run_scenarios(scenarios, workers=1, log_level='NONE', logs_dir='.'):
+    """Function for running the simulation of each scenario and getting the results of all of them."""
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_scenario, config, log_level, logs_dir, f'ofdma_simulation_{name}.log')
+                   for name, config in scenarios]
+        for (name, config), future in zip(scenarios, futures):
+            result = {'scenario': name, 'config': dataclasses.asdict(config)}
+            try:
+                result.update({'status': 'ok', 'statistics': future.result()})
+            except Exception as error:
+                # A failed simulation is recorded in the results, so the remaining scenarios are not lost
+                result.update({'status': 'failed', 'error': repr(error)})
+            results.append(result)
+    return results
+
+
+def main(arguments=None):
+    """Main command-line function, the exit code is 1 if any simulation failed and 2 if the settings are invalid."""
+
+    arguments = parse_arguments(arguments)
+    try:
+        scenarios = get_scenarios(arguments)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+    results = run_scenarios(scenarios, arguments.workers, arguments.log_level, arguments.logs_dir)
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(results, file, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+    return 1 if any(result['status'] == 'failed' for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the definition of constants used to validate the analytical model against the
+              discrete-event simulation.
+"""
+
+
+# Validation parameters, each key is the name of a Config field and each value is the list of values to simulate
+VALIDATION_GRID = {
+    # The simulation time is long enough for the number of retransmissions to be compared with small statistical error
+    'simulation_time': [1000000],
+    'mcs': [0, 5, 11],
+    'number_of_ap': [1, 2, 4],
+    'direction': ['DL', 'UL'],
+    'rts_procedure': [False, True],
+    'mpdu_aggregation': [False, True]
+}
+VALIDATION_RESULTS_FILE = 'analytic_validation.csv'
+MAX_RELATIVE_ERROR = 0.05  # maximum absolute relative error of each metric, the validation fails if it is exceeded
+MAX_WORKERS = None  # number of worker processes, all available cores are used if set to None
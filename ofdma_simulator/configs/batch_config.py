@@ -0,0 +1,10 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the definition of constants used as batch engine settings.
+"""
+
+
+# Batch engine parameters
+NUMBER_OF_REPLICATIONS = 1000
@@ -0,0 +1,25 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the definition of constants used as benchmark suite settings.
+"""
+
+import os
+
+# Directory of the benchmark suite, the baseline and the results are kept next to it whatever the working directory
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+# Benchmark scenarios, each value holds the Config fields changed from the values defined in simulation_config.py
+SCENARIOS = {
+    'dl_1ap_60sta': {},
+    'ul_1ap_60sta_bsrp_rts': {'direction': 'UL', 'bsrp_procedure': True, 'rts_procedure': True},
+    'dl_4ap_200sta_aggregation': {'number_of_ap': 4, 'number_of_stations': 200, 'mpdu_aggregation': True},
+    'dl_4ap_1000sta_stress': {'number_of_ap': 4, 'number_of_stations': 1000},
+    'dl_1ap_60sta_mixed_mcs_aggregation': {'station_mcs': [0, 5, 11], 'mpdu_aggregation': True}
+}
+SIMULATION_TIME = 1000000  # simulation time of each scenario, long enough to make the wall time stable [us]
+REPEAT = 3  # number of runs of each scenario, the best run is reported
+TOLERANCE = 0.1  # relative change of the measurements compared to the baseline reported as a regression
+BASELINE_FILE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+RESULTS_FILE = os.path.join(BENCHMARKS_DIR, 'results.json')
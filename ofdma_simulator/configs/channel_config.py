@@ -8,13 +8,32 @@
 # Channel parameters
 CHANNEL_BW = 40
 SUBCHANNELS = [2.22, 5, 10, 20, 40, 80, 160]
-SPATIAL_STREAMS_NUMBER = 1
+MAX_SPATIAL_STREAMS_NUMBER = 8
 
 # EDCA related parameters
 CW_MIN = 15
 CW_MAX = 63
 AIFSN = 3
 
+# Subchannel bandwidth of each RU size of the 802.11ax tone plan [tones]
+RU_BANDWIDTH_DICT = {
+    26: 2.22,
+    52: 5,
+    106: 10,
+    242: 20,
+    484: 40,
+    996: 80,
+    1992: 160
+}
+
+# Size of the RU covering the whole channel for given channel bandwidth
+CHANNEL_RU_DICT = {
+    20: 242,
+    40: 484,
+    80: 996,
+    160: 1992
+}
+
 # Maximum number of stations in transmission for given subchannel bandwidth
 STATIONS_NUMBER_DICT = {
     20: 9,
@@ -83,3 +102,13 @@ MCS_DICT = {
     10: ['1024-QAM', 3/4],
     11: ['1024-QAM', 5/6]
 }
+
+# Number of bits per symbol for given modulation type
+MODULATION_RATE_DICT = {
+    'BPSK': 1,
+    'QPSK': 2,
+    '16-QAM': 4,
+    '64-QAM': 6,
+    '256-QAM': 8,
+    '1024-QAM': 10
+}
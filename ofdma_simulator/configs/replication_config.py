@@ -0,0 +1,14 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the definition of constants used as replication settings.
+"""
+
+
+# Replication parameters
+CONFIDENCE_LEVEL = 0.95
+RELATIVE_PRECISION = 0.01  # requested confidence interval half-width relative to the mean
+MIN_REPLICATIONS = 3
+MAX_REPLICATIONS = 50
+MAX_WORKERS = None  # number of worker processes, all available cores are used if set to None
@@ -8,14 +8,34 @@
 
 # Simulation parameters
 LOGS_DIR = '/var/log/ofdma_simulator'
+LOG_LEVEL = 'INFO'  # DEBUG, INFO, WARNING, ERROR, CRITICAL or NONE to disable the logs
+TRACE_FILE = None  # path to the binary event trace file, the trace is not saved if set to None
+METRICS_FILE = None  # path to the CSV file with windowed metrics, the metrics are not saved if set to None
+METRICS_INTERVAL = 10000  # length of the window in which the metrics are sampled [us]
+INSTRUMENTATION_FILE = None  # path to the JSON file with the profile of the run, the run is not profiled if set to None
+CHECKPOINT_FILE = None  # path to the checkpoint file, the checkpoints are not saved if set to None
+CHECKPOINT_INTERVAL = 100000  # simulation time between the checkpoints [us]
 SIM_TIME = 100000
 NUMBER_OF_AP = 1
 NUMBER_OF_STATIONS = 60
 SEED = 1
 DIRECTION = 'DL'  # DL or UL
 MCS = 11  # modulation and coding scheme
+NSS = 1  # number of spatial streams
+STATION_MCS = None  # list of MCS values assigned to the stations in turn, MCS is used for all stations if set to None
+STATION_NSS = None  # list of NSS values assigned to the stations in turn, NSS is used for all stations if set to None
+LINK_ADAPTATION = None  # ARF (Auto Rate Fallback), the MCS of the stations is not changed if set to None
 DATA_RATE = 72  # [Mb/s]
 RU_LIST = [10, 10, 10, 10]  # subchannels BW list
+RUN_MODE = 'DES'  # DES (discrete-event simulation) or ANALYTIC
+RU_ALLOCATOR = 'SUBCHANNELS'  # SUBCHANNELS or TONE_PLAN, used when RU_PREDEFINED is set to false
+SCHEDULER = 'RANDOM'  # RANDOM, ROUND_ROBIN, PROPORTIONAL_FAIR or MAX_RATE
+STATION_BACKEND = 'NODE'  # NODE (separate object for each station) or ARRAY (state of all stations kept in arrays)
+TRAFFIC_MODEL = 'SATURATED'  # SATURATED, POISSON, ON_OFF or CBR
+TRAFFIC_LOAD = 1  # offered load of each station [Mb/s]
+TRAFFIC_ON_TIME = 10000  # mean duration of the on period of the ON_OFF traffic model [us]
+TRAFFIC_OFF_TIME = 10000  # mean duration of the off period of the ON_OFF traffic model [us]
+STEADY_STATE_PRECISION = None  # relative confidence interval half-width at which the simulation is stopped early
 
 
 # Simulation options
@@ -24,3 +44,6 @@ BSRP_PROCEDURE_ENABLED = False
 MPDU_AGGREGATION_ENABLED = False
 RU_PREDEFINED = True
 DATA_RATE_PREDEFINED = False
+SINGLE_TIMEOUT_BACKOFF_ENABLED = True
+FAST_FORWARD_ENABLED = True
+WARMUP_DETECTION_ENABLED = False
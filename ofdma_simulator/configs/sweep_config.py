@@ -0,0 +1,20 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the definition of constants used as parameter sweep settings.
+"""
+
+
+# Sweep parameters, each key is the name of a Config field and each value is the list of values to simulate
+PARAMETER_GRID = {
+    'mcs': list(range(0, 12)),
+    'number_of_stations': [20, 40, 60],
+    'number_of_ap': [1, 2, 4],
+    'direction': ['DL', 'UL'],
+    'rts_procedure': [False, True],
+    'bsrp_procedure': [False, True],
+    'mpdu_aggregation': [False, True]
+}
+RESULTS_FILE = 'sweep_results.csv'
+MAX_WORKERS = None  # number of worker processes, all available cores are used if set to None
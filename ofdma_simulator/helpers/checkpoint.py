@@ -0,0 +1,34 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing helper functions used to write and read the checkpoints of the simulation. The state of
+              the simulation is pickled and compressed. The checkpoint is written to a temporary file which replaces
+              the previous checkpoint only when it is complete, so the last checkpoint is never lost if the
+              simulation is stopped during writing.
+"""
+
+import os
+import gzip
+import pickle
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(checkpoint_file, state):
+    """Function for writing the state of the simulation to the checkpoint file."""
+
+    temporary_file = checkpoint_file + '.tmp'
+    with gzip.open(temporary_file, 'wb') as file:
+        pickle.dump({'version': CHECKPOINT_VERSION, **state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file, checkpoint_file)
+
+
+def load_checkpoint(checkpoint_file):
+    """Function for reading the state of the simulation from the checkpoint file."""
+
+    with gzip.open(checkpoint_file, 'rb') as file:
+        state = pickle.load(file)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f'Unsupported checkpoint version: {state.get("version")}')
+    return state
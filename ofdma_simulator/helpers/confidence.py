@@ -0,0 +1,32 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing helper functions used to calculate the confidence intervals of the simulation results.
+"""
+
+import math
+from statistics import NormalDist, mean, stdev
+
+
+def get_t_quantile(probability, degrees_of_freedom):
+    """Function for getting the quantile of the Student's t-distribution using the Cornish-Fisher expansion."""
+
+    z = NormalDist().inv_cdf(probability)
+    v = degrees_of_freedom
+    t = (z + (pow(z, 3) + z) / (4 * v)
+         + (5 * pow(z, 5) + 16 * pow(z, 3) + 3 * z) / (96 * pow(v, 2))
+         + (3 * pow(z, 7) + 19 * pow(z, 5) + 17 * pow(z, 3) - 15 * z) / (384 * pow(v, 3))
+         + (79 * pow(z, 9) + 776 * pow(z, 7) + 1482 * pow(z, 5) - 1920 * pow(z, 3) - 945 * z) / (92160 * pow(v, 4)))
+    return t
+
+
+def calculate_confidence_interval(samples, confidence_level):
+    """Function for calculating the mean and the confidence interval half-width of given samples."""
+
+    samples_mean = mean(samples)
+    if len(samples) < 2:
+        return samples_mean, math.inf
+    t = get_t_quantile((1 + confidence_level) / 2, len(samples) - 1)
+    half_width = t * stdev(samples) / math.sqrt(len(samples))
+    return samples_mean, half_width
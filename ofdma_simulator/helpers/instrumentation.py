@@ -0,0 +1,203 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the Instrumentation class. The Instrumentation class counts the simpy events by the
+              process which scheduled them and by their type, counts the packets handled by the nodes and measures
+              the wall-clock time spent in each phase of the transmission. The environment and the nodes are
+              instrumented by replacing their methods with measuring wrappers, so the simulation runs the original
+              methods without any additional check when the instrumentation is disabled.
+"""
+
+import sys
+import json
+import time
+import inspect
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Methods of the nodes whose wall-clock time is counted in each phase of the transmission
+PHASE_METHODS = {
+    'scheduling': ['select_stations_for_current_transmission'],
+    'allocation': ['allocate_resources'],
+    'contention': ['compete_for_channel_and_start_transmission', 'backoff_procedure'],
+    'txop': ['send_bsrp_trigger', 'send_mu_rts', 'send_data_packet', 'send_basic_trigger', 'send_ms_back', 'send_bsr',
+             'send_cts', 'send_tb_back', 'send_response_packets', 'send_packet', 'transmit_in_channel',
+             'handle_received_packet']
+}
+
+
+def get_peak_memory():
+    """Function for getting the peak resident memory of the process in MB, None if it cannot be read."""
+
+    if resource is None:
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The peak memory is given in bytes on macOS and in kilobytes on Linux
+    if sys.platform == 'darwin':
+        return round(peak_memory / 1024 / 1024, 3)
+    return round(peak_memory / 1024, 3)
+
+
+class Instrumentation:
+    """Class containing functions used to measure where the wall-clock time of the simulation is spent."""
+
+    def __init__(self, env, instrumentation_file):
+        """Instrumentation class constructor."""
+
+        self.env = env
+        self.instrumentation_file = instrumentation_file
+        self.events_by_origin = defaultdict(lambda: defaultdict(int))
+        self.received_packets = defaultdict(int)
+        self.phase_times = defaultdict(float)
+        self.phase_calls = defaultdict(int)
+        self.processed_events = 0
+        self.start_time = None
+        self.start_wall_time = None
+        self.wall_time = None
+        self.instrument_environment()
+
+    def instrument_environment(self):
+        """Function for counting the events scheduled and processed by the environment."""
+
+        schedule = self.env.schedule
+        step = self.env.step
+        env = self.env
+        events_by_origin = self.events_by_origin
+
+        def counted_schedule(event, *args):
+            # The event is attributed to the process which is running when the event is scheduled
+            process = env.active_process
+            origin = process.name if process is not None else 'environment'
+            events_by_origin[origin][type(event).__name__] += 1
+            schedule(event, *args)
+
+        def counted_step():
+            self.processed_events += 1
+            step()
+
+        self.env.schedule = counted_schedule
+        self.env.step = counted_step
+
+    def instrument_node(self, node):
+        """Function for replacing the methods of the node with the wrappers measuring their wall-clock time."""
+
+        for phase, method_names in PHASE_METHODS.items():
+            for method_name in method_names:
+                method = getattr(node, method_name, None)
+                if method is None:
+                    continue
+                if method_name == 'handle_received_packet':
+                    method = self.count_received_packets(method)
+                if inspect.isgeneratorfunction(method):
+                    setattr(node, method_name, self.time_generator_function(method, phase))
+                else:
+                    setattr(node, method_name, self.time_function(method, phase))
+
+    def count_received_packets(self, handle_received_packet):
+        """Function for wrapping the packet handler, so the handled packets are counted by their type."""
+
+        received_packets = self.received_packets
+
+        # The Stations kept in arrays handle the packet in a function, the other nodes in a process
+        if inspect.isgeneratorfunction(handle_received_packet):
+            def counted_handle_received_packet(packet):
+                received_packets[packet.packet_type.name] += 1
+                return (yield from handle_received_packet(packet))
+        else:
+            def counted_handle_received_packet(packet):
+                received_packets[packet.packet_type.name] += 1
+                return handle_received_packet(packet)
+
+        return counted_handle_received_packet
+
+    def time_function(self, function, phase):
+        """Function for wrapping the function, so its wall-clock time is added to the phase."""
+
+        def timed_function(*args):
+            start = time.perf_counter()
+            result = function(*args)
+            self.phase_times[phase] += time.perf_counter() - start
+            self.phase_calls[phase] += 1
+            return result
+
+        return timed_function
+
+    def time_generator_function(self, generator_function, phase):
+        """Function for wrapping the process, so the wall-clock time of each of its steps is added to the phase."""
+
+        def timed_generator_function(*args):
+            self.phase_calls[phase] += 1
+            generator = generator_function(*args)
+            timed_generator = self.time_generator(generator, phase)
+            # The process keeps the name of the wrapped generator, so its events are attributed to it
+            timed_generator.__name__ = generator.__name__
+            return timed_generator
+
+        return timed_generator_function
+
+    def time_generator(self, generator, phase):
+        """Function for running the generator step by step and measuring the wall-clock time of each step."""
+
+        value = None
+        exception = None
+        while True:
+            start = time.perf_counter()
+            try:
+                if exception is None:
+                    event = generator.send(value)
+                else:
+                    event = generator.throw(exception)
+            except StopIteration as stop:
+                self.phase_times[phase] += time.perf_counter() - start
+                return stop.value
+            self.phase_times[phase] += time.perf_counter() - start
+            try:
+                value = yield event
+                exception = None
+            except Exception as error:
+                # Interrupts are passed to the wrapped generator
+                value = None
+                exception = error
+
+    def start(self):
+        """Function for starting the measurement of the simulation run."""
+
+        self.start_time = self.env.now
+        self.start_wall_time = time.perf_counter()
+
+    def stop(self):
+        """Function for finishing the measurement of the simulation run."""
+
+        self.wall_time = time.perf_counter() - self.start_wall_time
+
+    def get_results(self):
+        """Function for getting the measurements as a dictionary."""
+
+        wall_time = self.wall_time
+        phase_times = {phase: round(self.phase_times[phase], 6) for phase in PHASE_METHODS}
+        # The time not spent in any phase is spent in the simpy engine and in the other processes
+        phase_times['other'] = round(wall_time - sum(self.phase_times.values()), 6)
+        results = {
+            'wall_time': round(wall_time, 6),
+            'simulated_time': self.env.now - self.start_time,
+            'simulated_time_per_second': round((self.env.now - self.start_time) / wall_time, 3) if wall_time else None,
+            'processed_events': self.processed_events,
+            'events_per_second': round(self.processed_events / wall_time, 3) if wall_time else None,
+            'peak_memory': get_peak_memory(),
+            'phase_wall_times': phase_times,
+            'phase_calls': {phase: self.phase_calls[phase] for phase in PHASE_METHODS},
+            'events_by_origin': {origin: dict(events) for origin, events in sorted(self.events_by_origin.items())},
+            'received_packets': dict(sorted(self.received_packets.items()))
+        }
+        return results
+
+    def write_results(self):
+        """Function for writing the measurements to the JSON file."""
+
+        with open(self.instrumentation_file, 'w') as file:
+            json.dump(self.get_results(), file, indent=4)
@@ -11,13 +11,24 @@ import logging.handlers
 
 import configs.simulation_config as simulation_config
 
+# Level above all standard levels, no message is logged
+NO_TRACE_LEVEL = logging.CRITICAL + 1
 
-def prepare_logger():
+
+def prepare_logger(log_level=simulation_config.LOG_LEVEL, logs_dir=simulation_config.LOGS_DIR,
+                   log_file='ofdma_simulation.log'):
     """Function for preparing logger."""
 
     logger = logging.getLogger('ofdma_simulator')
-    logger.setLevel(logging.DEBUG)
-    fh = logging.handlers.RotatingFileHandler(simulation_config.LOGS_DIR + '/ofdma_simulation.log',
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    # In the no trace mode the messages are discarded before they are formatted
+    if log_level == 'NONE':
+        logger.setLevel(NO_TRACE_LEVEL)
+        return logger
+    logger.setLevel(log_level)
+    fh = logging.handlers.RotatingFileHandler(logs_dir + '/' + log_file,
                                               maxBytes=16777216, backupCount=4)
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(formatter)
@@ -0,0 +1,114 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the MetricsCollector class. The MetricsCollector class samples the transmission
+              statistics of each Access Point and each Station in windows of simulation time and streams them to
+              the CSV file, so only the counters from the previous sample are kept in memory.
+"""
+
+import csv
+
+METRICS_COLUMNS = ['time', 'node', 'throughput', 'latency', 'transmissions', 'retransmissions']
+
+
+class MetricsCollector:
+    """Class containing functions used to collect the transmission statistics in windows of simulation time."""
+
+    def __init__(self, env, stats, ap_list, metrics_file, interval):
+        """MetricsCollector class constructor."""
+
+        self.env = env
+        self.stats = stats
+        self.ap_list = ap_list
+        self.interval = interval
+        self.file = open(metrics_file, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(METRICS_COLUMNS)
+        self.last_sample_time = env.now
+        self.previous_counters = self.get_counters()
+
+    def get_counters(self):
+        """Function for getting the current values of the counters used to calculate the statistics."""
+
+        stats = self.stats
+        counters = {
+            'transmission_time': stats.transmission_time,
+            'latency': stats.get_accumulated_latency_per_station(),
+            'data_transferred': dict(stats.data_transferred_per_station),
+            'station_transmissions': dict(stats.number_of_transmissions_per_station),
+            'ap_transmissions': dict(stats.number_of_transmissions_per_ap),
+            'ap_retransmissions': dict(stats.number_of_retransmissions_per_ap)
+        }
+        return counters
+
+    def collect_metrics(self):
+        """Function for sampling the statistics at the end of each window."""
+
+        while True:
+            yield self.env.timeout(self.interval)
+            self.write_sample()
+
+    def write_sample(self):
+        """Function for writing the statistics of the window finished at the current time."""
+
+        counters = self.get_counters()
+        previous = self.previous_counters
+        transmission_time = counters['transmission_time'] - previous['transmission_time']
+        rows = []
+        for access_point in self.ap_list:
+            data_transferred = 0
+            latency = 0
+            station_transmissions = 0
+            station_rows = []
+            for station in access_point.assigned_stations:
+                data_transferred += counters['data_transferred'][station.name] - previous['data_transferred'][
+                    station.name]
+                latency += counters['latency'][station.name] - previous['latency'][station.name]
+                station_transmissions += (counters['station_transmissions'][station.name]
+                                          - previous['station_transmissions'][station.name])
+                station_rows.append(self.get_row(station.name, transmission_time, counters, previous))
+            transmissions = counters['ap_transmissions'][access_point.name] - previous['ap_transmissions'][
+                access_point.name]
+            retransmissions = counters['ap_retransmissions'][access_point.name] - previous['ap_retransmissions'][
+                access_point.name]
+            # The row of the Access Point is followed by the rows of its Stations
+            throughput = self.calculate_throughput(data_transferred, transmission_time)
+            rows.append([self.env.now, access_point.name, throughput,
+                         self.calculate_latency(latency, station_transmissions), transmissions, retransmissions])
+            rows.extend(station_rows)
+        self.writer.writerows(rows)
+        self.file.flush()
+        self.previous_counters = counters
+        self.last_sample_time = self.env.now
+
+    def get_row(self, station_name, transmission_time, counters, previous):
+        """Function for getting the statistics of the Station in the window."""
+
+        data_transferred = counters['data_transferred'][station_name] - previous['data_transferred'][station_name]
+        latency = counters['latency'][station_name] - previous['latency'][station_name]
+        transmissions = (counters['station_transmissions'][station_name]
+                         - previous['station_transmissions'][station_name])
+        return [self.env.now, station_name, self.calculate_throughput(data_transferred, transmission_time),
+                self.calculate_latency(latency, transmissions), transmissions, None]
+
+    def calculate_throughput(self, data_transferred, transmission_time):
+        """Function for calculating the throughput in the window in Mbps."""
+
+        if transmission_time <= 0:
+            return 0
+        return round(data_transferred / transmission_time, 3)
+
+    def calculate_latency(self, latency, transmissions):
+        """Function for calculating the latency in the window in ms."""
+
+        if transmissions <= 0:
+            return None
+        return round((latency / transmissions) / 1000, 3)
+
+    def close(self):
+        """Function for writing the statistics of the last, incomplete window and closing the file."""
+
+        if self.env.now > self.last_sample_time:
+            self.write_sample()
+        self.file.close()
@@ -7,6 +7,14 @@
 """
 
 import sys
+import copy
+import math
+from collections.abc import MutableMapping
+
+# Counters from which the values accumulated during the warm-up period are removed
+TRUNCATED_COUNTERS = ['data_transferred_per_station', 'number_of_transmissions_per_station',
+                      'number_of_transmissions_per_ap', 'number_of_retransmissions_per_ap', 'mpdu_delay_per_station',
+                      'number_of_mpdu_per_station']
 
 
 class Stats:
@@ -17,35 +25,142 @@ class Stats:
 
         self.transmission_time = 0
         self.latency_per_station = {}
+        self.latency_clock = 0
+        self.latency_clock_excluded_per_station = {}
         self.data_transferred_per_station = {}
         self.throughput_per_station = {}
         self.number_of_transmissions_per_station = {}
         self.number_of_transmissions_per_ap = {}
         self.number_of_retransmissions_per_ap = {}
+        self.mpdu_delay_per_station = {}
+        self.number_of_mpdu_per_station = {}
+        self.max_mpdu_delay = 0
+        self.number_of_skipped_events = 0
+        self.warmup_time = None
 
     def increase_latency_for_station_that_are_not_transmitting(self, stations_in_transmission, latency):
-        station_names = []
+        # The latency is added to the clock common for all stations, the stations in transmission remember the time
+        # they should not be charged for
+        self.latency_clock += latency
+        excluded_per_station = self.latency_clock_excluded_per_station
         for station in stations_in_transmission:
-            station_names.append(station.name)
+            excluded_per_station[station.name] = excluded_per_station.get(station.name, 0) + latency
+
+    def add_mpdu_delay(self, station_name, delay):
+        """Function for counting the delay of the MPDU delivered to or by the station."""
+
+        self.mpdu_delay_per_station[station_name] = self.mpdu_delay_per_station.get(station_name, 0) + delay
+        self.number_of_mpdu_per_station[station_name] = self.number_of_mpdu_per_station.get(station_name, 0) + 1
+        self.max_mpdu_delay = max(self.max_mpdu_delay, delay)
+
+    def get_state(self):
+        """Function for getting all counters saved in the checkpoint."""
+
+        return dict(vars(self))
+
+    def set_state(self, state):
+        """Function for restoring all counters from the checkpoint, the counters kept in arrays are filled in place."""
+
+        for key, value in state.items():
+            if isinstance(value, dict) or not isinstance(value, MutableMapping):
+                setattr(self, key, copy.copy(value))
+            else:
+                getattr(self, key).values[:] = value.values
+
+    def get_snapshot(self):
+        """Function for getting a copy of the counters accumulated so far, used to remove the warm-up period."""
+
+        snapshot = {
+            'transmission_time': self.transmission_time,
+            'latency_clock': self.latency_clock,
+            'latency_per_station': copy.deepcopy(self.latency_per_station),
+            'latency_clock_excluded_per_station': copy.deepcopy(self.latency_clock_excluded_per_station)
+        }
+        for counter in TRUNCATED_COUNTERS:
+            snapshot[counter] = copy.deepcopy(getattr(self, counter))
+        return snapshot
+
+    def truncate(self, snapshot):
+        """Function for removing the values accumulated until the snapshot was taken from all counters."""
+
+        self.update_latency_per_station()
+        excluded_per_station = snapshot['latency_clock_excluded_per_station']
+        for key in self.latency_per_station:
+            self.latency_per_station[key] -= (snapshot['latency_per_station'][key] + snapshot['latency_clock']
+                                              - excluded_per_station.get(key, 0))
+        for counter in TRUNCATED_COUNTERS:
+            values = getattr(self, counter)
+            for key, value in snapshot[counter].items():
+                values[key] -= value
+        self.transmission_time -= snapshot['transmission_time']
+        self.warmup_time = round(snapshot['transmission_time'] / 1000, 3)
+
+    def update_latency_per_station(self):
+        """Function for moving the latency accumulated in the common clock to the latency of each station."""
+
+        for key in self.latency_per_station:
+            self.latency_per_station[key] += self.latency_clock - self.latency_clock_excluded_per_station.get(key, 0)
+        self.latency_clock = 0
+        self.latency_clock_excluded_per_station.clear()
+
+    def get_accumulated_latency_per_station(self):
+        """Function for getting the latency accumulated by each station without resetting the common clock."""
+
+        accumulated_latency = {}
         for key in self.latency_per_station:
-            if key not in station_names:
-                self.latency_per_station[key] += latency
+            accumulated_latency[key] = (self.latency_per_station[key] + self.latency_clock
+                                        - self.latency_clock_excluded_per_station.get(key, 0))
+        return accumulated_latency
 
     def calculate_latency_per_station(self):
+        """Function for calculating the average latency of each station, the accumulated latency is not changed."""
+
+        latency_per_station = {}
+        excluded_per_station = self.latency_clock_excluded_per_station
         for key in self.latency_per_station:
-            latency = (self.latency_per_station[key] / self.number_of_transmissions_per_station[key]) / 1000
-            self.latency_per_station[key] = round(latency, 3)
+            # The latency of a station which has never been served is infinite
+            if self.number_of_transmissions_per_station[key] == 0:
+                latency_per_station[key] = math.inf
+                continue
+            accumulated_latency = self.latency_per_station[key] + (self.latency_clock
+                                                                   - excluded_per_station.get(key, 0))
+            latency = (accumulated_latency / self.number_of_transmissions_per_station[key]) / 1000
+            latency_per_station[key] = round(latency, 3)
+        return latency_per_station
 
     def calculate_average_latency(self):
+        """Function for calculating the average latency of the served stations, None if no station was served."""
+
         latency = 0
         number_of_stations = 0
-        self.calculate_latency_per_station()
-        for key in self.latency_per_station:
-            latency += self.latency_per_station[key]
+        for station_latency in self.calculate_latency_per_station().values():
+            # Skip the stations which have never been served, their number is reported separately
+            if station_latency == math.inf:
+                continue
+            latency += station_latency
             number_of_stations += 1
+        if number_of_stations == 0:
+            return None
         average_latency = round((latency / number_of_stations), 3)
         return average_latency
 
+    def calculate_number_of_starved_stations(self):
+        """Function for counting the stations which have never been served."""
+
+        number_of_starved_stations = 0
+        for key in self.number_of_transmissions_per_station:
+            if self.number_of_transmissions_per_station[key] == 0:
+                number_of_starved_stations += 1
+        return number_of_starved_stations
+
+    def calculate_average_mpdu_delay(self):
+        """Function for calculating the average delay of the delivered MPDUs, None if no MPDU was counted."""
+
+        number_of_mpdu = sum(self.number_of_mpdu_per_station.values())
+        if number_of_mpdu == 0:
+            return None
+        return round(sum(self.mpdu_delay_per_station.values()) / number_of_mpdu / 1000, 3)
+
     def calculate_throughput(self):
         data_transferred = 0
         for key in self.data_transferred_per_station:
@@ -74,14 +189,40 @@ class Stats:
             number_of_retransmissions += self.number_of_retransmissions_per_ap[key]
         return number_of_retransmissions
 
+    def get_statistics(self):
+        """Function for getting the transmission statistics as a dictionary."""
+
+        self.calculate_throughput_per_station()
+        statistics = {
+            'throughput': self.calculate_throughput(),
+            'throughput_per_station': dict(self.throughput_per_station),
+            'average_latency': self.calculate_average_latency(),
+            'number_of_starved_stations': self.calculate_number_of_starved_stations(),
+            'average_mpdu_delay': self.calculate_average_mpdu_delay(),
+            'number_of_transmissions': self.calculate_number_of_transmissions(),
+            'number_of_retransmissions': self.calculate_number_of_retransmissions(),
+            'number_of_skipped_events': self.number_of_skipped_events,
+            'warmup_time': self.warmup_time
+        }
+        return statistics
+
     def print_average_latency(self):
         thr = self.calculate_average_latency()
         print(f"Average latency obtained for the entire network: {thr} ms")
+        # The average latency does not include the stations which have never been served
+        number_of_starved_stations = self.calculate_number_of_starved_stations()
+        if number_of_starved_stations:
+            print(f"Number of stations never served in entire network: {number_of_starved_stations}")
 
     def print_latency_per_station(self):
-        self.calculate_latency_per_station()
-        for key in self.latency_per_station:
-            print(f"{self.latency_per_station[key]}")
+        latency_per_station = self.calculate_latency_per_station()
+        for key in latency_per_station:
+            print(f"{latency_per_station[key]}")
+
+    def print_mpdu_delay(self):
+        average_mpdu_delay = self.calculate_average_mpdu_delay()
+        print(f"Average MPDU delay obtained for the entire network: {average_mpdu_delay} ms")
+        print(f"Maximum MPDU delay obtained for the entire network: {round(self.max_mpdu_delay / 1000, 3)} ms")
 
     def print_throughput(self):
         thr = self.calculate_throughput()
@@ -112,12 +253,25 @@ class Stats:
         for key in self.number_of_retransmissions_per_ap:
             print(f"Number of retransmissions occurred for {key}: {self.number_of_retransmissions_per_ap[key]}")
 
+    def print_warmup_time(self):
+        print(f"Warm-up period removed from the statistics: {self.warmup_time} ms")
+
+    def print_number_of_skipped_events(self):
+        print(f"Number of events skipped by the fast-forward: {self.number_of_skipped_events}")
+
     def print_statistics(self):
         self.print_number_of_transmissions()
         self.print_number_of_retransmissions()
         self.print_throughput_per_station()
         self.print_throughput()
         self.print_average_latency()
+        # The delay of the MPDUs is counted only with the non-saturated traffic
+        if self.number_of_mpdu_per_station:
+            self.print_mpdu_delay()
+        if self.number_of_skipped_events:
+            self.print_number_of_skipped_events()
+        if self.warmup_time is not None:
+            self.print_warmup_time()
 
     def print_simulation_progress(self, env, simulation_time):
         print("Simulation started\n")
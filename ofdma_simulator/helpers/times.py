@@ -7,14 +7,14 @@
 
 import random
 import math
+import functools
+from collections import namedtuple
 
 import configs.channel_config as channel_config
-import configs.simulation_config as simulation_config
+from packet import PacketType
 
-mcs = simulation_config.MCS
-predefined_data_rate = simulation_config.DATA_RATE
-direction = simulation_config.DIRECTION
 mcs_dict = channel_config.MCS_DICT
+modulation_rate_dict = channel_config.MODULATION_RATE_DICT
 subcarriers_dict = channel_config.SUBCARRIERS_DICT
 l_d = channel_config.MPDU_SIZE
 l_sf = channel_config.SERVICE_FIELD
@@ -32,7 +32,7 @@ tphy_he_tb = channel_config.HE_TB_PREAMBLE
 ofdm_legacy = channel_config.OFDM_LEGACY
 ofdm = channel_config.OFDM
 r_legacy = channel_config.LEGACY_DATA_RATE
-spatial_streams_number = channel_config.SPATIAL_STREAMS_NUMBER
+max_spatial_streams_number = channel_config.MAX_SPATIAL_STREAMS_NUMBER
 cw_min = channel_config.CW_MIN
 cw_max = channel_config.CW_MAX
 sifs_time = channel_config.SIFS_TIME
@@ -41,25 +41,71 @@ difs_time = channel_config.DIFS_TIME
 aifs_time = channel_config.AIFS_TIME
 txop_time = channel_config.TXOP_TIME
 
+# Maximum number of entries kept in the airtime tables
+AIRTIME_TABLE_SIZE = 4096
 
-def get_packet_time(packet_type, bandwidth=None, number_of_destinations=None):
-    if packet_type == 'BSRP_TRIGGER':
+# Simulation settings the duration of each packet depends on
+AirtimeParameters = namedtuple('AirtimeParameters', ['mcs', 'nss', 'direction', 'data_rate', 'data_rate_predefined',
+                                                     'mpdu_aggregation', 'rts_procedure'])
+
+
+def get_airtime_parameters(config, mcs=None, nss=None):
+    """Function for getting the simulation settings the duration of each packet depends on."""
+
+    # The MCS and NSS of the Station replace the ones of the configuration
+    return AirtimeParameters(config.mcs if mcs is None else mcs, config.nss if nss is None else nss, config.direction,
+                             config.data_rate, config.data_rate_predefined, config.mpdu_aggregation,
+                             config.rts_procedure)
+
+
+def get_packet_time(config, packet_type, bandwidth=None, number_of_destinations=None, mcs=None, nss=None,
+                    number_of_mpdu=None):
+    """Function for getting the packet duration from the airtime table of the given configuration."""
+
+    return _get_packet_time_from_table(get_airtime_parameters(config, mcs, nss), packet_type, bandwidth,
+                                       number_of_destinations, number_of_mpdu)
+
+
+def get_sent_data(config, bandwidth, number_of_destinations, mcs=None, nss=None, number_of_mpdu=None):
+    """Function for getting the amount of sent data from the airtime table of the given configuration."""
+
+    return _get_sent_data_from_table(get_airtime_parameters(config, mcs, nss), bandwidth, number_of_destinations,
+                                     number_of_mpdu)
+
+
+def get_max_number_of_mpdu(config, bandwidth, number_of_destinations, mcs=None, nss=None):
+    """Function for getting the number of MPDUs which fit in the A-MPDU from the airtime table."""
+
+    return _get_max_number_of_mpdu_from_table(get_airtime_parameters(config, mcs, nss), bandwidth,
+                                              number_of_destinations)
+
+
+def clear_airtime_tables():
+    """Function for removing all entries from the airtime tables."""
+
+    _get_packet_time_from_table.cache_clear()
+    _get_sent_data_from_table.cache_clear()
+    _get_max_number_of_mpdu_from_table.cache_clear()
+
+
+def calculate_packet_time(config, packet_type, bandwidth=None, number_of_destinations=None, number_of_mpdu=None):
+    if packet_type == PacketType.BSRP_TRIGGER:
         time = get_bsrp_time()
-    elif packet_type == 'BSR':
+    elif packet_type == PacketType.BSR:
         time = get_bsr_time()
-    elif packet_type == 'MU_RTS':
+    elif packet_type == PacketType.MU_RTS:
         time = get_mu_rts_time(number_of_destinations)
-    elif packet_type == 'CTS':
+    elif packet_type == PacketType.CTS:
         time = get_cts_time()
-    elif packet_type == 'DL_A_MPDU':
-        time = get_dl_data_frame_time(bandwidth, number_of_destinations)
-    elif packet_type == 'UL_A_MPDU':
-        time = get_ul_data_frame_time(bandwidth, number_of_destinations)
-    elif packet_type == 'BASIC_TRIGGER':
+    elif packet_type == PacketType.DL_A_MPDU:
+        time = get_dl_data_frame_time(config, bandwidth, number_of_destinations, number_of_mpdu)
+    elif packet_type == PacketType.UL_A_MPDU:
+        time = get_ul_data_frame_time(config, bandwidth, number_of_destinations, number_of_mpdu)
+    elif packet_type == PacketType.BASIC_TRIGGER:
         time = get_trigger_time(number_of_destinations)
-    elif packet_type == 'TB_BACK':
-        time = get_tb_back_time(bandwidth)
-    elif packet_type == 'MS_BACK':
+    elif packet_type == PacketType.TB_BACK:
+        time = get_tb_back_time(config, bandwidth)
+    elif packet_type == PacketType.MS_BACK:
         time = get_ms_back_time(number_of_destinations)
     else:
         time = None
@@ -103,11 +149,11 @@ def get_back_time():
     return back_time
 
 
-def get_tb_back_time(bandwidth):
-    if simulation_config.DATA_RATE_PREDEFINED:
-        r = (predefined_data_rate * ofdm)
+def get_tb_back_time(config, bandwidth):
+    if config.data_rate_predefined:
+        r = (config.data_rate * ofdm)
     else:
-        r = _get_data_rate(bandwidth)
+        r = _get_data_rate(config, bandwidth)
     tb_back_time = tphy_he_tb + ((l_sf + l_back + l_tb) / r) * ofdm
     return tb_back_time
 
@@ -118,13 +164,15 @@ def get_ms_back_time(number_of_destinations):
     return ms_back_time
 
 
-def get_dl_data_frame_time(bandwidth, number_of_destinations):
-    if simulation_config.DATA_RATE_PREDEFINED:
-        r = (predefined_data_rate * ofdm)
+def get_dl_data_frame_time(config, bandwidth, number_of_destinations, number_of_mpdu=None):
+    if config.data_rate_predefined:
+        r = (config.data_rate * ofdm)
     else:
-        r = _get_data_rate(bandwidth)
-    number_of_mpdu = _get_number_of_sent_mpdu(r, bandwidth, number_of_destinations)
-    if simulation_config.MPDU_AGGREGATION_ENABLED:
+        r = _get_data_rate(config, bandwidth)
+    # The A-MPDU is filled up to the TXOP limit if the number of queued MPDUs is not given
+    if number_of_mpdu is None:
+        number_of_mpdu = _get_number_of_sent_mpdu(config, r, bandwidth, number_of_destinations)
+    if config.mpdu_aggregation:
         dl_data_frame_time = tphy_he_mu + ((l_sf + number_of_mpdu * (
                 l_md + l_mh + l_d) + l_tb) / r) * ofdm
     else:
@@ -132,13 +180,15 @@ def get_dl_data_frame_time(bandwidth, number_of_destinations):
     return dl_data_frame_time
 
 
-def get_ul_data_frame_time(bandwidth, number_of_destinations):
-    if simulation_config.DATA_RATE_PREDEFINED:
-        r = (predefined_data_rate * ofdm)
+def get_ul_data_frame_time(config, bandwidth, number_of_destinations, number_of_mpdu=None):
+    if config.data_rate_predefined:
+        r = (config.data_rate * ofdm)
     else:
-        r = _get_data_rate(bandwidth)
-    number_of_mpdu = _get_number_of_sent_mpdu(r, bandwidth, number_of_destinations)
-    if simulation_config.MPDU_AGGREGATION_ENABLED:
+        r = _get_data_rate(config, bandwidth)
+    # The A-MPDU is filled up to the TXOP limit if the number of queued MPDUs is not given
+    if number_of_mpdu is None:
+        number_of_mpdu = _get_number_of_sent_mpdu(config, r, bandwidth, number_of_destinations)
+    if config.mpdu_aggregation:
         ul_data_frame_time = tphy_he_tb + ((l_sf + number_of_mpdu * (
                 l_md + l_mh + l_d) + l_tb) / r) * ofdm
     else:
@@ -153,20 +203,41 @@ def get_random_backoff_time(retransmission_counter):
     return random_backoff_time * slot_time
 
 
-def get_sent_data(bandwidth, number_of_destinations):
-    if simulation_config.MPDU_AGGREGATION_ENABLED:
-        data_rate = _get_data_rate(bandwidth)
-        number_of_mpdu = _get_number_of_sent_mpdu(data_rate, bandwidth, number_of_destinations)
+def calculate_sent_data(config, bandwidth, number_of_destinations, number_of_mpdu=None):
+    if config.mpdu_aggregation:
+        if number_of_mpdu is None:
+            number_of_mpdu = calculate_max_number_of_mpdu(config, bandwidth, number_of_destinations)
         sent_data = (number_of_mpdu * l_d)
     else:
         sent_data = l_d
     return sent_data
 
 
-def _get_data_rate(bandwidth):
-    vs = spatial_streams_number
+def calculate_max_number_of_mpdu(config, bandwidth, number_of_destinations):
+    if config.mpdu_aggregation:
+        data_rate = _get_data_rate(config, bandwidth)
+        number_of_mpdu = _get_number_of_sent_mpdu(config, data_rate, bandwidth, number_of_destinations)
+    else:
+        number_of_mpdu = 1
+    return number_of_mpdu
+
+
+def get_data_rate(config, bandwidth, mcs=None, nss=None):
+    if config.data_rate_predefined:
+        r = (config.data_rate * ofdm)
+    else:
+        r = _get_data_rate(get_airtime_parameters(config, mcs, nss), bandwidth)
+    return r
+
+
+def _get_data_rate(config, bandwidth):
+    return data_rate_table[config.mcs, config.nss, bandwidth]
+
+
+def _calculate_data_rate(mcs, nss, bandwidth):
+    vs = nss
     ysc = _get_number_of_subcarriers(bandwidth)
-    yc = _get_coding_rate()
+    yc = _get_coding_rate(mcs)
     modulation = mcs_dict[mcs][0]
     ym = _get_modulation_rate(modulation)
     data_rate = (vs * ym * yc * ysc)
@@ -174,24 +245,11 @@ def _get_data_rate(bandwidth):
 
 
 def _get_modulation_rate(modulation):
-    if modulation == 'BPSK':
-        modulation_rate = 1
-    elif modulation == 'QPSK':
-        modulation_rate = 2
-    elif modulation == '16-QAM':
-        modulation_rate = 4
-    elif modulation == '64-QAM':
-        modulation_rate = 6
-    elif modulation == '256-QAM':
-        modulation_rate = 8
-    elif modulation == '1024-QAM':
-        modulation_rate = 10
-    else:
-        modulation_rate = None
+    modulation_rate = modulation_rate_dict.get(modulation)
     return modulation_rate
 
 
-def _get_coding_rate():
+def _get_coding_rate(mcs):
     coding_rate = mcs_dict[mcs][1]
     return coding_rate
 
@@ -216,22 +274,48 @@ def _get_ms_back_length(number_of_destinations):
     return ms_back_length
 
 
-def _get_number_of_sent_mpdu(data_rate, bandwidth, number_of_destinations=None):
+@functools.lru_cache(maxsize=AIRTIME_TABLE_SIZE)
+def _get_packet_time_from_table(parameters, packet_type, bandwidth, number_of_destinations, number_of_mpdu):
+    """Function for filling the airtime table, the simulation settings are a part of the key."""
+
+    return calculate_packet_time(parameters, packet_type, bandwidth, number_of_destinations, number_of_mpdu)
+
+
+@functools.lru_cache(maxsize=AIRTIME_TABLE_SIZE)
+def _get_sent_data_from_table(parameters, bandwidth, number_of_destinations, number_of_mpdu):
+    """Function for filling the sent data table, the simulation settings are a part of the key."""
+
+    return calculate_sent_data(parameters, bandwidth, number_of_destinations, number_of_mpdu)
+
+
+@functools.lru_cache(maxsize=AIRTIME_TABLE_SIZE)
+def _get_max_number_of_mpdu_from_table(parameters, bandwidth, number_of_destinations):
+    """Function for filling the A-MPDU size table, the simulation settings are a part of the key."""
+
+    return calculate_max_number_of_mpdu(parameters, bandwidth, number_of_destinations)
+
+
+def _get_number_of_sent_mpdu(config, data_rate, bandwidth, number_of_destinations=None):
     txop_remained_time = txop_time
-    if simulation_config.RTS_PROCEDURE_ENABLED:
+    if config.rts_procedure:
         mu_rts_time = get_mu_rts_time(number_of_destinations)
         cts_time = get_cts_time()
         txop_remained_time -= (mu_rts_time + cts_time + (2 * sifs_time))
-    if direction == 'DL':
-        tb_back_time = get_tb_back_time(bandwidth)
+    if config.direction == 'DL':
+        tb_back_time = get_tb_back_time(config, bandwidth)
         txop_remained_time -= (tb_back_time + sifs_time + aifs_time + tphy_he_mu)
         mpdu_time = ((l_sf + l_md + l_mh + l_d + l_tb) / data_rate) * ofdm
         number_of_mpdu = math.floor(txop_remained_time / mpdu_time)
-    if direction == 'UL':
+    if config.direction == 'UL':
         trigger_time = get_trigger_time(number_of_destinations)
         ms_back_time = get_ms_back_time(number_of_destinations)
         txop_remained_time -= (trigger_time + ms_back_time + (2 * sifs_time) + aifs_time + tphy_he_tb)
         mpdu_time = ((l_sf + l_md + l_mh + l_d + l_tb) / data_rate) * ofdm
         number_of_mpdu = math.floor(txop_remained_time / mpdu_time)
-    return number_of_mpdu
+    # At least one MPDU is sent in the RU too small to carry it within the TXOP, as without the frame aggregation
+    return max(number_of_mpdu, 1)
+
 
+# Data rate of each MCS, number of spatial streams and RU, so the rate of each Station is only looked up
+data_rate_table = {(mcs, nss, bandwidth): _calculate_data_rate(mcs, nss, bandwidth) for mcs in mcs_dict
+                   for nss in range(1, max_spatial_streams_number + 1) for bandwidth in subcarriers_dict}
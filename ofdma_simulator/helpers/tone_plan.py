@@ -0,0 +1,94 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing helper functions used to allocate the Resource Units according to the IEEE 802.11ax
+              tone plan. Each RU of the tone plan can be split into smaller RUs, so all layouts of the channel are
+              calculated once as the numbers of RUs of each size. The RUs allocated to the given number of stations
+              are selected from these layouts so that the smallest RU is as large as possible and the padding of the
+              PPDU is minimized. The padding is calculated with the MCS and NSS of the slowest selected station,
+              because the RUs are assigned to the stations later by the scheduler. The allocation is cached, so it is
+              calculated only once for each configuration and MCS and NSS of the slowest station.
+"""
+
+import functools
+
+import configs.channel_config as channel_config
+from helpers import times
+from packet import PacketType
+
+RU_SIZES = sorted(channel_config.RU_BANDWIDTH_DICT)  # [tones]
+ALLOCATION_TABLE_SIZE = 4096
+
+# Smaller RUs into which each RU can be split, the 242-tone and 996-tone RUs contain an additional central 26-tone RU
+RU_SPLITS = {
+    52: [26, 26],
+    106: [52, 52],
+    242: [106, 106, 26],
+    484: [242, 242],
+    996: [484, 484, 26],
+    1992: [996, 996]
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_layouts(ru_size):
+    """Function for getting all layouts of the RU as the numbers of RUs of each size."""
+
+    layouts = {tuple(1 if size == ru_size else 0 for size in RU_SIZES)}
+    if ru_size in RU_SPLITS:
+        split_layouts = {tuple(0 for _ in RU_SIZES)}
+        for smaller_ru_size in RU_SPLITS[ru_size]:
+            split_layouts = {tuple(i + j for i, j in zip(layout, smaller_layout)) for layout in split_layouts
+                             for smaller_layout in get_layouts(smaller_ru_size)}
+        layouts |= split_layouts
+    return frozenset(layouts)
+
+
+def get_candidate_partitions(layout, number_of_destinations):
+    """Function for getting the RU sizes which can be allocated to given number of stations from the layout."""
+
+    ru_sizes = [size for size, count in zip(RU_SIZES, layout) for _ in range(0, count)]
+    if len(ru_sizes) < number_of_destinations:
+        return []
+    # The largest RUs give the most data, the smallest RUs not smaller than a given size give the least padding
+    partitions = [tuple(ru_sizes[-number_of_destinations:])]
+    for i in range(0, len(ru_sizes) - number_of_destinations + 1):
+        partitions.append(tuple(ru_sizes[i:i + number_of_destinations]))
+    return partitions
+
+
+def get_allocation_cost(packet_times, partition):
+    """Function for getting the cost of the allocation compared first by the smallest RU, then by the padding."""
+
+    # The smallest RU sets the duration of the padded PPDU, the other RUs are filled with padding to this duration
+    ppdu_time = max(packet_times[size] for size in partition)
+    padding = sum(ppdu_time - packet_times[size] for size in partition)
+    return -min(partition), padding, -sum(partition)
+
+
+def get_resources_units(config, bandwidth, number_of_destinations, mcs=None, nss=None):
+    """Function for getting the bandwidths of the RUs allocated to given number of stations from the cache."""
+
+    # The MCS and NSS of the slowest station replace the ones of the configuration
+    return _get_resources_units_from_table(times.get_airtime_parameters(config, mcs, nss), bandwidth,
+                                           number_of_destinations)
+
+
+@functools.lru_cache(maxsize=ALLOCATION_TABLE_SIZE)
+def _get_resources_units_from_table(parameters, bandwidth, number_of_destinations):
+    """Function for selecting the RUs with the largest smallest RU, the smallest padding and the most tones."""
+
+    if number_of_destinations == 0:
+        return ()
+    partitions = set()
+    for layout in get_layouts(channel_config.CHANNEL_RU_DICT[bandwidth]):
+        partitions.update(get_candidate_partitions(layout, number_of_destinations))
+    if not partitions:
+        raise ValueError(f'{number_of_destinations} stations cannot be served in a {bandwidth} MHz channel')
+    # The duration of the data packet depends only on the RU size, so it is calculated once for each size
+    packet_type = PacketType.DL_A_MPDU if parameters.direction == 'DL' else PacketType.UL_A_MPDU
+    packet_times = {size: times.get_packet_time(parameters, packet_type, ru_bandwidth, number_of_destinations)
+                    for size, ru_bandwidth in channel_config.RU_BANDWIDTH_DICT.items()}
+    best_partition = min(partitions, key=lambda partition: get_allocation_cost(packet_times, partition))
+    return tuple(channel_config.RU_BANDWIDTH_DICT[size] for size in sorted(best_partition, reverse=True))
@@ -0,0 +1,92 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing helper functions used to write and read the binary event trace. Each event is saved as
+              a fixed-width record. The records are buffered in a NumPy array during the simulation and written to the
+              file in large blocks. The reader maps the file into memory, so the trace can be processed with NumPy
+              without loading the records as Python objects.
+"""
+
+import os
+import numpy as np
+
+from packet import PacketType
+
+TRACE_MAGIC = b'OFDMATRC'
+TRACE_VERSION = 1
+TRACE_HEADER_SIZE = len(TRACE_MAGIC) + 4  # [B]
+TRACE_BUFFER_SIZE = 65536  # number of records written to the file at once
+
+# Structure of a single record, the index is set to -1 if the event does not concern a single node
+TRACE_RECORD = np.dtype([
+    ('time', '<f8'),
+    ('event_type', 'u1'),
+    ('packet_type', 'u1'),
+    ('ap_index', '<i2'),
+    ('station_index', '<i4'),
+    ('airtime', '<f8')
+])
+
+# Codes of the traced events
+EVENT_TYPES = {
+    'PACKET_TRANSMITTED': 1,
+    'BACKOFF_COMPLETE': 2,
+    'COLLISION': 3,
+    'PACKET_DROPPED': 4,
+    'TRANSMISSION_COMPLETE': 5
+}
+
+# Codes of the packet types, 0 is used for events not related to any packet
+PACKET_TYPES = {packet_type.name: packet_type.value for packet_type in PacketType}
+
+
+class TraceWriter:
+    """Class containing functions used to write the binary event trace."""
+
+    def __init__(self, trace_file, buffer_size=TRACE_BUFFER_SIZE):
+        """TraceWriter class constructor."""
+
+        self.file = open(trace_file, 'wb')
+        self.file.write(TRACE_MAGIC + TRACE_VERSION.to_bytes(4, 'little'))
+        self.buffer = np.zeros(buffer_size, dtype=TRACE_RECORD)
+        self.buffered_records = 0
+        self.written_records = 0
+
+    def record(self, time, event_type, ap_index=-1, station_index=-1, packet_type=None, airtime=0.0):
+        """Function for adding the event to the trace."""
+
+        packet_type_code = packet_type if packet_type is not None else 0
+        self.buffer[self.buffered_records] = (time, EVENT_TYPES[event_type], packet_type_code, ap_index,
+                                              station_index, airtime)
+        self.buffered_records += 1
+        if self.buffered_records == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """Function for writing the buffered records to the file."""
+
+        self.file.write(self.buffer[:self.buffered_records].tobytes())
+        self.written_records += self.buffered_records
+        self.buffered_records = 0
+
+    def close(self):
+        """Function for writing the remaining records and closing the file."""
+
+        self.flush()
+        self.file.close()
+
+
+def read_trace(trace_file):
+    """Function for mapping the trace file into memory as an array of records."""
+
+    with open(trace_file, 'rb') as file:
+        header = file.read(TRACE_HEADER_SIZE)
+    if header[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError(f'{trace_file} is not an event trace file')
+    version = int.from_bytes(header[len(TRACE_MAGIC):], 'little')
+    if version != TRACE_VERSION:
+        raise ValueError(f'Unsupported event trace version: {version}')
+    if os.path.getsize(trace_file) == TRACE_HEADER_SIZE:
+        return np.zeros(0, dtype=TRACE_RECORD)
+    return np.memmap(trace_file, dtype=TRACE_RECORD, mode='r', offset=TRACE_HEADER_SIZE)
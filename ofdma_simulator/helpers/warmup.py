@@ -0,0 +1,162 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the WarmupDetector class. The WarmupDetector class collects the throughput and the
+              latency of each transmission, averaged in batches of 5 transmissions, and finds the end of the warm-up
+              period with the MSER-5 rule (Marginal Standard Error Rule). The counters accumulated during the warm-up
+              period are removed from the statistics at the end of the simulation, and the simulation can be stopped
+              early once the confidence intervals of the steady-state throughput and latency are narrow enough.
+"""
+
+import logging
+import numpy as np
+from simpy.core import StopSimulation
+
+from helpers.confidence import calculate_confidence_interval
+
+logger = logging.getLogger('ofdma_simulator')
+
+MSER_BATCH_SIZE = 5  # number of transmissions averaged in each batch
+MIN_NUMBER_OF_BATCHES = 20  # number of batches after which the warm-up period is searched for the first time
+CHECK_GROWTH = 1.1  # the warm-up period is searched again when the number of batches grows by 10%
+MAX_NUMBER_OF_SNAPSHOTS = 64  # snapshots of the counters kept as the possible ends of the warm-up period
+NUMBER_OF_STEADY_STATE_BATCHES = 10  # batches in which the steady-state series is split to check the precision
+STEADY_STATE_CONFIDENCE_LEVEL = 0.95
+
+
+def get_mser_truncation(batch_means):
+    """Function for getting the number of batches in the warm-up period, None if the steady state is not reached."""
+
+    batch_means = np.asarray(batch_means, dtype=float)
+    number_of_batches = len(batch_means)
+    # Sums of the batch means and their squares from each batch to the end of the series
+    suffix_sum = np.cumsum(batch_means[::-1])[::-1]
+    suffix_square_sum = np.cumsum(np.square(batch_means[::-1]))[::-1]
+    remaining_batches = np.arange(number_of_batches, 0, -1)
+    mser = (suffix_square_sum - np.square(suffix_sum) / remaining_batches) / np.square(remaining_batches)
+    # Only the first half of the series can be truncated, the minimum at the limit means the run is too short
+    truncation = int(np.argmin(mser[:number_of_batches // 2 + 1]))
+    if truncation == number_of_batches // 2:
+        return None
+    return truncation
+
+
+class WarmupDetector:
+    """Class containing functions used to detect the end of the warm-up period and remove it from the statistics."""
+
+    def __init__(self, env, stats, precision=None):
+        """WarmupDetector class constructor."""
+
+        self.env = env
+        self.stats = stats
+        self.precision = precision
+        self.last_time = stats.transmission_time
+        self.start_time = stats.transmission_time
+        self.last_data_transferred = {}
+        self.last_service = {}
+        # Sums of the current batch
+        self.batch_data_transferred = 0
+        self.batch_time = 0
+        self.batch_latency = 0
+        self.batch_latency_samples = 0
+        self.batch_transmissions = 0
+        self.throughput_batches = []
+        self.latency_batches = []
+        # The snapshots are taken every stride batches, the stride is doubled when there are too many snapshots
+        self.snapshots = {0: stats.get_snapshot()}
+        self.snapshot_stride = 1
+        self.next_check = MIN_NUMBER_OF_BATCHES
+        self.stopped = False
+
+    def add_transmission(self, stations):
+        """Function for adding the throughput and the latency of the transmission completed with given Stations."""
+
+        stats = self.stats
+        now = stats.transmission_time
+        data_transferred = 0
+        for station in stations:
+            station_data_transferred = stats.data_transferred_per_station[station.name]
+            data_transferred += station_data_transferred - self.last_data_transferred.get(station.name, 0)
+            self.last_data_transferred[station.name] = station_data_transferred
+            # The latency of the Station is the time elapsed since it was served before
+            self.batch_latency += now - self.last_service.get(station.name, self.start_time)
+            self.last_service[station.name] = now
+        self.batch_latency_samples += len(stations)
+        self.batch_data_transferred += data_transferred
+        self.batch_time += now - self.last_time
+        self.last_time = now
+        self.batch_transmissions += 1
+        if self.batch_transmissions == MSER_BATCH_SIZE:
+            self.add_batch()
+
+    def add_batch(self):
+        """Function for closing the current batch and searching for the end of the warm-up period if it is time."""
+
+        throughput = self.batch_data_transferred / self.batch_time if self.batch_time > 0 else 0
+        self.throughput_batches.append(throughput)
+        # The batch without any delivered transmission repeats the latency of the previous batch
+        if self.batch_latency_samples > 0:
+            self.latency_batches.append(self.batch_latency / self.batch_latency_samples)
+        else:
+            self.latency_batches.append(self.latency_batches[-1] if self.latency_batches else 0)
+        self.batch_data_transferred = 0
+        self.batch_time = 0
+        self.batch_latency = 0
+        self.batch_latency_samples = 0
+        self.batch_transmissions = 0
+        number_of_batches = len(self.throughput_batches)
+        if number_of_batches % self.snapshot_stride == 0:
+            self.snapshots[number_of_batches] = self.stats.get_snapshot()
+            if len(self.snapshots) > MAX_NUMBER_OF_SNAPSHOTS:
+                self.snapshot_stride *= 2
+                self.snapshots = {batch: snapshot for batch, snapshot in self.snapshots.items()
+                                  if batch % self.snapshot_stride == 0}
+        if self.precision is not None and number_of_batches >= self.next_check:
+            self.next_check = max(number_of_batches + 1, int(number_of_batches * CHECK_GROWTH))
+            self.check_steady_state()
+
+    def get_truncation(self):
+        """Function for getting the number of batches in the warm-up period of both series."""
+
+        if len(self.throughput_batches) < MIN_NUMBER_OF_BATCHES:
+            return None
+        throughput_truncation = get_mser_truncation(self.throughput_batches)
+        latency_truncation = get_mser_truncation(self.latency_batches)
+        if throughput_truncation is None or latency_truncation is None:
+            return None
+        return max(throughput_truncation, latency_truncation)
+
+    def check_steady_state(self):
+        """Function for stopping the simulation if the steady-state statistics are precise enough."""
+
+        truncation = self.get_truncation()
+        if truncation is None or self.stopped:
+            return
+        for batches in [self.throughput_batches, self.latency_batches]:
+            steady_state_batches = batches[truncation:]
+            if len(steady_state_batches) < NUMBER_OF_STEADY_STATE_BATCHES:
+                return
+            # The batches of 5 transmissions are correlated, so they are merged into a few larger batches
+            samples = [float(np.mean(samples)) for samples in
+                       np.array_split(steady_state_batches, NUMBER_OF_STEADY_STATE_BATCHES)]
+            samples_mean, half_width = calculate_confidence_interval(samples, STEADY_STATE_CONFIDENCE_LEVEL)
+            if samples_mean == 0 or half_width / abs(samples_mean) > self.precision:
+                return
+        logger.info('[%s] - Steady state reached, the simulation is stopped.', self.env.now)
+        self.stopped = True
+        stop_event = self.env.event()
+        stop_event.callbacks.append(StopSimulation.callback)
+        stop_event.succeed()
+
+    def truncate_statistics(self):
+        """Function for removing the warm-up period found in the whole series from the statistics."""
+
+        truncation = self.get_truncation()
+        if truncation is None:
+            logger.warning('[%s] - Steady state not reached, the warm-up period is not removed.', self.env.now)
+            return
+        # The counters are taken from the first snapshot after the end of the warm-up period
+        snapshot_batch = min(batch for batch in self.snapshots if batch >= truncation)
+        self.stats.truncate(self.snapshots[snapshot_batch])
+        self.snapshots = {}
@@ -0,0 +1,114 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the link adaptation policies used by the Access Point. Each Station starts with the MCS
+              and the number of spatial streams given in the configuration, the initial MCS is the highest MCS its
+              link supports. The link adaptation policy moves the MCS of the served Stations down after failed
+              deliveries and back up after successful ones.
+"""
+
+from abc import ABC, abstractmethod
+
+import configs.channel_config as channel_config
+
+MIN_MCS = min(channel_config.MCS_DICT)
+# Numbers of consecutive successful and failed deliveries after which the Auto Rate Fallback changes the MCS
+ARF_SUCCESS_THRESHOLD = 10
+ARF_FAILURE_THRESHOLD = 2
+
+
+def get_station_mcs(config, index):
+    """Function for getting the initial MCS of the Station, the list of MCS values is assigned to Stations in turn."""
+
+    if config.station_mcs is None or index is None:
+        return config.mcs
+    return config.station_mcs[index % len(config.station_mcs)]
+
+
+def get_station_nss(config, index):
+    """Function for getting the number of spatial streams of the Station, the list is assigned to Stations in turn."""
+
+    if config.station_nss is None or index is None:
+        return config.nss
+    return config.station_nss[index % len(config.station_nss)]
+
+
+class LinkAdaptation(ABC):
+    """Class containing common functions of all link adaptation policies."""
+
+    def __init__(self, access_point):
+        """LinkAdaptation class constructor."""
+
+        self.access_point = access_point
+        self.config = access_point.config
+
+    @abstractmethod
+    def update_mcs(self, stations, delivered):
+        raise NotImplementedError("update_mcs must be override")
+
+    def get_state(self):
+        """Function for getting the state of the policy saved in the checkpoint."""
+
+        return {}
+
+    def set_state(self, state):
+        """Function for restoring the state of the policy from the checkpoint."""
+
+        pass
+
+
+class ArfLinkAdaptation(LinkAdaptation):
+    """Class containing functions of the Auto Rate Fallback policy."""
+
+    def __init__(self, access_point):
+        """ArfLinkAdaptation class constructor."""
+
+        super().__init__(access_point)
+        self.successes = {}
+        self.failures = {}
+
+    def update_mcs(self, stations, delivered):
+        """Function for counting the consecutive deliveries of each Station and changing its MCS by one step."""
+
+        for station in stations:
+            if delivered:
+                self.failures.pop(station.index, None)
+                successes = self.successes.get(station.index, 0) + 1
+                if successes >= ARF_SUCCESS_THRESHOLD:
+                    successes = 0
+                    if station.mcs < get_station_mcs(self.config, station.index):
+                        station.mcs += 1
+                self.successes[station.index] = successes
+            else:
+                self.successes.pop(station.index, None)
+                failures = self.failures.get(station.index, 0) + 1
+                if failures >= ARF_FAILURE_THRESHOLD:
+                    failures = 0
+                    if station.mcs > MIN_MCS:
+                        station.mcs -= 1
+                self.failures[station.index] = failures
+
+    def get_state(self):
+        """Function for getting the numbers of consecutive deliveries of each Station."""
+
+        return {'successes': dict(self.successes), 'failures': dict(self.failures)}
+
+    def set_state(self, state):
+        """Function for restoring the numbers of consecutive deliveries of each Station."""
+
+        self.successes = dict(state['successes'])
+        self.failures = dict(state['failures'])
+
+
+LINK_ADAPTATION_POLICIES = {
+    'ARF': ArfLinkAdaptation
+}
+
+
+def get_link_adaptation(access_point):
+    """Function for creating the link adaptation policy selected in the configuration of the Access Point."""
+
+    if access_point.config.link_adaptation is None:
+        return None
+    return LINK_ADAPTATION_POLICIES[access_point.config.link_adaptation](access_point)
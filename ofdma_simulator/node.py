@@ -12,19 +12,25 @@ import logging
 from abc import ABC, abstractmethod
 
 from helpers import times
-from packet import Packet
 
 logger = logging.getLogger('ofdma_simulator')
 
+# Numbers of events which are not created when the deterministic steps are skipped in the fast-forward mode
+SKIPPED_RECEPTION_EVENTS = 2
+SKIPPED_RESPONSE_EVENTS = 4
+
 
 class Node(ABC):
     """Class containing common functions and settings for the Station and Access Point."""
 
-    def __init__(self, env, channel):
+    def __init__(self, env, channel, index=None, trace=None, traffic=None):
         """Node class constructor."""
 
         self.env = env
         self.channel = channel
+        self.index = index
+        self.trace = trace
+        self.traffic = traffic
         self.nodes_in_channel = channel.nodes_in_channel
         self.channel_store = None
         self.waiting_process = env.process(self.wait_for_new_packet())
@@ -33,21 +39,23 @@ class Node(ABC):
         self.backoff_suspended = None
         self.name = None
         self.is_ap = False
+        self.channel_mask = 0
         self.received_packets = []
 
     def generate_new_packet(self, packet_type, packet_time, source_node, destination_nodes):
         """Function for generating new packet."""
 
-        # Generate new packet
-        packet = Packet(packet_type, packet_time, source_node, destination_nodes)
-        # Get the name of source node
-        source_node_name = packet.source_node.name
-        # Get the names of all target nodes
-        destination_nodes_name = []
-        for node in destination_nodes:
-            destination_nodes_name.append(node.name)
-        logger.info(f'[{self.env.now}] - New {packet.packet_type} packet from {source_node_name} to '
-                    f'{destination_nodes_name}')
+        # Take the packet from the pool of packets which are no longer in use
+        packet = self.channel.packet_pool.acquire(packet_type, packet_time, source_node, destination_nodes)
+        if logger.isEnabledFor(logging.INFO):
+            # Get the name of source node
+            source_node_name = packet.source_node.name
+            # Get the names of all target nodes
+            destination_nodes_name = []
+            for node in destination_nodes:
+                destination_nodes_name.append(node.name)
+            logger.info('[%s] - New %s packet from %s to %s', self.env.now, packet.packet_type.name,
+                        source_node_name, destination_nodes_name)
         return packet
 
     def send_packet(self, packet):
@@ -57,13 +65,35 @@ class Node(ABC):
         self.waiting_process.interrupt(packet)
 
     def transmit_in_channel(self, packet):
-        """Function for forwarding the packet to all nodes participating in the transmission."""
+        """Function for forwarding the packet to the nodes participating in the transmission."""
 
         yield self.env.timeout(1)
+        self.put_in_channel(packet)
+
+    def put_in_channel(self, packet):
+        """Function for putting the packet in the stores of the nodes receiving it."""
+
         self.channel.channel_available = False
-        for node in self.nodes_in_channel:
+        if self.trace is not None:
+            self.trace_transmitted_packet(packet)
+        receivers = self.channel.get_receivers(packet)
+        packet.pending_receivers = len(receivers)
+        for node in receivers:
             node.channel_store.put(packet)
 
+    def trace_transmitted_packet(self, packet):
+        """Function for adding the transmitted packet to the event trace."""
+
+        source_node = packet.source_node
+        if source_node.is_ap:
+            ap_index = source_node.index
+            station_index = packet.destination_nodes[0].index if len(packet.destination_nodes) == 1 else -1
+        else:
+            ap_index = packet.destination_nodes[0].index
+            station_index = source_node.index
+        self.trace.record(self.env.now, 'PACKET_TRANSMITTED', ap_index, station_index, packet.packet_type,
+                          packet.packet_time)
+
     def check_if_collision_occurred(self):
         """Function for checking if collision occurred."""
 
@@ -74,7 +104,7 @@ class Node(ABC):
     def start_listening(self):
         """Function for creating simpy.Store object so that it is possible to start listening."""
 
-        self.nodes_in_channel.append(self)
+        self.channel.add_node(self)
         self.channel_store = simpy.Store(self.env, capacity=simpy.core.Infinity)
 
     def wait_for_new_packet(self):
@@ -82,22 +112,54 @@ class Node(ABC):
 
         self.start_listening()
         while True:
+            packet_request = None
             try:
-                packet = yield self.channel_store.get()
+                packet_request = self.channel_store.get()
+                packet = yield packet_request
+                packet_request = None
                 if self.is_ap:
                     if not self == packet.source_node:
                         if self.backoff_process and not self.backoff_suspended:
                             self.backoff_process.interrupt()
-                yield self.env.process(self.handle_received_packet(packet))
+                    # The packet addressed to other nodes only suspends the backoff, so it is not handled
+                    if self.config.fast_forward and not packet.is_destination(self):
+                        self.release_received_packet(packet)
+                        self.stats.number_of_skipped_events += SKIPPED_RECEPTION_EVENTS
+                        continue
+                yield self.env.process(self.receive_packet(packet))
             except simpy.Interrupt as packet:
+                # The interrupted request still takes the next packet from the store, but this node does not handle it
+                if packet_request is not None and packet_request.callbacks is not None:
+                    packet_request.callbacks.append(self.release_requested_packet)
                 collision = self.check_if_collision_occurred()
                 if collision:
                     self.sensing_process.interrupt(packet.cause)
+                    # The packets waiting in the store will not be handled by this node
+                    for received_packet in self.channel_store.items:
+                        self.release_received_packet(received_packet)
                     self.channel_store = None
                     self.channel_store = simpy.Store(self.env, capacity=simpy.core.Infinity)
                     continue
                 yield self.env.process(self.transmit_in_channel(packet.cause))
 
+    def receive_packet(self, packet):
+        """Function for handling the received packet and returning it to the pool once all nodes handled it."""
+
+        yield from self.handle_received_packet(packet)
+        self.release_received_packet(packet)
+
+    def release_requested_packet(self, packet_request):
+        """Function for releasing the packet taken from the store by the interrupted request."""
+
+        self.release_received_packet(packet_request.value)
+
+    def release_received_packet(self, packet):
+        """Function for returning the packet to the pool if it is no longer needed by any node."""
+
+        packet.pending_receivers -= 1
+        if packet.pending_receivers == 0:
+            self.channel.packet_pool.release(packet)
+
     @abstractmethod
     def handle_received_packet(self, packet):
         raise NotImplementedError("handle_received_packet must be override")
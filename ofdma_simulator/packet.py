@@ -2,18 +2,83 @@
 :copyright: Copyright (C) 2022 Damian Piasecki
 :author: Damian Piasecki
 :email: piasecki.damian97@gmail.com
-:description: File containing the Packet class. The Packet data class defines the MAC packet structure. Objects of this
+:description: File containing the Packet class. The Packet class defines the MAC packet structure. Objects of this
               class are transferred during transmission between the Access Point object and the User Station object.
+              The destinations of the packet are kept as a bitmap of the nodes listening in the channel, so checking
+              if the node is a destination does not depend on the number of destinations. Packets which are no longer
+              in use are reused by the PacketPool class.
 """
 
-from dataclasses import dataclass
+from enum import IntEnum
+
+
+class PacketType(IntEnum):
+    """Enumeration of the MAC packet types."""
+
+    BSRP_TRIGGER = 1
+    BSR = 2
+    MU_RTS = 3
+    CTS = 4
+    DL_A_MPDU = 5
+    UL_A_MPDU = 6
+    BASIC_TRIGGER = 7
+    TB_BACK = 8
+    MS_BACK = 9
 
 
-@dataclass
 class Packet:
-    """Dataclass defining the structure of a MAC packet."""
+    """Class defining the structure of a MAC packet."""
+
+    __slots__ = ('packet_type', 'packet_time', 'source_node', 'destination_nodes', 'destinations_mask',
+                 'pending_receivers')
+
+    def __init__(self, packet_type, packet_time, source_node, destination_nodes):
+        """Packet class constructor."""
+
+        self.set_fields(packet_type, packet_time, source_node, destination_nodes)
+
+    def set_fields(self, packet_type, packet_time, source_node, destination_nodes):
+        """Function for setting all fields of the packet."""
+
+        self.packet_type = packet_type
+        self.packet_time = packet_time
+        self.source_node = source_node
+        self.destination_nodes = destination_nodes
+        destinations_mask = 0
+        for node in destination_nodes:
+            destinations_mask |= node.channel_mask
+        self.destinations_mask = destinations_mask
+        self.pending_receivers = 0
+
+    def is_destination(self, node):
+        """Function for checking if the node is one of the packet destinations."""
+
+        return self.destinations_mask & node.channel_mask != 0
+
+
+class PacketPool:
+    """Class containing functions used to reuse the packets which are no longer in use."""
+
+    def __init__(self):
+        """PacketPool class constructor."""
+
+        self.free_packets = []
+        self.allocated_packets = 0
+
+    def acquire(self, packet_type, packet_time, source_node, destination_nodes):
+        """Function for getting a packet from the pool or allocating a new one if the pool is empty."""
+
+        if self.free_packets:
+            packet = self.free_packets.pop()
+            packet.set_fields(packet_type, packet_time, source_node, destination_nodes)
+            return packet
+        self.allocated_packets += 1
+        return Packet(packet_type, packet_time, source_node, destination_nodes)
+
+    def release(self, packet):
+        """Function for returning the packet to the pool."""
 
-    packet_type: str
-    packet_time: float
-    source_node: list
-    destination_nodes: list
+        # Drop the references to the nodes, so the packet does not keep them alive
+        packet.source_node = None
+        packet.destination_nodes = None
+        self.free_packets.append(packet)
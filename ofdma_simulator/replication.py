@@ -0,0 +1,109 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing functions for running independent replications of a simulation. Replications differ
+              only in the seed of the generator and are run in worker processes until the confidence intervals of the
+              network throughput and the average latency are narrow enough.
+"""
+
+import os
+import logging
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import configs.replication_config as replication_config
+from helpers.confidence import calculate_confidence_interval
+from simulation import Config
+from sweep import run_configuration
+
+logger = logging.getLogger('ofdma_simulator')
+
+REPLICATED_METRICS = ['throughput', 'average_latency']
+
+
+def get_replication_results(statistics_list, confidence_level):
+    """Function for getting the mean and confidence interval of each replicated metric."""
+
+    results = {}
+    for metric in REPLICATED_METRICS:
+        samples = [statistics[metric] for statistics in statistics_list]
+        metric_mean, half_width = calculate_confidence_interval(samples, confidence_level)
+        results[metric] = {
+            'mean': metric_mean,
+            'half_width': half_width,
+            'lower': metric_mean - half_width,
+            'upper': metric_mean + half_width,
+            'replications': len(samples)
+        }
+    return results
+
+
+def check_if_precision_reached(results, relative_precision):
+    """Function for checking if the confidence intervals of all replicated metrics are narrow enough."""
+
+    for metric in REPLICATED_METRICS:
+        metric_mean = results[metric]['mean']
+        if metric_mean == 0 or results[metric]['half_width'] / abs(metric_mean) > relative_precision:
+            return False
+    return True
+
+
+def run_replications(config, confidence_level=replication_config.CONFIDENCE_LEVEL,
+                     relative_precision=replication_config.RELATIVE_PRECISION,
+                     min_replications=replication_config.MIN_REPLICATIONS,
+                     max_replications=replication_config.MAX_REPLICATIONS, max_workers=replication_config.MAX_WORKERS):
+    """Function for running replications of the simulation until the requested precision is reached."""
+
+    max_workers = max_workers or os.cpu_count()
+    statistics_per_replication = {}
+    results = None
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        next_replication = 0
+        while True:
+            # Keep all workers busy, but do not exceed the maximum number of replications
+            target = max(min_replications, len(statistics_per_replication) + max_workers)
+            while next_replication < min(target, max_replications) and len(running) < max_workers:
+                # Each replication is run with its own seed
+                seed_config = dataclasses.replace(config, seed=config.seed + next_replication)
+                running[executor.submit(run_configuration, seed_config)] = next_replication
+                next_replication += 1
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                statistics_per_replication[running.pop(future)] = future.result()
+            # Take only the replications finished without gaps, so the result does not depend on the order in which
+            # the workers finish
+            completed = 0
+            while completed in statistics_per_replication:
+                completed += 1
+            if completed >= min_replications:
+                statistics_list = [statistics_per_replication[i] for i in range(0, completed)]
+                results = get_replication_results(statistics_list, confidence_level)
+                if check_if_precision_reached(results, relative_precision) or completed >= max_replications:
+                    break
+        for future in running:
+            future.cancel()
+    logger.info(f'Replications finished after {results[REPLICATED_METRICS[0]]["replications"]} runs.')
+    return results
+
+
+def print_replication_results(results, confidence_level):
+    """Function for printing the mean and confidence interval of each replicated metric."""
+
+    units = {'throughput': 'Mbps', 'average_latency': 'ms'}
+    for metric in REPLICATED_METRICS:
+        result = results[metric]
+        print(f"{metric}: {result['mean']:.3f} {units[metric]} +/- {result['half_width']:.3f} "
+              f"({confidence_level:.0%} confidence interval, {result['replications']} replications)")
+
+
+def main():
+    """Main replication function."""
+
+    results = run_replications(Config())
+    print_replication_results(results, replication_config.CONFIDENCE_LEVEL)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the schedulers used by the Access Point. The scheduler selects the Stations served in
+              each transmission and allocates the Resource Units to them. The random scheduler draws both, the other
+              schedulers keep the Stations in a priority queue, so selecting k of N Stations costs O(k log N).
+"""
+
+import heapq
+import random
+from abc import ABC, abstractmethod
+
+from helpers import times
+
+# Number of transmissions over which the proportional fair scheduler averages the throughput of each Station
+PF_AVERAGING_WINDOW = 100
+# Growth of the aging factor after which the averaged throughputs are rescaled, so they never overflow
+PF_MAX_AGING_FACTOR = 1e100
+
+
+class Scheduler(ABC):
+    """Class containing common functions of all schedulers."""
+
+    def __init__(self, access_point):
+        """Scheduler class constructor."""
+
+        self.access_point = access_point
+        self.config = access_point.config
+        self.channel = access_point.channel
+        self.stats = access_point.stats
+
+    def get_station_rate(self, station):
+        """Function for getting the data rate of the Station in the whole channel."""
+
+        return times.get_data_rate(self.config, self.channel.bandwidth, station.mcs, station.nss)
+
+    @abstractmethod
+    def select_stations(self, assigned_stations, max_number_of_stations):
+        raise NotImplementedError("select_stations must be override")
+
+    def update_after_transmission(self, stations):
+        """Function for updating the scheduler after the transmission to or from given Stations is complete."""
+
+        pass
+
+    def get_state(self):
+        """Function for getting the state of the scheduler saved in the checkpoint."""
+
+        return {}
+
+    def set_state(self, state, stations):
+        """Function for restoring the state of the scheduler from the checkpoint, Stations are given by index."""
+
+        pass
+
+    def allocate_resources(self, stations, resources_units):
+        """Function for allocating the RUs to the Stations and getting the list of allocated RUs."""
+
+        # The largest RUs are allocated to the Stations selected first
+        allocated_resources_units = sorted(resources_units, reverse=True)[:len(stations)]
+        for station, allocated_bw in zip(stations, allocated_resources_units):
+            station.allocated_bw = allocated_bw
+        return allocated_resources_units
+
+
+class RandomScheduler(Scheduler):
+    """Class containing functions of the scheduler selecting random Stations and RUs."""
+
+    def select_stations(self, assigned_stations, max_number_of_stations):
+        """Function for selecting random Stations if not all of them can be served."""
+
+        if len(assigned_stations) > max_number_of_stations:
+            return random.sample(assigned_stations, max_number_of_stations)
+        return assigned_stations
+
+    def allocate_resources(self, stations, resources_units):
+        """Function for allocating a random RU to each Station and getting the list of allocated RUs."""
+
+        allocated_resources_units = []
+        for station in stations:
+            allocated_bw = random.choice(resources_units)
+            station.allocated_bw = allocated_bw
+            resources_units.remove(allocated_bw)
+            allocated_resources_units.append(allocated_bw)
+        return allocated_resources_units
+
+
+class PriorityScheduler(Scheduler):
+    """Class containing functions of the schedulers selecting the Stations with the lowest priority value."""
+
+    def __init__(self, access_point):
+        """PriorityScheduler class constructor."""
+
+        super().__init__(access_point)
+        self.priority_queue = None
+        self.served_stations = []
+        self.number_of_selections = 0
+
+    @abstractmethod
+    def get_priority(self, station):
+        raise NotImplementedError("get_priority must be override")
+
+    def select_stations(self, assigned_stations, max_number_of_stations):
+        """Function for selecting the Stations with the lowest priority value."""
+
+        self.number_of_selections += 1
+        if len(assigned_stations) <= max_number_of_stations:
+            return sorted(assigned_stations, key=self.get_priority)
+        if self.access_point.traffic is not None:
+            # Only the backlogged Stations are given, so the priority queue cannot be kept between transmissions
+            return heapq.nsmallest(max_number_of_stations, assigned_stations, key=self.get_priority)
+        if self.priority_queue is None:
+            # The position of the Station breaks the ties, so the Station objects are never compared
+            self.priority_queue = [(self.get_priority(station), i, station) for i, station in
+                                   enumerate(assigned_stations)]
+            heapq.heapify(self.priority_queue)
+        # Only the priority of the Stations served in the previous transmission could have changed
+        for i, station in self.served_stations:
+            heapq.heappush(self.priority_queue, (self.get_priority(station), i, station))
+        self.served_stations = []
+        for _ in range(0, max_number_of_stations):
+            _, i, station = heapq.heappop(self.priority_queue)
+            self.served_stations.append((i, station))
+        return [station for _, station in self.served_stations]
+
+    def get_state(self):
+        """Function for getting the priority queue and the served Stations saved in the checkpoint."""
+
+        priority_queue = None
+        if self.priority_queue is not None:
+            priority_queue = [(priority, i, station.index) for priority, i, station in self.priority_queue]
+        return {
+            'priority_queue': priority_queue,
+            'served_stations': [(i, station.index) for i, station in self.served_stations],
+            'number_of_selections': self.number_of_selections
+        }
+
+    def set_state(self, state, stations):
+        """Function for restoring the priority queue and the served Stations from the checkpoint."""
+
+        if state['priority_queue'] is not None:
+            self.priority_queue = [(priority, i, stations[index]) for priority, i, index in state['priority_queue']]
+        self.served_stations = [(i, stations[index]) for i, index in state['served_stations']]
+        self.number_of_selections = state['number_of_selections']
+
+
+class RoundRobinScheduler(PriorityScheduler):
+    """Class containing functions of the scheduler serving the Stations in turn."""
+
+    def __init__(self, access_point):
+        """RoundRobinScheduler class constructor."""
+
+        super().__init__(access_point)
+        self.number_of_services = 0
+        self.last_service = {}
+
+    def get_priority(self, station):
+        """Function for getting the number of the last service of the Station."""
+
+        return self.last_service.get(station.index, 0)
+
+    def select_stations(self, assigned_stations, max_number_of_stations):
+        """Function for selecting the Stations which have not been served for the longest time."""
+
+        stations = super().select_stations(assigned_stations, max_number_of_stations)
+        # Number the services in the order of selection, so the Stations are served in a fixed cycle
+        for station in stations:
+            self.number_of_services += 1
+            self.last_service[station.index] = self.number_of_services
+        return stations
+
+    def get_state(self):
+        """Function for getting the state of the scheduler together with the numbers of the last services."""
+
+        state = super().get_state()
+        state['number_of_services'] = self.number_of_services
+        state['last_service'] = dict(self.last_service)
+        return state
+
+    def set_state(self, state, stations):
+        """Function for restoring the state of the scheduler together with the numbers of the last services."""
+
+        super().set_state(state, stations)
+        self.number_of_services = state['number_of_services']
+        self.last_service = dict(state['last_service'])
+
+    def allocate_resources(self, stations, resources_units):
+        """Function for allocating the RUs to the Stations in turn and getting the list of allocated RUs."""
+
+        # Nothing is allocated without RUs, as by the other schedulers
+        if not resources_units:
+            return []
+        # Rotate the RUs in each transmission, so each Station gets the largest RUs in turn
+        resources_units = sorted(resources_units, reverse=True)
+        shift = self.number_of_selections % len(resources_units)
+        allocated_resources_units = (resources_units[shift:] + resources_units[:shift])[:len(stations)]
+        for station, allocated_bw in zip(stations, allocated_resources_units):
+            station.allocated_bw = allocated_bw
+        return allocated_resources_units
+
+
+class ProportionalFairScheduler(PriorityScheduler):
+    """Class containing functions of the scheduler balancing the achievable data rate and the average throughput."""
+
+    def __init__(self, access_point):
+        """ProportionalFairScheduler class constructor."""
+
+        super().__init__(access_point)
+        # Instead of aging the average throughput of all Stations after each transmission, the data delivered later
+        # is weighted by the growing aging factor, so only the priority of the served Stations changes
+        self.scaled_throughput = {}
+        self.aging_factor = 1
+        self.last_data_transferred = {}
+
+    def get_achievable_rate(self, station):
+        """Function for getting the data rate of the Station in the RU allocated to it, the whole channel if none."""
+
+        bandwidth = station.allocated_bw if station.allocated_bw is not None else self.channel.bandwidth
+        return times.get_data_rate(self.config, bandwidth, station.mcs, station.nss)
+
+    def get_priority(self, station):
+        """Function for getting the ratio of the average throughput of the Station to its achievable data rate."""
+
+        return self.scaled_throughput.get(station.index, 0) / self.get_achievable_rate(station)
+
+    def update_after_transmission(self, stations):
+        """Function for aging the average throughput of all Stations and adding the data delivered to given ones."""
+
+        self.aging_factor /= 1 - 1 / PF_AVERAGING_WINDOW
+        for station in stations:
+            data_transferred = self.stats.data_transferred_per_station[station.name]
+            delivered_data = data_transferred - self.last_data_transferred.get(station.index, 0)
+            self.last_data_transferred[station.index] = data_transferred
+            # The Station whose allocation delivered nothing is not counted as served, so its priority is kept
+            if delivered_data > 0:
+                self.scaled_throughput[station.index] = (self.scaled_throughput.get(station.index, 0)
+                                                         + delivered_data * self.aging_factor / PF_AVERAGING_WINDOW)
+        if self.aging_factor > PF_MAX_AGING_FACTOR:
+            for index in self.scaled_throughput:
+                self.scaled_throughput[index] /= self.aging_factor
+            self.aging_factor = 1
+            # All priorities have changed, so the priority queue is built again in the next selection
+            self.priority_queue = None
+            self.served_stations = []
+
+    def get_state(self):
+        """Function for getting the state of the scheduler together with the average throughput of the Stations."""
+
+        state = super().get_state()
+        state['scaled_throughput'] = dict(self.scaled_throughput)
+        state['aging_factor'] = self.aging_factor
+        state['last_data_transferred'] = dict(self.last_data_transferred)
+        return state
+
+    def set_state(self, state, stations):
+        """Function for restoring the state of the scheduler together with the average throughput of the Stations."""
+
+        super().set_state(state, stations)
+        self.scaled_throughput = dict(state['scaled_throughput'])
+        self.aging_factor = state['aging_factor']
+        self.last_data_transferred = dict(state['last_data_transferred'])
+
+
+class MaxRateScheduler(PriorityScheduler):
+    """Class containing functions of the scheduler serving the Stations with the highest data rate."""
+
+    def get_priority(self, station):
+        """Function for getting the data rate of the Station as the priority value."""
+
+        return -self.get_station_rate(station)
+
+
+SCHEDULERS = {
+    'RANDOM': RandomScheduler,
+    'ROUND_ROBIN': RoundRobinScheduler,
+    'PROPORTIONAL_FAIR': ProportionalFairScheduler,
+    'MAX_RATE': MaxRateScheduler
+}
+
+
+def get_scheduler(access_point):
+    """Function for creating the scheduler selected in the configuration of the Access Point."""
+
+    return SCHEDULERS[access_point.config.scheduler](access_point)
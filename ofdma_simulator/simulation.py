@@ -5,25 +5,40 @@
 :description: The main ofdma_simulator file containing the implementation of the Config class and the Simulator class.
               The Config data class is used to initialize the parameters with which the simulation was run.
               The Simulator class includes functions for initializing the simulator (creating Access Point objects
-              and User Station objects) and for running a simulation.
+              and User Station objects), for running a simulation and for saving and restoring its checkpoints.
 """
 
 import sys
 import simpy
 import logging
 import random
-from dataclasses import dataclass
+import dataclasses
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
 
 import configs.simulation_config as simulation_config
 from helpers.logger import prepare_logger
 from helpers.stats import Stats
+from helpers.trace import TraceWriter
+from helpers.metrics import MetricsCollector
+from helpers.checkpoint import save_checkpoint, load_checkpoint
+from helpers.warmup import WarmupDetector
+from helpers.instrumentation import Instrumentation
 from channel import Channel
+from analytic import estimate_statistics
 from access_point import AccessPoint
 from station import Station
+from station_array import StationArray
+from traffic import get_traffic_generator
 
 
 logger = logging.getLogger('ofdma_simulator')
 
+# Parameters which define the nodes and the frame exchange, so they cannot be changed in the restored simulation
+CHECKPOINT_FIXED_PARAMETERS = ['number_of_ap', 'number_of_stations', 'direction', 'rts_procedure', 'bsrp_procedure',
+                               'single_timeout_backoff', 'station_backend', 'traffic_model']
+STATION_STATE_FIELDS = ['type_of_packet_to_wait', 'allocated_bw', 'station_associated', 'associated_ap', 'mcs']
+
 
 @dataclass()
 class Config:
@@ -35,62 +50,264 @@ class Config:
     seed: int = simulation_config.SEED
     direction: str = simulation_config.DIRECTION
     mcs: int = simulation_config.MCS
+    nss: int = simulation_config.NSS
+    station_mcs: list = field(default_factory=lambda: simulation_config.STATION_MCS)
+    station_nss: list = field(default_factory=lambda: simulation_config.STATION_NSS)
+    link_adaptation: str = simulation_config.LINK_ADAPTATION
     data_rate: float = simulation_config.DATA_RATE
-    ru_list = simulation_config.RU_LIST
+    ru_list: list = field(default_factory=lambda: list(simulation_config.RU_LIST))
     rts_procedure: bool = simulation_config.RTS_PROCEDURE_ENABLED
     bsrp_procedure: bool = simulation_config.BSRP_PROCEDURE_ENABLED
     mpdu_aggregation: bool = simulation_config.MPDU_AGGREGATION_ENABLED
     ru_predefined: bool = simulation_config.RU_PREDEFINED
     data_rate_predefined: bool = simulation_config.DATA_RATE_PREDEFINED
+    single_timeout_backoff: bool = simulation_config.SINGLE_TIMEOUT_BACKOFF_ENABLED
+    fast_forward: bool = simulation_config.FAST_FORWARD_ENABLED
+    run_mode: str = simulation_config.RUN_MODE
+    ru_allocator: str = simulation_config.RU_ALLOCATOR
+    scheduler: str = simulation_config.SCHEDULER
+    station_backend: str = simulation_config.STATION_BACKEND
+    traffic_model: str = simulation_config.TRAFFIC_MODEL
+    traffic_load: float = simulation_config.TRAFFIC_LOAD
+    traffic_on_time: int = simulation_config.TRAFFIC_ON_TIME
+    traffic_off_time: int = simulation_config.TRAFFIC_OFF_TIME
+    trace_file: str = simulation_config.TRACE_FILE
+    metrics_file: str = simulation_config.METRICS_FILE
+    metrics_interval: int = simulation_config.METRICS_INTERVAL
+    checkpoint_file: str = simulation_config.CHECKPOINT_FILE
+    checkpoint_interval: int = simulation_config.CHECKPOINT_INTERVAL
+    warmup_detection: bool = simulation_config.WARMUP_DETECTION_ENABLED
+    steady_state_precision: float = simulation_config.STEADY_STATE_PRECISION
+    instrumentation_file: str = simulation_config.INSTRUMENTATION_FILE
 
 
 class Simulator:
     """Main simulator class."""
 
-    def __init__(self):
+    def __init__(self, config=None, initial_time=0):
         """Simulator class constructor."""
 
-        self.env = simpy.Environment()
-        self.config = Config()
-        self.channel = Channel()
+        self.env = simpy.Environment(initial_time)
+        self.config = config if config is not None else Config()
+        self.channel = Channel(self.env)
         self.stats = Stats()
+        self.trace = None
         self.simulator_initialized = False
         self.ap_list = []
         self.stations_list = []
+        self.station_array = None
+        self.traffic = get_traffic_generator(self.env, self.config, self.stats)
+        self.random_state = None
+        self.warmup = None
 
     def initialize_simulator(self):
         """Function for initializing simulator."""
 
+        # Open the event trace file
+        if self.config.trace_file:
+            self.trace = TraceWriter(self.config.trace_file)
         # Create list of Access Points
         for i in range(0, self.config.number_of_ap):
             ap_name = "AccessPoint" + str(i)
-            self.ap_list.append(AccessPoint(ap_name, self.env, self.config, self.channel, self.stats))
+            self.ap_list.append(AccessPoint(ap_name, self.env, self.config, self.channel, self.stats, i, self.trace,
+                                            self.traffic))
         # Create list of Stations
-        for i in range(0, self.config.number_of_stations):
-            station_name = "Station" + str(i)
-            self.stations_list.append(Station(station_name, self.env, self.config, self.channel, self.stats))
+        if self.config.station_backend == 'ARRAY':
+            # Keep the state of all Stations in arrays and access each Station with a handle
+            self.station_array = StationArray("StationArray", self.env, self.config, self.channel, self.stats,
+                                              self.config.number_of_stations, self.trace, self.traffic)
+            self.stations_list = self.station_array.get_stations()
+        else:
+            for i in range(0, self.config.number_of_stations):
+                station_name = "Station" + str(i)
+                self.stations_list.append(Station(station_name, self.env, self.config, self.channel, self.stats, i,
+                                                  self.trace, self.traffic))
+        # Create the queue of each Station
+        if self.traffic is not None:
+            self.traffic.add_stations(self.stations_list)
         # Set the status of the simulator as initialized
         self.simulator_initialized = True
         logger.info(f'[{self.env.now}] - Simulator is initialized.')
 
-    def run_simulation(self):
-        """Function for running the simulation."""
+    def run_simulation(self, verbose=True):
+        """Function for running the simulation. The progress and statistics are printed only in verbose mode."""
 
         # Check if simulator is initialized
         if not self.simulator_initialized:
             logger.info(f'[{self.env.now}] - Initialize the simulator before running the simulation.')
             sys.exit(1)
+        # Estimate the statistics with the analytical model instead of simulating the transmissions
+        if self.config.run_mode == 'ANALYTIC':
+            logger.info(f'[{self.env.now}] - Statistics are estimated with the analytical model.')
+            self.stats = estimate_statistics(self.config)
+            if self.trace is not None:
+                self.trace.close()
+            if verbose:
+                self.stats.print_statistics()
+            return self.stats
+        if self.config.checkpoint_file and not self.config.single_timeout_backoff:
+            raise ValueError('The checkpoints can be saved only with the single timeout backoff enabled')
+        # Collect the throughput and latency of each transmission to find the end of the warm-up period
+        if self.config.warmup_detection:
+            self.warmup = WarmupDetector(self.env, self.stats, self.config.steady_state_precision)
+            for access_point in self.ap_list:
+                access_point.warmup = self.warmup
+        # Measure the events and the wall-clock time of the transmission phases
+        instrumentation = None
+        if self.config.instrumentation_file:
+            instrumentation = Instrumentation(self.env, self.config.instrumentation_file)
+            station_nodes = [self.station_array] if self.station_array is not None else self.stations_list
+            for node in self.ap_list + station_nodes:
+                instrumentation.instrument_node(node)
         # Set list of stations as all possible destinations
         all_destinations = self.stations_list
-        # Create transmission process for each Access Point
-        for access_point in self.ap_list:
+        # Create transmission process for each Access Point, the restored countdowns are started in their saved order
+        for access_point in self.get_access_points_in_countdown_order():
             self.env.process(access_point.perform_transmission(all_destinations))
-        # Start simulation
-        random.seed(self.config.seed)
-        self.env.process(self.stats.print_simulation_progress(self.env, self.config.simulation_time))
+        # Start simulation, the simulation restored from checkpoint continues its random sequence
+        if self.random_state is not None:
+            random.setstate(self.random_state)
+        else:
+            random.seed(self.config.seed)
+        if self.config.checkpoint_file:
+            self.env.process(self.save_checkpoints())
+        if verbose:
+            self.env.process(self.stats.print_simulation_progress(self.env, self.config.simulation_time))
+        # Sample the windowed metrics during the simulation
+        metrics_collector = None
+        if self.config.metrics_file:
+            metrics_collector = MetricsCollector(self.env, self.stats, self.ap_list, self.config.metrics_file,
+                                                 self.config.metrics_interval)
+            self.env.process(metrics_collector.collect_metrics())
         logger.info(f'[{self.env.now}] - Simulation is started.')
+        if instrumentation is not None:
+            instrumentation.start()
         self.env.run(until=self.config.simulation_time)
-        self.stats.print_statistics()
+        if instrumentation is not None:
+            instrumentation.stop()
+            instrumentation.write_results()
+        if self.trace is not None:
+            self.trace.close()
+        if metrics_collector is not None:
+            metrics_collector.close()
+        if self.warmup is not None:
+            self.warmup.truncate_statistics()
+        if verbose:
+            self.stats.print_statistics()
+        return self.stats
+
+    def get_access_points_in_countdown_order(self):
+        """Function for getting the Access Points in the order in which their backoff countdowns were started."""
+
+        if self.random_state is None:
+            return self.ap_list
+        # The Access Points waiting for the traffic have no countdown and are started last
+        return sorted(self.ap_list, key=lambda access_point: (access_point.countdown_number is None,
+                                                              access_point.countdown_number or 0))
+
+    def is_quiescent(self):
+        """Function for checking whether the state of the simulation is fully described by the saved attributes."""
+
+        # No event is pending at the current time and each Access Point counts down its backoff in the idle channel
+        if not self.channel.channel_available or self.channel.transmitting_ap or self.env.peek() <= self.env.now:
+            return False
+        return all(access_point.countdown_start is not None or access_point.waiting_for_traffic
+                   for access_point in self.ap_list)
+
+    def save_checkpoints(self):
+        """Function for saving the checkpoint at the first quiescent moment after each checkpoint interval."""
+
+        while True:
+            yield self.env.timeout(self.config.checkpoint_interval)
+            # Wait only for the events which can end the busy state, instead of checking the state in each microsecond
+            while not self.is_quiescent():
+                if not self.channel.channel_available:
+                    # Wait until the packets in the channel are received
+                    yield self.channel.wait_for_idle()
+                elif self.channel.transmitting_ap:
+                    # Wait until the transmissions started by the Access Points are complete
+                    yield self.env.any_of([access_point.transmission_complete_event for access_point in
+                                           self.channel.transmitting_ap])
+                else:
+                    # The state of the Access Points changes only in the events, so wait until the next event
+                    yield self.env.timeout(self.env.peek() - self.env.now)
+            self.save_checkpoint(self.config.checkpoint_file)
+
+    def save_checkpoint(self, checkpoint_file):
+        """Function for saving the state of the simulation to the checkpoint file."""
+
+        if not self.is_quiescent():
+            raise ValueError('The checkpoint can be saved only when the Access Points count down in the idle channel')
+        save_checkpoint(checkpoint_file, self.get_state())
+        logger.info(f'[{self.env.now}] - Checkpoint is saved to {checkpoint_file}.')
+
+    def get_state(self):
+        """Function for getting the state of the simulation saved in the checkpoint."""
+
+        return {
+            'time': self.env.now,
+            'config': dataclasses.asdict(self.config),
+            'random': random.getstate(),
+            'number_of_countdowns': self.channel.number_of_countdowns,
+            'stats': self.stats.get_state(),
+            'access_points': [access_point.get_state() for access_point in self.ap_list],
+            'stations': {name: [getattr(station, name) for station in self.stations_list] for name in
+                         STATION_STATE_FIELDS},
+            'traffic': None if self.traffic is None else self.traffic.get_state()
+        }
+
+    def set_state(self, state):
+        """Function for restoring the state of the simulation from the checkpoint."""
+
+        self.random_state = state['random']
+        self.channel.number_of_countdowns = state['number_of_countdowns']
+        self.stats.set_state(state['stats'])
+        # The MCS changed by the link adaptation is kept only if the variant does not set new MCS values
+        mcs_changed = (state['config']['mcs'], state['config']['station_mcs']) != (self.config.mcs,
+                                                                                  self.config.station_mcs)
+        for name, values in state['stations'].items():
+            if name == 'mcs' and mcs_changed:
+                continue
+            for station, value in zip(self.stations_list, values):
+                setattr(station, name, value)
+        for access_point, access_point_state in zip(self.ap_list, state['access_points']):
+            access_point.set_state(access_point_state, self.stations_list)
+        if self.traffic is not None:
+            self.traffic.set_state(state['traffic'])
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path, **config_changes):
+        """Function for creating the initialized simulator continuing from the checkpoint with changed settings."""
+
+        state = load_checkpoint(checkpoint_path)
+        for parameter in CHECKPOINT_FIXED_PARAMETERS:
+            if parameter in config_changes and config_changes[parameter] != state['config'][parameter]:
+                raise ValueError(f'The {parameter} parameter cannot be changed in the simulation restored from '
+                                 f'checkpoint')
+        config = dataclasses.replace(Config(**state['config']), **config_changes)
+        simulator = cls(config, state['time'])
+        simulator.initialize_simulator()
+        simulator.set_state(state)
+        logger.info(f'[{simulator.env.now}] - Simulator is restored from checkpoint {checkpoint_path}.')
+        return simulator
+
+
+def run_checkpoint_variant(checkpoint_path, config_changes):
+    """Function for running the simulation restored from the checkpoint with changed settings."""
+
+    simulator = Simulator.from_checkpoint(checkpoint_path, **config_changes)
+    stats = simulator.run_simulation(verbose=False)
+    return stats.get_statistics()
+
+
+def fork_simulation(checkpoint_path, variants, max_workers=None):
+    """Function for running the variants of the simulation restored from one checkpoint in worker processes."""
+
+    # The variants do not overwrite the output files of the simulation, unless other files are given
+    variants = [{'checkpoint_file': None, 'trace_file': None, 'metrics_file': None, **config_changes}
+                for config_changes in variants]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_checkpoint_variant, [checkpoint_path] * len(variants), variants))
 
 
 def main():
@@ -8,7 +8,9 @@
 import logging
 
 from helpers import times
-from node import Node
+from link_adaptation import get_station_mcs, get_station_nss
+from node import Node, SKIPPED_RESPONSE_EVENTS
+from packet import PacketType
 
 logger = logging.getLogger('ofdma_simulator')
 
@@ -16,10 +18,10 @@ logger = logging.getLogger('ofdma_simulator')
 class Station(Node):
     """Class containing functions and settings specific to a Station."""
 
-    def __init__(self, name, env, config, channel, stats):
+    def __init__(self, name, env, config, channel, stats, index=None, trace=None, traffic=None):
         """Station class constructor."""
 
-        super().__init__(env, channel)
+        super().__init__(env, channel, index, trace, traffic)
         self.name = name
         self.env = env
         self.config = config
@@ -28,6 +30,9 @@ class Station(Node):
         self.is_ap = False
         self.allocated_bw = None
         self.station_associated = False
+        self.associated_ap = None
+        self.mcs = get_station_mcs(config, index)
+        self.nss = get_station_nss(config, index)
         self.stats.latency_per_station[self.name] = 0
         self.stats.data_transferred_per_station[self.name] = 0
         self.stats.number_of_transmissions_per_station[self.name] = 0
@@ -39,101 +44,122 @@ class Station(Node):
 
         if self.config.direction == 'DL':
             if self.config.rts_procedure:
-                self.type_of_packet_to_wait = 'MU_RTS'
+                self.type_of_packet_to_wait = PacketType.MU_RTS
             else:
-                self.type_of_packet_to_wait = 'DL_A_MPDU'
+                self.type_of_packet_to_wait = PacketType.DL_A_MPDU
         elif self.config.direction == 'UL':
             if self.config.bsrp_procedure:
-                self.type_of_packet_to_wait = 'BSRP_TRIGGER'
+                self.type_of_packet_to_wait = PacketType.BSRP_TRIGGER
             else:
                 if self.config.rts_procedure:
-                    self.type_of_packet_to_wait = 'MU_RTS'
+                    self.type_of_packet_to_wait = PacketType.MU_RTS
                 else:
-                    self.type_of_packet_to_wait = 'BASIC_TRIGGER'
+                    self.type_of_packet_to_wait = PacketType.BASIC_TRIGGER
 
     def handle_received_packet(self, packet):
         """Function for handling the received packet by Station."""
 
         # Ignore packet to other destination
-        if self in packet.destination_nodes:
+        if packet.is_destination(self):
             # Ignore incorrect packet type
             if packet.packet_type == self.type_of_packet_to_wait:
                 # Handle BSRP Trigger packet in Station
-                if packet.packet_type == 'BSRP_TRIGGER':
+                if packet.packet_type == PacketType.BSRP_TRIGGER:
                     if self.config.rts_procedure:
-                        self.type_of_packet_to_wait = 'MU_RTS'
+                        self.type_of_packet_to_wait = PacketType.MU_RTS
                     else:
                         if self.config.direction == 'DL':
-                            self.type_of_packet_to_wait = 'DL_A_MPDU'
+                            self.type_of_packet_to_wait = PacketType.DL_A_MPDU
                         elif self.config.direction == 'UL':
-                            self.type_of_packet_to_wait = 'BASIC_TRIGGER'
+                            self.type_of_packet_to_wait = PacketType.BASIC_TRIGGER
                     destination = packet.source_node
                     yield self.env.process(self.send_bsr(destination))
                 # Handle MU RTS packet in Station
-                if packet.packet_type == 'MU_RTS':
+                if packet.packet_type == PacketType.MU_RTS:
                     if self.config.direction == 'DL':
-                        self.type_of_packet_to_wait = 'DL_A_MPDU'
+                        self.type_of_packet_to_wait = PacketType.DL_A_MPDU
                     elif self.config.direction == 'UL':
-                        self.type_of_packet_to_wait = 'BASIC_TRIGGER'
+                        self.type_of_packet_to_wait = PacketType.BASIC_TRIGGER
                     destination = packet.source_node
                     yield self.env.process(self.send_cts(destination))
                 # Handle data packet in Station
-                elif packet.packet_type == 'DL_A_MPDU':
+                elif packet.packet_type == PacketType.DL_A_MPDU:
                     self.set_initial_type_of_packet_to_wait()
                     destination = packet.source_node
                     number_of_destinations = len(packet.destination_nodes)
-                    received_data = times.get_sent_data(self.allocated_bw, number_of_destinations)
+                    number_of_mpdu = None
+                    if self.traffic is not None:
+                        number_of_mpdu = self.traffic.get_a_mpdu_size(self)
+                        self.traffic.deliver_a_mpdu(self)
+                    received_data = times.get_sent_data(self.config, self.allocated_bw, number_of_destinations,
+                                                        self.mcs, self.nss, number_of_mpdu)
                     self.stats.data_transferred_per_station[self.name] += received_data
                     yield self.env.process(self.send_tb_back(destination))
                 # Handle Basic Trigger in Station
-                elif packet.packet_type == 'BASIC_TRIGGER':
-                    self.type_of_packet_to_wait = 'MS_BACK'
+                elif packet.packet_type == PacketType.BASIC_TRIGGER:
+                    self.type_of_packet_to_wait = PacketType.MS_BACK
                     destination = packet.source_node
                     number_of_destinations = len(packet.destination_nodes)
                     yield self.env.process(self.send_data_packet(destination, number_of_destinations))
                 # Handle MS back in Station
-                elif packet.packet_type == 'MS_BACK':
+                elif packet.packet_type == PacketType.MS_BACK:
                     self.set_initial_type_of_packet_to_wait()
                     self.channel.channel_available = True
 
+    def send_packet(self, packet):
+        """Function for sending the response packet, the deterministic steps are skipped in the fast-forward mode."""
+
+        if not self.config.fast_forward:
+            yield from super().send_packet(packet)
+            return
+        # The response cannot collide, so it is put in the channel right after both 1 us steps
+        yield self.env.timeout(2)
+        self.put_in_channel(packet)
+        self.stats.number_of_skipped_events += SKIPPED_RESPONSE_EVENTS
+
     def send_bsr(self, destination):
         """Function for sending BSR packet."""
 
-        packet_type = 'BSR'
+        packet_type = PacketType.BSR
         source_node = self
         destination_node = [destination]
-        packet_time = times.get_packet_time(packet_type)
+        packet_time = times.get_packet_time(self.config, packet_type)
         bsr_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_node)
         yield self.env.process(self.send_packet(bsr_packet))
 
     def send_cts(self, destination):
         """Function for sending MU CTS packet."""
 
-        packet_type = 'CTS'
+        packet_type = PacketType.CTS
         source_node = self
         destination_node = [destination]
-        packet_time = times.get_packet_time(packet_type)
+        packet_time = times.get_packet_time(self.config, packet_type)
         cts_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_node)
         yield self.env.process(self.send_packet(cts_packet))
 
     def send_data_packet(self, destination, number_of_destinations):
         """Function for sending A-MPDU packet."""
 
-        packet_type = 'UL_A_MPDU'
+        packet_type = PacketType.UL_A_MPDU
         source_node = self
         destination_node = [destination]
-        packet_time = times.get_packet_time(packet_type, self.allocated_bw, number_of_destinations)
+        number_of_mpdu = None
+        if self.traffic is not None:
+            number_of_mpdu = self.traffic.prepare_a_mpdu(self, number_of_destinations)
+        packet_time = times.get_packet_time(self.config, packet_type, self.allocated_bw, number_of_destinations,
+                                            self.mcs, self.nss, number_of_mpdu)
         data_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_node)
-        sent_data = times.get_sent_data(self.allocated_bw, number_of_destinations)
+        sent_data = times.get_sent_data(self.config, self.allocated_bw, number_of_destinations, self.mcs, self.nss,
+                                        number_of_mpdu)
         self.stats.data_transferred_per_station[self.name] += sent_data
         yield self.env.process(self.send_packet(data_packet))
 
     def send_tb_back(self, destination):
         """Function for sending TB-Back packet."""
 
-        packet_type = 'TB_BACK'
+        packet_type = PacketType.TB_BACK
         source_node = self
         destination_node = [destination]
-        packet_time = times.get_packet_time(packet_type, self.allocated_bw)
+        packet_time = times.get_packet_time(self.config, packet_type, self.allocated_bw, mcs=self.mcs, nss=self.nss)
         tb_back_packet = self.generate_new_packet(packet_type, packet_time, source_node, destination_node)
         yield self.env.process(self.send_packet(tb_back_packet))
@@ -0,0 +1,295 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the StationArray class. The StationArray class keeps the state of all User Stations in
+              NumPy arrays and performs the transmission of all of them as a single node listening in the channel, so
+              no simpy.Store and process is created for each Station. The Access Points see each Station through
+              a StationHandle object, which reads and writes the state of the Station in the arrays.
+"""
+
+import logging
+from collections.abc import MutableMapping
+from operator import attrgetter
+
+import numpy as np
+
+from helpers import times
+from link_adaptation import get_station_mcs, get_station_nss
+from node import Node
+from packet import PacketType
+
+logger = logging.getLogger('ofdma_simulator')
+
+STATION_NAME_PREFIX = 'Station'
+
+
+class StationHandle:
+    """Class giving access to the state of a single Station kept in the StationArray."""
+
+    __slots__ = ('station_array', 'index')
+
+    is_ap = False
+
+    def __init__(self, station_array, index):
+        """StationHandle class constructor."""
+
+        self.station_array = station_array
+        self.index = index
+
+    @property
+    def name(self):
+        """Name of the Station."""
+
+        return STATION_NAME_PREFIX + str(self.index)
+
+    @property
+    def channel_mask(self):
+        """Bit of the StationArray which receives the packets addressed to the Station."""
+
+        return self.station_array.channel_mask
+
+    @property
+    def allocated_bw(self):
+        """Bandwidth of the RU allocated to the Station."""
+
+        allocated_bw = self.station_array.allocated_bw[self.index]
+        return None if np.isnan(allocated_bw) else allocated_bw.item()
+
+    @allocated_bw.setter
+    def allocated_bw(self, allocated_bw):
+        self.station_array.allocated_bw[self.index] = np.nan if allocated_bw is None else allocated_bw
+
+    @property
+    def station_associated(self):
+        """Flag indicating whether the Station is assigned to an Access Point."""
+
+        return bool(self.station_array.station_associated[self.index])
+
+    @station_associated.setter
+    def station_associated(self, station_associated):
+        self.station_array.station_associated[self.index] = station_associated
+
+    @property
+    def associated_ap(self):
+        """Index of the Access Point the Station is assigned to."""
+
+        associated_ap = self.station_array.associated_ap[self.index]
+        return None if associated_ap < 0 else associated_ap.item()
+
+    @associated_ap.setter
+    def associated_ap(self, associated_ap):
+        self.station_array.associated_ap[self.index] = -1 if associated_ap is None else associated_ap
+
+    @property
+    def mcs(self):
+        """MCS currently used by the Station."""
+
+        return self.station_array.mcs[self.index].item()
+
+    @mcs.setter
+    def mcs(self, mcs):
+        self.station_array.mcs[self.index] = mcs
+
+    @property
+    def nss(self):
+        """Number of spatial streams of the Station."""
+
+        return self.station_array.nss[self.index].item()
+
+    @property
+    def type_of_packet_to_wait(self):
+        """Type of the packet expected by the Station."""
+
+        return PacketType(self.station_array.type_of_packet_to_wait[self.index])
+
+    @type_of_packet_to_wait.setter
+    def type_of_packet_to_wait(self, packet_type):
+        self.station_array.type_of_packet_to_wait[self.index] = packet_type
+
+
+class StationCounters(MutableMapping):
+    """Class giving access to a counter of all Stations kept in an array as a dictionary indexed by Station names."""
+
+    def __init__(self, values):
+        """StationCounters class constructor."""
+
+        self.values = values
+
+    def __getitem__(self, name):
+        return self.values[get_station_index(name)].item()
+
+    def __setitem__(self, name, value):
+        self.values[get_station_index(name)] = value
+
+    def __delitem__(self, name):
+        raise TypeError('Station counters cannot be removed')
+
+    def __iter__(self):
+        for index in range(0, len(self.values)):
+            yield STATION_NAME_PREFIX + str(index)
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, name, default=None):
+        # The default is returned for the names of unknown Stations, as by the dictionary
+        try:
+            return self.values[get_station_index(name)].item()
+        except (KeyError, IndexError, ValueError):
+            return default
+
+    def clear(self):
+        self.values[:] = 0
+
+
+def get_station_index(name):
+    """Function for getting the index of the Station from its name."""
+
+    return int(name[len(STATION_NAME_PREFIX):])
+
+
+class StationArray(Node):
+    """Class containing functions and settings specific to all Stations kept in arrays."""
+
+    def __init__(self, name, env, config, channel, stats, number_of_stations, trace=None, traffic=None):
+        """StationArray class constructor."""
+
+        super().__init__(env, channel, None, trace, traffic)
+        self.name = name
+        self.env = env
+        self.config = config
+        self.channel = channel
+        self.stats = stats
+        self.is_ap = False
+        self.number_of_stations = number_of_stations
+        # State of each Station
+        self.allocated_bw = np.full(number_of_stations, np.nan)
+        self.station_associated = np.zeros(number_of_stations, dtype=bool)
+        self.associated_ap = np.full(number_of_stations, -1, dtype=np.int32)
+        self.mcs = np.array([get_station_mcs(config, i) for i in range(0, number_of_stations)], dtype=np.uint8)
+        self.nss = np.array([get_station_nss(config, i) for i in range(0, number_of_stations)], dtype=np.uint8)
+        self.type_of_packet_to_wait = np.full(number_of_stations, self.get_initial_type_of_packet_to_wait(),
+                                              dtype=np.uint8)
+        # Counters of each Station, the statistics read them as dictionaries indexed by Station names
+        self.stats.latency_per_station = StationCounters(np.zeros(number_of_stations))
+        self.stats.latency_clock_excluded_per_station = StationCounters(np.zeros(number_of_stations))
+        self.stats.data_transferred_per_station = StationCounters(np.zeros(number_of_stations))
+        self.stats.throughput_per_station = StationCounters(np.zeros(number_of_stations))
+        self.stats.number_of_transmissions_per_station = StationCounters(np.zeros(number_of_stations,
+                                                                                  dtype=np.int64))
+
+    def get_stations(self):
+        """Function for getting the handles of all Stations."""
+
+        return [StationHandle(self, i) for i in range(0, self.number_of_stations)]
+
+    def get_initial_type_of_packet_to_wait(self):
+        """Function for getting packet type expected by Station after transmission is started."""
+
+        if self.config.direction == 'DL':
+            if self.config.rts_procedure:
+                return PacketType.MU_RTS
+            return PacketType.DL_A_MPDU
+        if self.config.bsrp_procedure:
+            return PacketType.BSRP_TRIGGER
+        if self.config.rts_procedure:
+            return PacketType.MU_RTS
+        return PacketType.BASIC_TRIGGER
+
+    def wait_for_new_packet(self):
+        """Function for waiting for the new packet."""
+
+        self.start_listening()
+        while True:
+            packet = yield self.channel_store.get()
+            self.handle_received_packet(packet)
+            self.release_received_packet(packet)
+
+    def handle_received_packet(self, packet):
+        """Function for handling the received packet by all destination Stations."""
+
+        response_packets = []
+        # Handle the packet in the same order in which separate Station objects would receive it
+        for station in sorted(packet.destination_nodes, key=attrgetter('index')):
+            response_packet = self.handle_received_packet_in_station(station, packet)
+            if response_packet is not None:
+                response_packets.append(response_packet)
+        # The Stations send the responses independently, so the next packet can be received in the meantime
+        if response_packets:
+            self.env.process(self.send_response_packets(response_packets))
+
+    def handle_received_packet_in_station(self, station, packet):
+        """Function for handling the received packet by Station and getting the packet sent in response."""
+
+        index = station.index
+        # Ignore incorrect packet type
+        if packet.packet_type != self.type_of_packet_to_wait[index]:
+            return None
+        destination = packet.source_node
+        number_of_destinations = len(packet.destination_nodes)
+        # Handle BSRP Trigger packet in Station
+        if packet.packet_type == PacketType.BSRP_TRIGGER:
+            if self.config.rts_procedure:
+                self.type_of_packet_to_wait[index] = PacketType.MU_RTS
+            elif self.config.direction == 'DL':
+                self.type_of_packet_to_wait[index] = PacketType.DL_A_MPDU
+            elif self.config.direction == 'UL':
+                self.type_of_packet_to_wait[index] = PacketType.BASIC_TRIGGER
+            return self.get_response_packet(station, PacketType.BSR, destination)
+        # Handle MU RTS packet in Station
+        if packet.packet_type == PacketType.MU_RTS:
+            if self.config.direction == 'DL':
+                self.type_of_packet_to_wait[index] = PacketType.DL_A_MPDU
+            elif self.config.direction == 'UL':
+                self.type_of_packet_to_wait[index] = PacketType.BASIC_TRIGGER
+            return self.get_response_packet(station, PacketType.CTS, destination)
+        # Handle data packet in Station
+        if packet.packet_type == PacketType.DL_A_MPDU:
+            self.type_of_packet_to_wait[index] = self.get_initial_type_of_packet_to_wait()
+            number_of_mpdu = None
+            if self.traffic is not None:
+                number_of_mpdu = self.traffic.get_a_mpdu_size(station)
+                self.traffic.deliver_a_mpdu(station)
+            received_data = times.get_sent_data(self.config, station.allocated_bw, number_of_destinations,
+                                                self.mcs[index].item(), self.nss[index].item(), number_of_mpdu)
+            self.stats.data_transferred_per_station.values[index] += received_data
+            return self.get_response_packet(station, PacketType.TB_BACK, destination, station.allocated_bw)
+        # Handle Basic Trigger in Station
+        if packet.packet_type == PacketType.BASIC_TRIGGER:
+            self.type_of_packet_to_wait[index] = PacketType.MS_BACK
+            number_of_mpdu = None
+            if self.traffic is not None:
+                number_of_mpdu = self.traffic.prepare_a_mpdu(station, number_of_destinations)
+            sent_data = times.get_sent_data(self.config, station.allocated_bw, number_of_destinations,
+                                            self.mcs[index].item(), self.nss[index].item(), number_of_mpdu)
+            self.stats.data_transferred_per_station.values[index] += sent_data
+            return self.get_response_packet(station, PacketType.UL_A_MPDU, destination, station.allocated_bw,
+                                            number_of_destinations, number_of_mpdu)
+        # Handle MS back in Station
+        if packet.packet_type == PacketType.MS_BACK:
+            self.type_of_packet_to_wait[index] = self.get_initial_type_of_packet_to_wait()
+            self.channel.channel_available = True
+        return None
+
+    def get_response_packet(self, station, packet_type, destination, bandwidth=None, number_of_destinations=None,
+                            number_of_mpdu=None):
+        """Function for generating the packet sent by Station in response to the received packet."""
+
+        packet_time = times.get_packet_time(self.config, packet_type, bandwidth, number_of_destinations, station.mcs,
+                                            station.nss, number_of_mpdu)
+        return self.generate_new_packet(packet_type, packet_time, station, [destination])
+
+    def send_response_packets(self, packets):
+        """Function for sending the packets of all responding Stations at the same time."""
+
+        # The packet is sent after 1 us and is put in the channel after another 1 us
+        if self.config.fast_forward:
+            # The responses cannot collide, so both steps are skipped at once
+            yield self.env.timeout(2)
+            self.stats.number_of_skipped_events += 1
+        else:
+            yield self.env.timeout(1)
+            yield self.env.timeout(1)
+        for packet in packets:
+            self.put_in_channel(packet)
@@ -0,0 +1,118 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing functions for running a parameter sweep. Every combination of the values defined in
+              the parameter grid is simulated in a separate worker process and the statistics of all simulations are
+              collected into a single table, in which each row holds one metric of one simulation.
+"""
+
+import sys
+import csv
+import logging
+import itertools
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import configs.sweep_config as sweep_config
+from simulation import Config, Simulator
+
+logger = logging.getLogger('ofdma_simulator')
+
+RESULTS_COLUMNS = ['run', 'status', 'metric', 'station', 'value']
+
+
+def get_configurations(parameter_grid):
+    """Function for getting the Config object for every combination of the values defined in the parameter grid."""
+
+    config_fields = [config_field.name for config_field in dataclasses.fields(Config)]
+    for parameter in parameter_grid:
+        if parameter not in config_fields:
+            raise ValueError(f'Unknown simulation parameter in the parameter grid: {parameter}')
+    parameters = list(parameter_grid)
+    configurations = []
+    for values in itertools.product(*parameter_grid.values()):
+        configurations.append(Config(**dict(zip(parameters, values))))
+    return configurations
+
+
+def run_configuration(config):
+    """Function for running the simulation with given configuration and getting its statistics."""
+
+    simulator = Simulator(config)
+    simulator.initialize_simulator()
+    stats = simulator.run_simulation(verbose=False)
+    return stats.get_statistics()
+
+
+def get_result_rows(run, config, statistics=None, error=None):
+    """Function for converting the statistics of a single simulation into the rows of the results table."""
+
+    parameters = dataclasses.asdict(config)
+    if statistics is None:
+        return [{'run': run, 'status': 'failed', 'metric': 'error', 'station': None, 'value': error, **parameters}]
+    rows = []
+    for metric in ['throughput', 'average_latency', 'number_of_transmissions', 'number_of_retransmissions']:
+        rows.append({'run': run, 'status': 'ok', 'metric': metric, 'station': None, 'value': statistics[metric],
+                     **parameters})
+    for station, throughput in statistics['throughput_per_station'].items():
+        rows.append({'run': run, 'status': 'ok', 'metric': 'throughput_per_station', 'station': station,
+                     'value': throughput, **parameters})
+    return rows
+
+
+def print_sweep_progress(finished_runs, failed_runs, number_of_runs):
+    """Function for printing the progress of the sweep."""
+
+    sweep_percent = round((finished_runs / number_of_runs) * 100)
+    sys.stdout.write("\033[F")
+    sys.stdout.write("\033[K")
+    print("Sweep in progress [%-100s] %d%% (%d/%d runs, %d failed)" % ('=' * sweep_percent, sweep_percent,
+                                                                        finished_runs, number_of_runs, failed_runs))
+
+
+def run_sweep(parameter_grid, max_workers=None, show_progress=True):
+    """Function for running the simulations of all configurations from the parameter grid in worker processes."""
+
+    configurations = get_configurations(parameter_grid)
+    results = []
+    failed_runs = 0
+    if show_progress:
+        print("Sweep started\n")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_configuration, config): run for run, config in enumerate(configurations)}
+        for finished_runs, future in enumerate(as_completed(futures), start=1):
+            run = futures[future]
+            try:
+                results.extend(get_result_rows(run, configurations[run], statistics=future.result()))
+            except Exception as error:
+                # A failed simulation is recorded in the results, so the remaining runs are not lost
+                failed_runs += 1
+                logger.error(f'Simulation {run} of the sweep failed: {error!r}')
+                results.extend(get_result_rows(run, configurations[run], error=repr(error)))
+            if show_progress:
+                print_sweep_progress(finished_runs, failed_runs, len(configurations))
+    results.sort(key=lambda row: row['run'])
+    return results
+
+
+def save_results(results, results_file):
+    """Function for saving the results table to the CSV file."""
+
+    config_fields = [config_field.name for config_field in dataclasses.fields(Config)]
+    with open(results_file, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=RESULTS_COLUMNS + config_fields)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    """Main sweep function."""
+
+    results = run_sweep(sweep_config.PARAMETER_GRID, max_workers=sweep_config.MAX_WORKERS)
+    save_results(results, sweep_config.RESULTS_FILE)
+    print(f"Sweep finished, results saved to {sweep_config.RESULTS_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the configuration of the tests. The directory of the simulator is added to the module
+              search path, so the modules are imported by name in the same way as in the scripts of the simulator.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
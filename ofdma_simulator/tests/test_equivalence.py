@@ -0,0 +1,152 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the tests which run a short scenario with each optional optimization enabled and
+              disabled and check that the statistics of the simulation are not changed. The statistics estimated
+              without the discrete-event simulation are checked to be within the tolerance of the simulated ones.
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import configs.analytic_config as analytic_config
+from simulation import Config, Simulator
+from helpers.stats import Stats
+from sweep import run_configuration
+from batch import BATCH_METRICS, run_batch
+from analytic import estimate_statistics
+from analytic_validation import VALIDATED_METRICS, calculate_relative_error
+
+# Short scenario with two Access Points, so the collisions and the frozen backoff countdowns are simulated
+SCENARIO = {'simulation_time': 100000, 'number_of_ap': 2, 'number_of_stations': 20}
+# Statistics describing the work done by the simulator instead of the simulated network
+DIAGNOSTIC_STATISTICS = ['number_of_skipped_events']
+# Scenario with four Access Points in which the estimated statistics are compared with the simulated ones, the
+# simulation time is long enough for the statistical error to be small compared to the tolerance
+CONTENTION_SCENARIO = {'simulation_time': 300000, 'number_of_ap': 4, 'run_mode': 'DES'}
+
+
+def run_simulation(**config_changes):
+    """Function for running the short scenario with given changes of the configuration and getting its statistics."""
+
+    simulator = Simulator(Config(**{**SCENARIO, **config_changes}))
+    simulator.initialize_simulator()
+    return simulator.run_simulation(verbose=False).get_statistics()
+
+
+@pytest.fixture(scope='module')
+def contention_statistics():
+    """Fixture for running the scenario with four Access Points once for all tests comparing the estimates."""
+
+    return run_configuration(Config(**CONTENTION_SCENARIO))
+
+
+def get_network_statistics(statistics):
+    """Function for getting the statistics of the simulated network without the diagnostic statistics."""
+
+    return {key: value for key, value in statistics.items() if key not in DIAGNOSTIC_STATISTICS}
+
+
+@pytest.mark.parametrize('traffic_model', ['SATURATED', 'POISSON'])
+def test_single_timeout_backoff(traffic_model):
+    """Test if the countdown with a single timeout gives the same statistics as the countdown of each slot."""
+
+    single_timeout_statistics = run_simulation(single_timeout_backoff=True, traffic_model=traffic_model)
+    slot_statistics = run_simulation(single_timeout_backoff=False, traffic_model=traffic_model)
+    assert get_network_statistics(single_timeout_statistics) == get_network_statistics(slot_statistics)
+
+
+@pytest.mark.parametrize('traffic_model', ['SATURATED', 'POISSON'])
+def test_fast_forward(traffic_model):
+    """Test if skipping the events which do not change the state gives the same statistics as processing them."""
+
+    fast_forward_statistics = run_simulation(fast_forward=True, traffic_model=traffic_model)
+    statistics = run_simulation(fast_forward=False, traffic_model=traffic_model)
+    # The events have to be actually skipped in the compared scenario
+    assert fast_forward_statistics['number_of_skipped_events'] > 0
+    assert statistics['number_of_skipped_events'] == 0
+    assert get_network_statistics(fast_forward_statistics) == get_network_statistics(statistics)
+
+
+@pytest.mark.parametrize('traffic_model', ['SATURATED', 'POISSON'])
+def test_array_station_backend(traffic_model):
+    """Test if the state of the stations kept in arrays gives the same statistics as separate station objects."""
+
+    array_statistics = run_simulation(station_backend='ARRAY', traffic_model=traffic_model)
+    node_statistics = run_simulation(station_backend='NODE', traffic_model=traffic_model)
+    assert get_network_statistics(array_statistics) == get_network_statistics(node_statistics)
+
+
+def test_latency_accounting():
+    """Test if the latency added to the common clock is equal to the latency added to each station separately."""
+
+    generator = random.Random(1)
+    stats = Stats()
+    stations = [SimpleNamespace(name="Station" + str(i)) for i in range(0, 10)]
+    expected_latency = {}
+    for station in stations:
+        stats.latency_per_station[station.name] = 0
+        stats.number_of_transmissions_per_station[station.name] = 0
+        expected_latency[station.name] = 0
+    for _ in range(0, 1000):
+        stations_in_transmission = generator.sample(stations, generator.randint(1, 3))
+        latency = generator.randint(1, 100)
+        stats.increase_latency_for_station_that_are_not_transmitting(stations_in_transmission, latency)
+        for station in stations:
+            if station not in stations_in_transmission:
+                expected_latency[station.name] += latency
+        for station in stations_in_transmission:
+            stats.number_of_transmissions_per_station[station.name] += 1
+        # The latency is moved from the common clock to the stations at random moments, e.g. when a checkpoint is saved
+        if generator.random() < 0.01:
+            stats.update_latency_per_station()
+    assert stats.get_accumulated_latency_per_station() == expected_latency
+    expected_latency_per_station = {key: round((latency / stats.number_of_transmissions_per_station[key]) / 1000, 3)
+                                    for key, latency in expected_latency.items()}
+    assert stats.calculate_latency_per_station() == expected_latency_per_station
+
+
+def test_statistics_not_changed_by_calculation():
+    """Test if the statistics of the simulation are the same when they are calculated repeatedly."""
+
+    simulator = Simulator(Config(**SCENARIO))
+    simulator.initialize_simulator()
+    stats = simulator.run_simulation(verbose=False)
+    assert stats.get_statistics() == stats.get_statistics()
+
+
+@pytest.mark.parametrize('station_backend', ['NODE', 'ARRAY'])
+def test_checkpoint_restore(station_backend, tmp_path):
+    """Test if saving the checkpoint and continuing from it gives the same statistics as the uninterrupted run."""
+
+    checkpoint_file = str(tmp_path / 'checkpoint.gz')
+    statistics = run_simulation(station_backend=station_backend)
+    checkpoint_statistics = run_simulation(station_backend=station_backend, checkpoint_file=checkpoint_file,
+                                           checkpoint_interval=SCENARIO['simulation_time'] // 2)
+    simulator = Simulator.from_checkpoint(checkpoint_file, checkpoint_file=None)
+    # The restored simulation is continued from the middle of the run
+    assert 0 < simulator.env.now < SCENARIO['simulation_time']
+    restored_statistics = simulator.run_simulation(verbose=False).get_statistics()
+    assert checkpoint_statistics == statistics
+    assert restored_statistics == statistics
+
+
+def test_batch_engine(contention_statistics):
+    """Test if the mean statistics of the batch engine are within the tolerance of the simulated statistics."""
+
+    results = run_batch(Config(**CONTENTION_SCENARIO), number_of_replications=20)
+    for metric in BATCH_METRICS:
+        relative_error = calculate_relative_error(results[metric].mean(), contention_statistics[metric])
+        assert abs(relative_error) <= analytic_config.MAX_RELATIVE_ERROR, metric
+
+
+def test_analytic_model(contention_statistics):
+    """Test if the statistics estimated by the analytical model are within the tolerance of the simulated statistics."""
+
+    estimated_statistics = estimate_statistics(Config(**CONTENTION_SCENARIO)).get_statistics()
+    for metric in VALIDATED_METRICS:
+        relative_error = calculate_relative_error(estimated_statistics[metric], contention_statistics[metric])
+        assert abs(relative_error) <= analytic_config.MAX_RELATIVE_ERROR, metric
@@ -0,0 +1,259 @@
+"""
+:copyright: Copyright (C) 2022 Damian Piasecki
+:author: Damian Piasecki
+:email: piasecki.damian97@gmail.com
+:description: File containing the traffic models and the TrafficGenerator class used in the non-saturated simulation.
+              Each Station has a queue of MPDUs fed by a Poisson, on/off or constant bit rate arrival process. The
+              next arrival of each Station is kept in a single heap and all arrivals which have already occurred are
+              moved to the queues in a batch before each transmission, so no simpy process is created for each
+              Station. The arrivals are timed on the transmission time accounted in the statistics, which is the
+              time elapsed in the channel, and the delay of each MPDU is counted from its arrival to its delivery.
+"""
+
+import heapq
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+
+from helpers import times
+
+
+class TrafficModel(ABC):
+    """Class containing common functions of all traffic models."""
+
+    def __init__(self, config, generator):
+        """TrafficModel class constructor."""
+
+        self.config = config
+        self.random = generator
+        # Mean time between the MPDU arrivals of a Station giving the offered load [us]
+        self.mean_interarrival_time = times.l_d / config.traffic_load
+
+    @abstractmethod
+    def get_first_arrival_time(self, index):
+        raise NotImplementedError("get_first_arrival_time must be override")
+
+    @abstractmethod
+    def get_next_arrival_time(self, index, arrival_time):
+        raise NotImplementedError("get_next_arrival_time must be override")
+
+    def get_state(self):
+        """Function for getting the state of the traffic model saved in the checkpoint."""
+
+        return {'random': self.random.getstate()}
+
+    def set_state(self, state):
+        """Function for restoring the state of the traffic model from the checkpoint."""
+
+        self.random.setstate(state['random'])
+
+
+class PoissonTraffic(TrafficModel):
+    """Class containing functions of the Poisson arrival process."""
+
+    def get_first_arrival_time(self, index):
+        """Function for getting the time of the first arrival of the Station."""
+
+        return self.random.expovariate(1 / self.mean_interarrival_time)
+
+    def get_next_arrival_time(self, index, arrival_time):
+        """Function for getting the time of the next arrival after exponentially distributed interval."""
+
+        return arrival_time + self.random.expovariate(1 / self.mean_interarrival_time)
+
+
+class CbrTraffic(TrafficModel):
+    """Class containing functions of the constant bit rate arrival process."""
+
+    def get_first_arrival_time(self, index):
+        """Function for getting the time of the first arrival of the Station with a random phase."""
+
+        return self.random.uniform(0, self.mean_interarrival_time)
+
+    def get_next_arrival_time(self, index, arrival_time):
+        """Function for getting the time of the next arrival after a constant interval."""
+
+        return arrival_time + self.mean_interarrival_time
+
+
+class OnOffTraffic(TrafficModel):
+    """Class containing functions of the on/off arrival process."""
+
+    def __init__(self, config, generator):
+        """OnOffTraffic class constructor."""
+
+        super().__init__(config, generator)
+        # The MPDUs arrive only during the on periods at a higher rate, so the mean offered load is kept
+        duty_cycle = config.traffic_on_time / (config.traffic_on_time + config.traffic_off_time)
+        self.on_interarrival_time = self.mean_interarrival_time * duty_cycle
+        self.on_period_ends = {}
+
+    def get_first_arrival_time(self, index):
+        """Function for getting the time of the first arrival of the Station after its first off period."""
+
+        return self.get_next_arrival_time(index, self.start_on_period(index, 0))
+
+    def get_next_arrival_time(self, index, arrival_time):
+        """Function for getting the time of the next arrival of the Poisson process active during the on periods."""
+
+        next_arrival_time = arrival_time + self.random.expovariate(1 / self.on_interarrival_time)
+        # The interval is memoryless, so it is drawn again from the start of the next on period
+        while next_arrival_time > self.on_period_ends[index]:
+            start_time = self.start_on_period(index, self.on_period_ends[index])
+            next_arrival_time = start_time + self.random.expovariate(1 / self.on_interarrival_time)
+        return next_arrival_time
+
+    def start_on_period(self, index, end_time):
+        """Function for drawing the off period after given time and the length of the following on period."""
+
+        start_time = end_time + self.random.expovariate(1 / self.config.traffic_off_time)
+        self.on_period_ends[index] = start_time + self.random.expovariate(1 / self.config.traffic_on_time)
+        return start_time
+
+    def get_state(self):
+        """Function for getting the state of the traffic model together with the ends of the on periods."""
+
+        state = super().get_state()
+        state['on_period_ends'] = dict(self.on_period_ends)
+        return state
+
+    def set_state(self, state):
+        """Function for restoring the state of the traffic model together with the ends of the on periods."""
+
+        super().set_state(state)
+        self.on_period_ends = dict(state['on_period_ends'])
+
+
+TRAFFIC_MODELS = {
+    'POISSON': PoissonTraffic,
+    'ON_OFF': OnOffTraffic,
+    'CBR': CbrTraffic
+}
+
+
+class TrafficGenerator:
+    """Class containing the queues of all Stations and functions for generating the arrivals of the MPDUs."""
+
+    def __init__(self, env, config, stats):
+        """TrafficGenerator class constructor."""
+
+        self.env = env
+        self.config = config
+        self.stats = stats
+        # The arrivals have a separate generator, so the traffic does not change the backoff of the Access Points
+        self.traffic_model = TRAFFIC_MODELS[config.traffic_model](config, random.Random(config.seed))
+        self.stations = []
+        self.queues = []
+        self.a_mpdu_sizes = []
+        self.arrival_heap = []
+        self.backlogged_stations = {}
+        self.arrival_event = env.event()
+        self.number_of_waiting_ap = 0
+
+    def add_stations(self, stations):
+        """Function for creating the queues of the Stations and drawing their first arrivals."""
+
+        for station in stations:
+            self.stations.append(station)
+            self.queues.append(deque())
+            self.a_mpdu_sizes.append(0)
+            self.arrival_heap.append((self.traffic_model.get_first_arrival_time(station.index), station.index))
+        heapq.heapify(self.arrival_heap)
+
+    def update_queues(self):
+        """Function for moving all MPDUs which have already arrived to the queues of the Stations."""
+
+        now = self.stats.transmission_time
+        arrived = False
+        while self.arrival_heap and self.arrival_heap[0][0] <= now:
+            arrival_time, index = self.arrival_heap[0]
+            queue = self.queues[index]
+            if not queue:
+                station = self.stations[index]
+                self.backlogged_stations.setdefault(station.associated_ap, {})[index] = station
+            queue.append(arrival_time)
+            heapq.heapreplace(self.arrival_heap, (self.traffic_model.get_next_arrival_time(index, arrival_time),
+                                                  index))
+            arrived = True
+        # Wake up the Access Points waiting for the MPDUs of their Stations
+        if arrived:
+            self.number_of_waiting_ap = 0
+            arrival_event = self.arrival_event
+            self.arrival_event = self.env.event()
+            arrival_event.succeed()
+
+    def get_backlogged_stations(self, access_point):
+        """Function for getting the Stations of the Access Point which have MPDUs in their queues."""
+
+        return list(self.backlogged_stations.get(access_point.index, {}).values())
+
+    def wait_for_arrival(self):
+        """Function for waiting until the MPDUs arrive, the idle time is skipped if all Access Points are waiting."""
+
+        arrival_event = self.arrival_event
+        self.number_of_waiting_ap += 1
+        if self.number_of_waiting_ap == self.config.number_of_ap and self.arrival_heap:
+            # Nothing is transmitted in the channel, so the idle time until the next arrival passes at once
+            next_arrival_time = self.arrival_heap[0][0]
+            idle_time = next_arrival_time - self.stats.transmission_time
+            self.stats.transmission_time = next_arrival_time
+            self.stats.increase_latency_for_station_that_are_not_transmitting([], idle_time)
+            self.update_queues()
+        yield arrival_event
+
+    def prepare_a_mpdu(self, station, number_of_destinations):
+        """Function for getting the number of MPDUs sent to or by the Station in the next A-MPDU."""
+
+        # The A-MPDU contains all queued MPDUs which fit in the TXOP
+        max_number_of_mpdu = times.get_max_number_of_mpdu(self.config, station.allocated_bw, number_of_destinations,
+                                                          station.mcs, station.nss)
+        # The empty A-MPDU would never drain the queue, so the backlogged Station is always sent at least one MPDU
+        a_mpdu_size = min(len(self.queues[station.index]), max(max_number_of_mpdu, 1))
+        self.a_mpdu_sizes[station.index] = a_mpdu_size
+        return a_mpdu_size
+
+    def get_a_mpdu_size(self, station):
+        """Function for getting the number of MPDUs in the last A-MPDU prepared for the Station."""
+
+        return self.a_mpdu_sizes[station.index]
+
+    def deliver_a_mpdu(self, station):
+        """Function for removing the delivered MPDUs from the queue of the Station and counting their delay."""
+
+        queue = self.queues[station.index]
+        now = self.stats.transmission_time
+        for _ in range(0, self.a_mpdu_sizes[station.index]):
+            self.stats.add_mpdu_delay(station.name, now - queue.popleft())
+        if not queue:
+            del self.backlogged_stations[station.associated_ap][station.index]
+
+    def get_state(self):
+        """Function for getting the queues and the next arrivals saved in the checkpoint."""
+
+        return {
+            'traffic_model': self.traffic_model.get_state(),
+            'queues': [list(queue) for queue in self.queues],
+            'a_mpdu_sizes': list(self.a_mpdu_sizes),
+            'arrival_heap': list(self.arrival_heap),
+            'backlogged_stations': {ap_index: list(stations) for ap_index, stations in
+                                    self.backlogged_stations.items()}
+        }
+
+    def set_state(self, state):
+        """Function for restoring the queues and the next arrivals from the checkpoint."""
+
+        self.traffic_model.set_state(state['traffic_model'])
+        self.queues = [deque(queue) for queue in state['queues']]
+        self.a_mpdu_sizes = list(state['a_mpdu_sizes'])
+        self.arrival_heap = list(state['arrival_heap'])
+        # The Stations are kept in the order they became backlogged, which is the order they are given to schedulers
+        self.backlogged_stations = {ap_index: {index: self.stations[index] for index in indices}
+                                    for ap_index, indices in state['backlogged_stations'].items()}
+
+
+def get_traffic_generator(env, config, stats):
+    """Function for creating the traffic generator of the traffic model selected in the configuration."""
+
+    if config.traffic_model == 'SATURATED':
+        return None
+    return TrafficGenerator(env, config, stats)